@@ -0,0 +1,69 @@
+"""Throughput of batch webhook signature verification.
+
+Small bodies are bound by Python overhead and scale with processes, large
+bodies are bound by hashing, during which hashlib releases the GIL, so
+threads are enough for them.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batch_verify
+"""
+
+# Standard library imports
+import hashlib
+import hmac
+import os
+import time
+
+# Razorpay SDK imports
+import razorpay
+import razorpay.errors
+
+SECRET = "webhook_secret"  # noqa: S105
+
+
+def make_batch(count, size):
+    body = os.urandom(size // 2).hex().encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return [(body, signature, SECRET)] * count
+
+
+def one_by_one(batch):
+    utility = razorpay.Utility()
+    results = []
+    for body, signature, secret in batch:
+        try:
+            results.append(utility.verify_webhook_signature(body.decode(), signature, secret))
+        except razorpay.errors.SignatureVerificationError:
+            results.append(False)
+    return results
+
+
+def measure(label, batch, **options):
+    verify = options.pop("verify", razorpay.Utility().verify_webhook_signatures)
+    start = time.perf_counter()
+    results = verify(batch, **options)
+    rate = len(batch) / (time.perf_counter() - start)
+    if not all(results):
+        msg = f"{label}: valid signatures were rejected"
+        raise SystemExit(msg)
+    print(f"{label:<40} {rate:12,.0f} signatures/s")
+
+
+def main():
+    workers = os.cpu_count()
+    small = make_batch(400_000, 512)
+    print(f"512 byte bodies, {workers} workers")
+    measure("  one by one, raising on failure", small, verify=one_by_one)
+    measure("  serial", small)
+    measure("  process pool", small, pool="process", max_workers=workers, chunk_size=10_000)
+
+    large = make_batch(4_000, 256 * 1024)
+    print(f"256 KiB bodies, {workers} workers")
+    measure("  one by one, raising on failure", large, verify=one_by_one)
+    measure("  serial", large)
+    measure("  thread pool", large, pool="thread", max_workers=workers, chunk_size=100)
+
+
+if __name__ == "__main__":
+    main()
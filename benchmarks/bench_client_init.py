@@ -0,0 +1,63 @@
+"""Client construction cost and per-client memory footprint.
+
+Resources are created on first access, so a short-lived client that only
+touches ``order`` or ``payment`` no longer builds every resource object.
+The eager case below touches every resource to reproduce the previous
+behaviour.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_client_init
+"""
+
+# Standard library imports
+import gc
+import time
+import tracemalloc
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.client import RESOURCE_CLASSES, UTILITY_CLASSES
+
+CLIENTS = 2000
+ALL_RESOURCES = [*RESOURCE_CLASSES, *UTILITY_CLASSES]
+
+
+def lazy():
+    client = razorpay.Client(auth=("key_id", "secret"))
+    client.payment  # noqa: B018
+    return client
+
+
+def eager():
+    client = razorpay.Client(auth=("key_id", "secret"))
+    for name in ALL_RESOURCES:
+        getattr(client, name)
+    return client
+
+
+def measure(label, make_client):
+    make_client()  # warm up caches shared by all clients
+
+    start = time.perf_counter()
+    for _ in range(CLIENTS):
+        make_client()
+    per_client_us = (time.perf_counter() - start) / CLIENTS * 1e6
+
+    gc.collect()
+    tracemalloc.start()
+    clients = [make_client() for _ in range(CLIENTS // 10)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_client_kb = size / len(clients) / 1024
+
+    print(f"{label:<32} {per_client_us:8.1f} us {per_client_kb:8.1f} KiB per client")
+
+
+def main():
+    measure("lazy, one resource used", lazy)
+    measure("eager, all resources built", eager)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Cost of ``import razorpay`` in a fresh interpreter.
+
+The package imports its modules on first attribute access, so importing it
+no longer loads ``requests``, ``httpx`` and every resource module. The eager
+case imports the client, async client and resources up front to reproduce
+the previous behaviour.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_import
+"""
+
+# Standard library imports
+import re
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+LAZY = "import razorpay"
+EAGER = "import razorpay; razorpay.Client; razorpay.AsyncClient; razorpay.Payment; razorpay.Webhook"
+
+
+def top_level_imports(code):
+    """Return the cumulative time, in microseconds, of each top level import of `code`."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # Nested imports are indented and already included in the cumulative times
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", line)
+        if match:
+            times[match.group(2)] = int(match.group(1))
+    return times
+
+
+def measure(label, code):
+    # Leave out imports done by the interpreter at startup, e.g. site
+    startup = set(top_level_imports("pass"))
+    runs = []
+    for _ in range(RUNS):
+        times = top_level_imports(code)
+        runs.append(sum(t for name, t in times.items() if name not in startup))
+    print(f"{label:<32} {statistics.median(runs) / 1000:8.1f} ms")
+
+
+def main():
+    measure("import razorpay", LAZY)
+    measure("import everything eagerly", EAGER)
+
+
+if __name__ == "__main__":
+    main()
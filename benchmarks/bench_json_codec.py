@@ -0,0 +1,86 @@
+"""Decoding cost of large listings such as ``payment.all({"count": 100})``.
+
+Responses used to be decoded with ``response.json()``, which first decodes
+the body to text. Codecs decode ``response.content`` bytes directly.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_json_codec
+"""
+
+# Standard library imports
+import json
+import time
+
+# Other third-party library imports
+import requests
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.codecs import CODECS
+
+RESPONSES = 2000
+
+
+def payment(index):
+    return {
+        "id": f"pay_{index:014d}",
+        "entity": "payment",
+        "amount": 50000 + index,
+        "currency": "INR",
+        "status": "captured",
+        "order_id": f"order_{index:014d}",
+        "invoice_id": None,
+        "international": False,
+        "method": "card",
+        "amount_refunded": 0,
+        "refund_status": None,
+        "captured": True,
+        "description": "Purchase of goods",
+        "card_id": f"card_{index:014d}",
+        "bank": None,
+        "wallet": None,
+        "vpa": None,
+        "email": f"customer{index}@example.com",
+        "contact": "+919000090000",
+        "notes": {"order_reference": f"ref-{index}", "cart": "3 items"},
+        "fee": 1180,
+        "tax": 180,
+        "error_code": None,
+        "error_description": None,
+        "acquirer_data": {"auth_code": "828553"},
+        "created_at": 1700000000 + index,
+    }
+
+
+def listing_response():
+    body = {"entity": "collection", "count": 100, "items": [payment(i) for i in range(100)]}
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+def measure(label, decode, response):
+    start = time.perf_counter()
+    for _ in range(RESPONSES):
+        decode(response)
+    per_response_us = (time.perf_counter() - start) / RESPONSES * 1e6
+    print(f"{label:<32} {per_response_us:8.1f} us per response")
+
+
+def main():
+    response = listing_response()
+    print(f"{len(response.content) / 1024:.0f} KiB listing of 100 payments")
+    measure("response.json()", lambda r: r.json(), response)
+    for name in CODECS:
+        try:
+            client = razorpay.Client(auth=("key_id", "secret"), codec=name)
+        except ImportError:
+            print(f"{name:<32} not installed")
+            continue
+        measure(f"{name} codec", client._process_response, response)
+
+
+if __name__ == "__main__":
+    main()
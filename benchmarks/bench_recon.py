@@ -0,0 +1,117 @@
+"""Reconciliation of a synthetic million-row dataset.
+
+500,000 captured payments are reconciled with 500,000 settlement report
+rows, which trail the payments by a few thousand rows as settlements do:
+the report starts with rows of payments created before the reconciled
+window and misses the latest payments.
+One payment in a thousand is unsettled and one row in a thousand drifts.
+
+The streaming case uses `Reconciler.reconcile`. The materialised case loads
+both sources into memory and joins them afterwards, as an ad-hoc script
+would. Each case runs in its own interpreter so that peak memory is
+measured separately.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_recon
+"""
+
+# Standard library imports
+import resource
+import subprocess
+import sys
+import time
+
+# Razorpay SDK imports
+from razorpay import Reconciler
+
+START = 1704047400
+PAYMENTS = 500_000
+# Rows by which the report trails the payments
+LAG = 5_000
+SETTLEMENT_SIZE = 10_000
+# Remainders modulo 1000 of the unsettled payments and of the drifting rows
+UNSETTLED = 1
+DRIFTING = 2
+
+
+def payments():
+    for index in range(PAYMENTS):
+        yield {
+            "id": f"pay_{index:014d}",
+            "entity": "payment",
+            "amount": 50000 + index % 1000,
+            "currency": "INR",
+            "status": "captured",
+            "captured": True,
+            "method": "card",
+            "created_at": START + index,
+        }
+
+
+def rows():
+    for index in range(-LAG, PAYMENTS - LAG):
+        if index % 1000 == UNSETTLED:
+            continue
+        amount = 50000 + index % 1000
+        yield {
+            "entity_id": f"pay_{index:014d}",
+            "type": "payment",
+            "amount": amount + (1 if index % 1000 == DRIFTING else 0),
+            "credit": amount - 1180,
+            "debit": 0,
+            "fee": 1000,
+            "tax": 180,
+            "settled": True,
+            "settlement_id": f"setl_{index // SETTLEMENT_SIZE:06d}",
+            "created_at": START + index,
+        }
+
+
+def streaming():
+    # Rows are a second apart, so the horizon keeps the ids of 2 * LAG rows
+    reconciler = Reconciler(window=(START, START + PAYMENTS), settled_horizon=2 * LAG)
+    mismatches = sum(1 for _ in reconciler.reconcile(payments(), rows()))
+    stats = reconciler.stats()
+    return mismatches, stats["peak_pending"] + stats["settled_ids"]
+
+
+def materialised():
+    entities = {payment["id"]: payment for payment in payments()}
+    report = list(rows())
+    mismatches = 0
+    settled = set()
+    for row in report:
+        if row["created_at"] < START:
+            continue
+        entity = entities.get(row["entity_id"])
+        settled.add(row["entity_id"])
+        if entity is None or entity["amount"] != row["amount"]:
+            mismatches += 1
+    mismatches += sum(1 for entity_id in entities if entity_id not in settled)
+    return mismatches, len(entities) + len(report)
+
+
+def run(mode):
+    started_at = time.perf_counter()
+    mismatches, held = globals()[mode]()
+    elapsed = time.perf_counter() - started_at
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{mode:<14} {elapsed:6.2f} s {2 * PAYMENTS / elapsed:10,.0f} rows/s "
+        f"{peak:8.1f} MiB peak {held:9,d} held {mismatches:6,d} mismatches"
+    )
+
+
+def main():
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+        return
+    for mode in ("streaming", "materialised"):
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "benchmarks.bench_recon", mode], check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
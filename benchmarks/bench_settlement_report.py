@@ -0,0 +1,129 @@
+"""Memory used to read a month of the settlement recon report.
+
+`settlement.report({"year": ..., "month": ...})` returns the whole month as
+one JSON document, decoded into a dict per row. `settlement.iter_report`
+requests it day by day and page by page, decoding one page at a time and
+yielding `ReconRecord` objects, which keep their columns in slots instead
+of a dict.
+
+Responses are encoded in memory before measuring, so only decoding and
+the rows are measured. Peak memory is traced with tracemalloc.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_settlement_report
+"""
+
+# Standard library imports
+import json
+import tracemalloc
+
+# Razorpay SDK imports
+from razorpay.resources.settlement import Settlement
+
+# April has 30 days
+MONTH = {"year": 2024, "month": 4}
+DAYS = 30
+ROWS_PER_DAY = 4000
+PAGE_SIZE = 100
+
+
+def row(day, index):
+    return {
+        "entity_id": f"pay_{day:02d}{index:012d}",
+        "type": "payment",
+        "debit": 0,
+        "credit": 48820,
+        "amount": 50000,
+        "currency": "INR",
+        "fee": 1000,
+        "tax": 180,
+        "on_hold": False,
+        "settled": True,
+        "created_at": 1706725800 + day * 86400 + index,
+        "settled_at": 1706898600 + day * 86400,
+        "settlement_id": f"setl_{day:014d}",
+        "posted_at": None,
+        "credit_type": "default",
+        "description": "Payment for order",
+        "notes": {"order": f"ref-{index}"},
+        "payment_id": None,
+        "settlement_utr": f"{day:016d}",
+        "order_id": f"order_{day:02d}{index:012d}",
+        "order_receipt": None,
+        "method": "upi",
+        "upi_flow": "intent",
+        "card_network": None,
+        "card_issuer": None,
+        "card_type": None,
+        "dispute_id": None,
+    }
+
+
+class ReportClient:
+    """Serve the report of a month, whole or page by page, from encoded responses."""
+
+    def __init__(self):
+        days = {day: [row(day, i) for i in range(ROWS_PER_DAY)] for day in range(1, DAYS + 1)}
+        self.month = encode([item for rows in days.values() for item in rows])
+        self.pages = {
+            (day, skip): encode(rows[skip : skip + PAGE_SIZE])
+            for day, rows in days.items()
+            for skip in range(0, len(rows) + 1, PAGE_SIZE)
+        }
+
+    def get(self, path, params, **options):
+        """Decode the response of a report request."""
+        if "day" not in params:
+            return json.loads(self.month)
+        return json.loads(self.pages.get((params["day"], params["skip"]), EMPTY))
+
+
+def encode(items):
+    return json.dumps({"entity": "collection", "count": len(items), "items": items})
+
+
+EMPTY = encode([])
+
+
+def measure(label, read):
+    client = ReportClient()
+    settlement = Settlement(client)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    count, retained = read(settlement)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    print(f"{label:<34} {count:8,d} rows {peak / 2**20:8.1f} MiB peak{retained}")
+
+
+def whole_month(settlement):
+    rows = settlement.report(MONTH)["items"]
+    return len(rows), ""
+
+
+def streamed(settlement):
+    count = 0
+    for _ in settlement.iter_report(MONTH):
+        count += 1
+    return count, ""
+
+
+def kept(records):
+    def read(settlement):
+        rows = list(settlement.iter_report(MONTH, records=records))
+        size = tracemalloc.get_traced_memory()[0] / 2**20
+        return len(rows), f" {size:8.1f} MiB kept"
+
+    return read
+
+
+def main():
+    measure("report() whole month", whole_month)
+    measure("iter_report() streamed", streamed)
+    measure("iter_report() kept as dicts", kept(False))
+    measure("iter_report() kept as ReconRecord", kept(True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Connection setup cost with and without the shared SSL context.
+
+Every client in a multi-tenant service opens its own connections. Before the
+shared context, each new connection loaded ``ca-bundle.crt`` and did a full
+TLS handshake; now the bundle is parsed once per process and handshakes to a
+known host resume the previous TLS session.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_ssl_context
+"""
+
+# Standard library imports
+import os
+import ssl
+import tempfile
+import time
+
+# Other third-party library imports
+import requests
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.adapters import ResumingSSLContext
+from razorpay.client import CERT_PATH
+from tests.helpers import CERT_FILE, StubServer
+
+CLIENTS = 200
+
+
+def run(label, make_client, server):
+    start = time.perf_counter()
+    for _ in range(CLIENTS):
+        client = make_client(server.url)
+        client.payment.fetch("pay_1")
+        client.session.close()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / CLIENTS * 1000:8.3f} ms per client")
+
+
+def main():
+    # The local server's certificate is appended to the bundled CAs so both
+    # paths verify the same set of certificates
+    with open(CERT_PATH, "rb") as f, open(CERT_FILE, "rb") as g:
+        bundle = f.read() + b"\n" + g.read()
+    with tempfile.NamedTemporaryFile(suffix=".crt", delete=False) as f:
+        f.write(bundle)
+    bundle_path = f.name
+
+    start = time.perf_counter()
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_verify_locations(cafile=bundle_path)
+    print(f"{'load CA bundle once':<28} {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+    def before(url):
+        client = razorpay.Client(
+            auth=("key_id", "secret"), base_url=url, session=requests.Session()
+        )
+        client.cert_path = bundle_path
+        return client
+
+    def after(url):
+        return razorpay.Client(auth=("key_id", "secret"), base_url=url, ssl_context=context)
+
+    routes = {("GET", "/v1/payments/pay_1"): (200, {"id": "pay_1"})}
+    try:
+        with StubServer(routes, tls=True) as server:
+            run("bundle path per connection", before, server)
+            run("shared SSL context", after, server)
+    finally:
+        os.remove(bundle_path)
+
+
+if __name__ == "__main__":
+    main()
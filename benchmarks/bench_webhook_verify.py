@@ -0,0 +1,63 @@
+"""Webhook signature verification throughput.
+
+``WebhookVerifier`` keys the HMAC once and verifies raw ``bytes`` bodies
+against binary digests, while ``Utility.verify_webhook_signature`` encodes
+the secret and body and builds a new HMAC for every webhook.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_webhook_verify
+"""
+
+# Standard library imports
+import hashlib
+import hmac
+import json
+import time
+
+# Razorpay SDK imports
+import razorpay
+
+SECRET = "webhook_secret"  # noqa: S105
+WEBHOOKS = 100_000
+
+
+def make_body(size):
+    payload = {"event": "payment.captured", "payload": {"payment": {"entity": {"notes": ""}}}}
+    body = json.dumps(payload)
+    payload["payload"]["payment"]["entity"]["notes"] = "x" * max(0, size - len(body))
+    return json.dumps(payload).encode()
+
+
+def measure(label, verify, body, signature):
+    start = time.perf_counter()
+    for _ in range(WEBHOOKS):
+        verify(body, signature)
+    rate = WEBHOOKS / (time.perf_counter() - start)
+    print(f"{label:<40} {rate:12,.0f} webhooks/s")
+
+
+def main():
+    utility = razorpay.Utility()
+    verifier = razorpay.WebhookVerifier(SECRET)
+    for size in (512, 4096):
+        body = make_body(size)
+        signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        text = body.decode()
+
+        print(f"{size} byte body")
+        measure(
+            "  Utility.verify_webhook_signature",
+            lambda b, s: utility.verify_webhook_signature(b, s, SECRET),
+            text,
+            signature,
+        )
+        measure("  WebhookVerifier.verify (str)", verifier.verify, text, signature)
+        measure("  WebhookVerifier.verify (bytes)", verifier.verify, body, signature)
+        measure(
+            "  WebhookVerifier.verify (memoryview)", verifier.verify, memoryview(body), signature
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,151 @@
-# Razorpay SDK local imports
-from .client import Client
-from .constants import ERROR_CODE
-from .resources import (
-    Account,
-    Addon,
-    Card,
-    Customer,
-    Dispute,
-    Document,
-    FundAccount,
-    Iin,
-    Invoice,
-    Item,
-    Order,
-    Payment,
-    PaymentLink,
-    Plan,
-    Product,
-    Qrcode,
-    Refund,
-    RegistrationLink,
-    Settlement,
-    Stakeholder,
-    Subscription,
-    Token,
-    Transfer,
-    VirtualAccount,
-    Webhook,
-)
-from .utility import Utility
+# Standard library imports
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Names are imported on first access (PEP 562), so `import razorpay` does not
+# pay for `requests`, `httpx` and every resource module up front.
+_LAZY_ATTRIBUTES = {
+    "AsyncClient": ".async_client",
+    "CircuitBreaker": ".circuit_breaker",
+    "Client": ".client",
+    "IinIndex": ".iin_index",
+    "ERROR_CODE": ".constants",
+    "HTTP_STATUS_CODE": ".constants",
+    "PaymentWatcher": ".payment_watcher",
+    "RateLimiter": ".rate_limiter",
+    "Reconciler": ".recon",
+    "CachePolicy": ".response_cache",
+    "ResponseCache": ".response_cache",
+    "SingleFlight": ".single_flight",
+    "Account": ".resources",
+    "Addon": ".resources",
+    "Card": ".resources",
+    "Customer": ".resources",
+    "Dispute": ".resources",
+    "Document": ".resources",
+    "FundAccount": ".resources",
+    "Iin": ".resources",
+    "Invoice": ".resources",
+    "Item": ".resources",
+    "Order": ".resources",
+    "Payment": ".resources",
+    "PaymentLink": ".resources",
+    "Plan": ".resources",
+    "Product": ".resources",
+    "Qrcode": ".resources",
+    "Refund": ".resources",
+    "RegistrationLink": ".resources",
+    "Settlement": ".resources",
+    "Stakeholder": ".resources",
+    "Subscription": ".resources",
+    "Token": ".resources",
+    "Transfer": ".resources",
+    "VirtualAccount": ".resources",
+    "Webhook": ".resources",
+    "Utility": ".utility",
+    "WebhookKeyring": ".utility",
+    "WebhookVerifier": ".utility",
+    "WebhookProcessor": ".webhook_processor",
+}
+
+# Submodules bound as attributes by `import razorpay` before imports were lazy
+_SUBMODULES = frozenset(("client", "constants", "errors", "resources", "utility"))
+
+# Attributes exported under a different name than in their module
+_ALIASES = {"HTTP_STATUS_CODE": "HttpStatusCode"}
+
+if TYPE_CHECKING:
+    from .async_client import AsyncClient
+    from .circuit_breaker import CircuitBreaker
+    from .client import Client
+    from .constants import ERROR_CODE
+    from .constants import HttpStatusCode as HTTP_STATUS_CODE
+    from .iin_index import IinIndex
+    from .payment_watcher import PaymentWatcher
+    from .rate_limiter import RateLimiter
+    from .recon import Reconciler
+    from .resources import (
+        Account,
+        Addon,
+        Card,
+        Customer,
+        Dispute,
+        Document,
+        FundAccount,
+        Iin,
+        Invoice,
+        Item,
+        Order,
+        Payment,
+        PaymentLink,
+        Plan,
+        Product,
+        Qrcode,
+        Refund,
+        RegistrationLink,
+        Settlement,
+        Stakeholder,
+        Subscription,
+        Token,
+        Transfer,
+        VirtualAccount,
+        Webhook,
+    )
+    from .response_cache import CachePolicy, ResponseCache
+    from .single_flight import SingleFlight
+    from .utility import Utility, WebhookKeyring, WebhookVerifier
+    from .webhook_processor import WebhookProcessor
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        # Importing a submodule binds it as an attribute of the package
+        return import_module(f".{name}", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(module_name, __name__), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
 
 __all__ = [
     "ERROR_CODE",
     "HTTP_STATUS_CODE",
     "Account",
     "Addon",
+    "AsyncClient",
+    "CachePolicy",
     "Card",
+    "CircuitBreaker",
     "Client",
     "Customer",
     "Dispute",
     "Document",
     "FundAccount",
     "Iin",
+    "IinIndex",
     "Invoice",
     "Item",
     "Order",
     "Payment",
     "PaymentLink",
+    "PaymentWatcher",
     "Plan",
     "Product",
     "Qrcode",
+    "RateLimiter",
+    "Reconciler",
     "Refund",
     "RegistrationLink",
+    "ResponseCache",
     "Settlement",
+    "SingleFlight",
     "Stakeholder",
     "Subscription",
     "Token",
@@ -60,4 +153,7 @@ __all__ = [
     "Utility",
     "VirtualAccount",
     "Webhook",
+    "WebhookKeyring",
+    "WebhookProcessor",
+    "WebhookVerifier",
 ]
@@ -0,0 +1,127 @@
+"""Transport adapters used by the Razorpay client."""
+
+# Standard library imports
+import socket
+import ssl
+import threading
+import weakref
+from functools import cache
+
+# Other third-party library imports
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def keepalive_socket_options(idle, interval=None):
+    """Return socket options enabling TCP keep-alive probes after `idle` seconds.
+
+    Probes keep idle pooled connections from being silently dropped by
+    load balancers and NAT gateways between requests.
+    """
+    options = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # The probe timings are not configurable on every platform
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval or idle))
+    return options
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """`SSLContext` that resumes the last TLS session of a host on new connections.
+
+    Resumed handshakes skip the certificate exchange and verification, which
+    makes opening additional pooled connections to the API cheaper.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._session_lock = threading.Lock()
+        self._sessions = {}
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        """Wrap `sock`, offering the last session negotiated with the same host."""
+        if session is None and server_hostname is not None:
+            session = self._session_for(server_hostname)
+        # A session the server no longer accepts just results in a full handshake
+        ssl_sock = super().wrap_socket(
+            sock, *args, server_hostname=server_hostname, session=session, **kwargs
+        )
+        if server_hostname is not None:
+            with self._session_lock:
+                previous = self._sessions.get(server_hostname, (None, None))[1]
+                self._sessions[server_hostname] = (weakref.ref(ssl_sock), previous)
+        return ssl_sock
+
+    def _session_for(self, host):
+        with self._session_lock:
+            sock_ref, session = self._sessions.get(host, (None, None))
+            sock = sock_ref() if sock_ref is not None else None
+            # TLS 1.3 tickets arrive after the handshake, so the session is read
+            # from the most recent connection only when it is needed
+            latest = getattr(sock, "session", None) if sock is not None else None
+            if latest is not None and latest.has_ticket:
+                session = latest
+                self._sessions[host] = (sock_ref, session)
+            return session
+
+
+@cache
+def shared_ssl_context(cafile):
+    """Return the process wide SSL context trusting the certificates in `cafile`.
+
+    Loading and parsing a CA bundle is costly, so it is done once and the
+    context is shared by every client and connection pool.
+    """
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_verify_locations(cafile=cafile)
+    return context
+
+
+class RazorpayAdapter(HTTPAdapter):
+    """`HTTPAdapter` with custom socket options and a preloaded SSL context.
+
+    Requests verified against `ca_bundle` use `ssl_context`, which already
+    holds the certificates of that bundle, instead of loading the bundle
+    again for every new connection.
+    """
+
+    __attrs__ = (*HTTPAdapter.__attrs__, "socket_options", "ssl_context", "ca_bundle")
+
+    def __init__(self, socket_options=None, ssl_context=None, ca_bundle=None, **kwargs):
+        # Set before HTTPAdapter.__init__, which creates the pool manager
+        self.socket_options = socket_options
+        self.ssl_context = ssl_context
+        self.ca_bundle = ca_bundle
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager, passing along the socket options and SSL context."""
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        if self.ssl_context is not None:
+            kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        """Return the proxy manager for `proxy`, using the preloaded SSL context."""
+        if self.ssl_context is not None:
+            proxy_kwargs.setdefault("ssl_context", self.ssl_context)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        """Return the pool key of a request, sharing one pool for the preloaded bundle."""
+        if self._uses_context(verify):
+            verify = True
+        return super().build_connection_pool_key_attributes(request, verify, cert)
+
+    def cert_verify(self, conn, url, verify, cert):
+        """Configure certificate verification of a connection pool."""
+        super().cert_verify(conn, url, verify, cert)
+        if self._uses_context(verify) and url.lower().startswith("https"):
+            # The certificates are already in the SSL context, don't load a
+            # bundle into it again for every connection
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+    def _uses_context(self, verify):
+        return self.ssl_context is not None and verify is not False and verify == self.ca_bundle
@@ -0,0 +1,203 @@
+"""Razorpay asyncio client."""
+
+# Standard library imports
+import asyncio
+import logging
+
+# Razorpay SDK local imports
+from .adapters import shared_ssl_context
+from .client import (
+    CERT_PATH,
+    DEFAULT_POOL_OPTIONS,
+    Client,
+    RetryState,
+    endpoint_group,
+    retry_after,
+)
+
+try:
+    # Other third-party library imports
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClient(Client):
+    """Razorpay client for asyncio applications.
+
+    Exposes the same resources as `Client`, but every API call returns a
+    coroutine, e.g. ``await client.order.create(data)``. Requests are sent
+    through a pooled ``httpx.AsyncClient``, which requires the ``async``
+    extra (``pip install razorpay-py[async]``).
+    """
+
+    def __init__(self, session=None, auth=None, **options):
+        if session is None:
+            if httpx is None:
+                msg = "AsyncClient requires httpx, install it with `pip install razorpay-py[async]`"
+                raise ImportError(msg)
+            pool_maxsize = options.get("pool_maxsize", DEFAULT_POOL_OPTIONS["pool_maxsize"])
+            session = httpx.AsyncClient(
+                verify=options.get("ssl_context") or shared_ssl_context(CERT_PATH),
+                limits=httpx.Limits(
+                    max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+                ),
+            )
+        super().__init__(session=session, auth=auth, **options)
+        self._refresh_tasks = set()
+
+    async def __aenter__(self):
+        """Return the client for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the client when leaving the context manager."""
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    def _mount_adapter(self):
+        # Pool limits are given to the httpx client when it is created
+        pass
+
+    async def warmup(self, connections=None):
+        """Open pooled connections to the API ahead of the first requests.
+
+        Args:
+            connections : Number of connections to open, at most and by
+                default the `pool_maxsize` of the client
+
+        Returns:
+            Number of connections that were established
+        """
+        # Connections beyond the pool size could not be kept, and with
+        # `pool_block` the calls would wait for each other forever
+        pool_maxsize = self.pool_options["pool_maxsize"]
+        connections = min(connections or pool_maxsize, pool_maxsize)
+
+        async def connect():
+            # Streamed responses keep their connection checked out until read
+            request = self.session.build_request("GET", self.base_url, timeout=10)
+            return await self.session.send(request, stream=True)
+
+        results = await asyncio.gather(
+            *(connect() for _ in range(connections)), return_exceptions=True
+        )
+        opened = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Could not warm up connection: {result}")
+            else:
+                opened.append(result)
+
+        for response in opened:
+            await response.aread()
+            await response.aclose()
+        return len(opened)
+
+    async def request(self, method, path, **options):
+        """Dispatch a request to the Razorpay HTTP API with retry mechanism."""
+        auth_to_use, options = self._prepare_request(method, path, options)
+        options = self._httpx_options(options)
+
+        url = f"{self.base_url}{path}"
+
+        retry = RetryState(self)
+        group = endpoint_group(path)
+
+        while True:
+            await self._before_call(group)
+            try:
+                response = await self.session.request(
+                    method.upper(), url, auth=auth_to_use, **options
+                )
+            except (httpx.NetworkError, httpx.TimeoutException, httpx.RemoteProtocolError) as e:
+                self._record_outcome(group)
+                delay = retry.next_delay(e)
+                if delay is None:
+                    retry.log_exhausted(e)
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except httpx.HTTPError as e:
+                # For other request exceptions, don't retry
+                self._record_outcome(group)
+                logger.exception(f"Request error: {e}")
+                raise
+            except BaseException:
+                # Cancelled or interrupted before the outcome was known
+                self._release_call(group)
+                raise
+
+            self._record_outcome(group, response.status_code)
+            if response.status_code in self.retry_status_codes:
+                delay = retry.next_delay(f"HTTP {response.status_code}", retry_after(response))
+                if delay is not None:
+                    await asyncio.sleep(delay)
+                    continue
+            return self._process_response(response)
+
+    async def _before_call(self, group):
+        """Wait for the rate limiter, then check the circuit of `group`."""
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(self.rate_limit_key(), group)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call(group)
+
+    async def get(self, path, params, **options):
+        """Parse GET request options and dispatch a request."""
+        cache = self.response_cache
+        if cache is None or cache.policy_for(path) is None:
+            return await self._load(path, params, options)
+        key = self._request_key(path, params, options)
+        data, refresh = cache.lookup(key)
+        if data is None:
+            value = await self._load(path, params, options, key)
+            cache.store(key, path, self.codec.encode(value))
+            return value
+        if refresh:
+            task = asyncio.create_task(self._refresh(key, path, params, options))
+            # Keep a reference until the task is done, the loop only holds a weak one
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return self.codec.decode(data)
+
+    async def _load(self, path, params, options, key=None):
+        """Send a GET request, sharing it with identical ones in flight."""
+        if self.single_flight is None:
+            return await self.request("get", path, params=params, **options)
+        if key is None:
+            key = self._request_key(path, params, options)
+        return await self.single_flight.ado(
+            key, lambda: self.request("get", path, params=params, **options)
+        )
+
+    async def _refresh(self, key, path, params, options):
+        """Refresh a stale cached response."""
+        try:
+            value = await self._load(path, params, options, key)
+        except Exception as e:
+            logger.warning(f"Could not refresh cached response of {path}: {e}")
+            self.response_cache.refresh_failed(key)
+            return
+        self.response_cache.refresh_done(key, path, self.codec.encode(value))
+
+    @staticmethod
+    def _httpx_options(options):
+        """Translate `requests` style keyword arguments to their httpx names."""
+        data = options.get("data")
+        if isinstance(data, (str, bytes)):
+            options["content"] = options.pop("data")
+
+        params = options.get("params")
+        if params:
+            # requests drops None values from the query string, httpx sends them empty
+            options["params"] = {k: v for k, v in params.items() if v is not None}
+
+        return options
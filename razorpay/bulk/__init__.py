@@ -0,0 +1,17 @@
+# Razorpay SDK local imports
+from .capture import BulkCapturer, CaptureResult
+from .export import BulkExporter
+from .refund import BulkRefunder, RefundResult, read_instructions
+from .transfer import BulkTransferer, TransferGroupResult, group_by_payment
+
+__all__ = [
+    "BulkCapturer",
+    "BulkExporter",
+    "BulkRefunder",
+    "BulkTransferer",
+    "CaptureResult",
+    "RefundResult",
+    "TransferGroupResult",
+    "group_by_payment",
+    "read_instructions",
+]
@@ -0,0 +1,102 @@
+"""Concurrent capture of authorized payments."""
+
+# Standard library imports
+import logging
+import threading
+from collections import namedtuple
+
+# Razorpay SDK local imports
+from .executor import call_with_retries, error_code, idempotency_key, map_bounded
+
+logger = logging.getLogger(__name__)
+
+CAPTURED = "captured"
+FAILED = "failed"
+
+CaptureResult = namedtuple(
+    "CaptureResult",
+    ("payment_id", "amount", "currency", "status", "error_code", "error", "payment"),
+)
+CaptureResult.__doc__ = """Outcome of the capture of one payment.
+
+`status` is "captured" or "failed", `error_code` and `error` describe the
+failure and `payment` is the captured payment entity.
+"""
+
+
+class BulkCapturer:
+    """Capture many authorized payments concurrently.
+
+    Captures are sent by at most `max_workers` threads, reading the
+    ``(payment_id, amount, currency)`` items lazily, and a result is yielded
+    for every item as soon as its capture completes, so batches of any size
+    are processed in constant memory.
+
+    Every capture is sent with an idempotency key derived from the payment
+    and the amount: retries after server or network errors, and a rerun of a
+    batch that was interrupted, cannot capture a payment twice.
+
+    Args:
+        client : Razorpay client used for the captures
+        max_workers : Maximum number of concurrent captures
+        rate_limiter : `RateLimiter` throttling the captures, on top of the
+            one of the client, e.g. to leave room for live traffic
+        retries : Number of additional attempts after server or network errors
+        backoff : Seconds to wait before the first retry, doubled after each one
+    """
+
+    def __init__(self, client, max_workers=8, rate_limiter=None, retries=2, backoff=1.0):
+        self.client = client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._stats = {CAPTURED: 0, FAILED: 0}
+
+    def capture(self, items):
+        """Capture every payment of `items`, yielding a `CaptureResult` per item.
+
+        Results are yielded in completion order. Stopping the iteration
+        cancels the captures that have not been sent yet.
+
+        Args:
+            items : Iterable of ``(payment_id, amount, currency)``
+        """
+        for item, future in map_bounded(
+            self._capture, items, self.max_workers, name="razorpay-capture"
+        ):
+            payment_id, amount, currency = item
+            try:
+                result = CaptureResult(
+                    payment_id, amount, currency, CAPTURED, None, None, future.result()
+                )
+            except Exception as e:
+                logger.warning(f"Could not capture {payment_id}: {e}")
+                result = CaptureResult(
+                    payment_id, amount, currency, FAILED, error_code(e), str(e), None
+                )
+            with self._lock:
+                self._stats[result.status] += 1
+            yield result
+
+    def stats(self):
+        """Return the number of payments captured and failed so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _capture(self, item):
+        payment_id, amount, currency = item
+        return call_with_retries(
+            lambda: self.client.payment.capture(
+                payment_id,
+                amount,
+                {"currency": currency},
+                idempotency_key=idempotency_key("capture", payment_id, amount),
+            ),
+            self.retries,
+            self.backoff,
+            self.rate_limiter,
+            self.client.rate_limit_key(),
+            "payments",
+        )
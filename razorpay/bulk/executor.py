@@ -0,0 +1,123 @@
+"""Bounded concurrent execution of bulk API calls."""
+
+# Standard library imports
+import logging
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+# Other third-party library imports
+import requests
+
+# Razorpay SDK local imports
+from ..constants import ERROR_CODE
+from ..errors import BadRequestError, GatewayError, ServerError
+
+logger = logging.getLogger(__name__)
+
+# Errors after which sending the same request again may succeed
+RETRYABLE_ERRORS = (
+    ServerError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+ERROR_CODES = {
+    BadRequestError: ERROR_CODE.BAD_REQUEST_ERROR,
+    GatewayError: ERROR_CODE.GATEWAY_ERROR,
+    ServerError: ERROR_CODE.SERVER_ERROR,
+}
+
+
+def error_code(error):
+    """Return the Razorpay error code of an exception, or its class name."""
+    for error_class, code in ERROR_CODES.items():
+        if isinstance(error, error_class):
+            return code
+    return type(error).__name__
+
+
+def idempotency_key(*parts):
+    """Return the idempotency key of one bulk operation, the same on every run."""
+    return ":".join(str(part) for part in parts)
+
+
+class OccurrenceKeys:
+    """Tell identical operations of a batch apart by their occurrence number.
+
+    `number` returns the key of the first operation with a given key as is
+    and suffixes the following ones with ":2", ":3", ... Unlike positions,
+    occurrence numbers do not change when unrelated lines of the batch are
+    added, removed or reordered, so a rerun of an edited batch resolves to
+    the same keys. Not thread safe: number the operations as they are read.
+    """
+
+    def __init__(self):
+        self._seen = Counter()
+
+    def number(self, key):
+        """Return `key` suffixed with its occurrence number after the first one."""
+        self._seen[key] += 1
+        occurrence = self._seen[key]
+        return key if occurrence == 1 else f"{key}:{occurrence}"
+
+
+def call_with_retries(fn, retries=2, backoff=1.0, rate_limiter=None, key="", group=None):  # noqa: PLR0913
+    """Return ``fn()``, calling it again after retryable errors.
+
+    `fn` must be safe to call again, e.g. by sending the same idempotency key.
+
+    Args:
+        fn : Callable sending the request
+        retries : Number of additional attempts
+        backoff : Seconds to wait before the first retry, doubled after each one
+        rate_limiter : `RateLimiter` acquired before every attempt
+        key : Rate limit key of the client, see `Client.rate_limit_key`
+        group : Endpoint group of the request, e.g. "payments"
+    """
+    for attempt in range(retries + 1):
+        try:
+            if rate_limiter is not None:
+                rate_limiter.acquire(key, group)
+            return fn()
+        except RETRYABLE_ERRORS as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2**attempt
+            logger.warning(f"{type(e).__name__}: {e}. Retrying in {delay:.2f}s")
+            time.sleep(delay)
+    return None  # pragma: no cover - the loop returns or raises
+
+
+def map_bounded(fn, items, max_workers=8, max_pending=None, name="razorpay-bulk"):
+    """Call `fn` on every item concurrently, yielding ``(item, future)`` as they complete.
+
+    Items are read from `items` only as workers free up, so at most
+    `max_pending` of them (twice `max_workers` by default) are held at once
+    and `items` may be a generator over a file of any size. Closing the
+    generator cancels the calls that have not started.
+
+    Args:
+        fn : Callable applied to each item
+        items : Iterable of items
+        max_workers : Maximum number of concurrent calls
+        max_pending : Maximum number of items submitted but not yet yielded
+        name : Prefix of the worker thread names
+    """
+    max_pending = max_pending or 2 * max_workers
+    items = iter(items)
+    pending = {}
+    with ThreadPoolExecutor(max_workers, thread_name_prefix=name) as executor:
+        try:
+            while True:
+                for item in islice(items, max_pending - len(pending)):
+                    pending[executor.submit(fn, item)] = item
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,282 @@
+"""Resumable bulk refunds."""
+
+# Standard library imports
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+# Razorpay SDK local imports
+from .executor import (
+    OccurrenceKeys,
+    call_with_retries,
+    error_code,
+    idempotency_key,
+    map_bounded,
+)
+
+logger = logging.getLogger(__name__)
+
+REFUNDED = "refunded"
+FAILED = "failed"
+
+# Number of most recent latencies the latency percentiles are computed from
+LATENCY_WINDOW = 10000
+
+RefundResult = namedtuple(
+    "RefundResult",
+    ("payment_id", "amount", "status", "error_code", "error", "refund", "latency"),
+)
+RefundResult.__doc__ = """Outcome of one refund instruction.
+
+`amount` is None for a full refund, `status` is "refunded" or "failed",
+`refund` is the created refund entity and `latency` the seconds taken by
+the request, retries included.
+"""
+
+
+def read_instructions(path, fmt=None):
+    """Yield the refund instructions of a CSV or JSONL file as dicts.
+
+    Every instruction has a `payment_id` and optionally an `amount` (a full
+    refund when missing) along with any field accepted by `payment.refund`,
+    e.g. `speed`, `receipt` or `notes`. Empty CSV cells are ignored and a
+    `notes` column holds a JSON object.
+
+    Args:
+        path : Path of the file
+        fmt : "csv" or "jsonl", guessed from the file extension by default
+    """
+    fmt = fmt or ("csv" if path.endswith(".csv") else "jsonl")
+    if fmt not in ("csv", "jsonl"):
+        msg = f"Unsupported instruction format: {fmt}"
+        raise ValueError(msg)
+    with open(path, newline="") as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        for row in csv.DictReader(f):
+            instruction = {name: value for name, value in row.items() if value}
+            if "amount" in instruction:
+                instruction["amount"] = int(instruction["amount"])
+            if "notes" in instruction:
+                instruction["notes"] = json.loads(instruction["notes"])
+            yield instruction
+
+
+def instruction_key(instruction):
+    """Return the key identifying a refund instruction in the checkpoint log."""
+    return idempotency_key(
+        "refund",
+        instruction["payment_id"],
+        instruction.get("amount", "full"),
+        instruction.get("receipt", ""),
+    )
+
+
+class BulkRefunder:
+    """Issue many refunds concurrently, resuming from a checkpoint log.
+
+    Instructions are read lazily and refunded by at most `max_workers`
+    threads. When a `checkpoint` path is given, the outcome of every
+    instruction is appended to it as a JSON line and a later run skips the
+    instructions that were refunded, so an interrupted batch can simply be
+    run again. Failed instructions are tried again on the next run.
+
+    The log is flushed after every line and synced to disk every
+    `sync_every` lines. Refunds are sent with an idempotency key per
+    instruction, so one refunded just before a crash and missing from the
+    log is not refunded twice when it is sent again. Identical instructions
+    are told apart by their occurrence number (see `OccurrenceKeys`), so
+    they are separate refunds, and the keys of the other instructions do not
+    change when lines are added, removed or reordered before a rerun.
+
+    Args:
+        client : Razorpay client used for the refunds
+        max_workers : Maximum number of concurrent refunds
+        rate_limiter : `RateLimiter` throttling the refunds, on top of the
+            one of the client
+        retries : Number of additional attempts after server or network errors
+        backoff : Seconds to wait before the first retry, doubled after each one
+        checkpoint : Path of the checkpoint log
+        sync_every : Number of log lines written between two syncs to disk
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client,
+        max_workers=8,
+        rate_limiter=None,
+        retries=2,
+        backoff=1.0,
+        checkpoint=None,
+        sync_every=100,
+    ):
+        self.client = client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.checkpoint = checkpoint
+        self.sync_every = sync_every
+        self._lock = threading.Lock()
+        self._stats = {REFUNDED: 0, FAILED: 0, "skipped": 0}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._started_at = None
+        self._elapsed = 0.0
+
+    def refund(self, instructions):
+        """Refund every instruction, yielding a `RefundResult` per instruction sent.
+
+        Instructions already refunded according to the checkpoint log are
+        skipped without a result. Results are yielded in completion order.
+
+        Args:
+            instructions : Iterable of dicts with a `payment_id`, e.g. from
+                `read_instructions`
+        """
+        done = self._load_checkpoint()
+
+        def pending():
+            keys = OccurrenceKeys()
+            for instruction in instructions:
+                key = keys.number(instruction_key(instruction))
+                if key in done:
+                    with self._lock:
+                        self._stats["skipped"] += 1
+                    continue
+                yield key, instruction
+
+        log = self._open_log()
+        self._started_at = time.monotonic()
+        unsynced = 0
+        try:
+            for (key, _), future in map_bounded(
+                self._refund, pending(), self.max_workers, name="razorpay-refund"
+            ):
+                result = future.result()
+                self._record(result)
+                if log is not None:
+                    log.write(self._log_line(key, result))
+                    log.flush()
+                    unsynced += 1
+                    if unsynced >= self.sync_every:
+                        os.fsync(log.fileno())
+                        unsynced = 0
+                yield result
+        finally:
+            self._elapsed += time.monotonic() - self._started_at
+            self._started_at = None
+            if log is not None:
+                os.fsync(log.fileno())
+                log.close()
+
+    def refund_file(self, path, fmt=None):
+        """Refund the instructions of a CSV or JSONL file, see `read_instructions`."""
+        return self.refund(read_instructions(path, fmt))
+
+    def stats(self):
+        """Return the refund counts, the throughput and the request latencies in seconds."""
+        with self._lock:
+            elapsed = self._elapsed
+            if self._started_at is not None:
+                elapsed += time.monotonic() - self._started_at
+            sent = self._stats[REFUNDED] + self._stats[FAILED]
+            latencies = sorted(self._latencies)
+            return {
+                **self._stats,
+                "elapsed": elapsed,
+                "throughput": sent / elapsed if elapsed else 0.0,
+                "latency_avg": self._latency_total / sent if sent else 0.0,
+                "latency_p50": _percentile(latencies, 0.5),
+                "latency_p95": _percentile(latencies, 0.95),
+                "latency_max": self._latency_max,
+            }
+
+    def _refund(self, item):
+        key, instruction = item
+        data = {
+            name: value
+            for name, value in instruction.items()
+            if name not in ("payment_id", "amount")
+        }
+        payment_id = instruction["payment_id"]
+        amount = instruction.get("amount")
+        started_at = time.monotonic()
+        try:
+            refund = call_with_retries(
+                lambda: self.client.payment.refund(
+                    payment_id, amount, dict(data), idempotency_key=key
+                ),
+                self.retries,
+                self.backoff,
+                self.rate_limiter,
+                self.client.rate_limit_key(),
+                "payments",
+            )
+        except Exception as e:
+            logger.warning(f"Could not refund {payment_id}: {e}")
+            latency = time.monotonic() - started_at
+            return RefundResult(payment_id, amount, FAILED, error_code(e), str(e), None, latency)
+        latency = time.monotonic() - started_at
+        return RefundResult(payment_id, amount, REFUNDED, None, None, refund, latency)
+
+    def _record(self, result):
+        with self._lock:
+            self._stats[result.status] += 1
+            self._latencies.append(result.latency)
+            self._latency_total += result.latency
+            self._latency_max = max(self._latency_max, result.latency)
+
+    @staticmethod
+    def _log_line(key, result):
+        entry = {
+            "key": key,
+            "payment_id": result.payment_id,
+            "status": result.status,
+        }
+        if result.refund is not None:
+            entry["refund_id"] = result.refund.get("id")
+        if result.error_code is not None:
+            entry["error_code"] = result.error_code
+        return json.dumps(entry) + "\n"
+
+    def _open_log(self):
+        if not self.checkpoint:
+            return None
+        log = open(self.checkpoint, "a+")
+        if log.tell():
+            log.seek(log.tell() - 1)
+            if log.read(1) != "\n":
+                # Terminate a line cut short by a crash
+                log.write("\n")
+        return log
+
+    def _load_checkpoint(self):
+        """Return the keys of the instructions the checkpoint log reports as refunded."""
+        done = set()
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return done
+        with open(self.checkpoint) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                if entry.get("status") == REFUNDED:
+                    done.add(entry["key"])
+        return done
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
@@ -0,0 +1,271 @@
+"""Concurrent Route transfers grouped by payment."""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import threading
+from collections import namedtuple
+
+# Razorpay SDK local imports
+from .executor import (
+    OccurrenceKeys,
+    call_with_retries,
+    error_code,
+    idempotency_key,
+    map_bounded,
+)
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+PARTIAL = "partial"
+FAILED = "failed"
+ROLLED_BACK = "rolled_back"
+
+TransferGroupResult = namedtuple(
+    "TransferGroupResult", ("payment_id", "status", "transfers", "errors", "reversals")
+)
+TransferGroupResult.__doc__ = """Outcome of the transfers of one group.
+
+`status` is "created" when every transfer was created, "partial" when only
+some were, "failed" when none was and "rolled_back" when the created ones
+were reversed. `transfers` are the created transfer entities, `errors`
+``(transfer, error_code, error)`` tuples for the transfers that failed and
+`reversals` the reversal entities of a rollback.
+"""
+
+
+def group_by_payment(transfers):
+    """Group transfer dicts by their `payment_id` key, keeping the input order.
+
+    Transfers without a `payment_id` are direct transfers from the account
+    balance, each one gets its own group of payment None so that they are
+    sent concurrently. The whole input is held in memory.
+
+    Returns:
+        List of ``(payment_id, transfers)``
+    """
+    groups = {}
+    direct = []
+    for transfer in transfers:
+        split = dict(transfer)
+        payment_id = split.pop("payment_id", None)
+        if payment_id is None:
+            direct.append((None, [split]))
+        else:
+            groups.setdefault(payment_id, []).append(split)
+    return list(groups.items()) + direct
+
+
+def _digest(transfers):
+    encoded = json.dumps(transfers, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _sort_items(transfers, items):
+    """Split the transfer entities of a payment into the created and the failed ones.
+
+    The API answers with an entity per requested transfer, in the request
+    order; an entity with a "failed" status or an error code was not created.
+
+    Returns:
+        ``(created, errors)`` as in `TransferGroupResult`
+    """
+    created, errors = [], []
+    for index, item in enumerate(items):
+        error = item.get("error") or {}
+        if item.get("status") != "failed" and not error.get("code"):
+            created.append(item)
+            continue
+        transfer = transfers[index] if index < len(transfers) else item
+        errors.append((transfer, error.get("code"), error.get("description")))
+    return created, errors
+
+
+def _with_keys(groups):
+    """Yield ``(payment_id, transfers, keys)`` with the idempotency keys of each group.
+
+    A payment group is sent with one key, a group of direct transfers with a
+    key per transfer.
+    """
+    keys = OccurrenceKeys()
+    for payment_id, group in groups:
+        transfers = list(group)
+        if payment_id is None:
+            group_keys = [
+                keys.number(idempotency_key("transfer", _digest(transfer)))
+                for transfer in transfers
+            ]
+        else:
+            group_keys = [keys.number(idempotency_key("transfers", payment_id, _digest(transfers)))]
+        yield payment_id, transfers, group_keys
+
+
+class BulkTransferer:
+    """Create Route transfers of many payments concurrently.
+
+    The transfers of a payment are created together with one
+    `payment.transfer` call, and the groups of different payments are sent
+    concurrently by at most `max_workers` threads. Direct transfers, in
+    groups of payment None, are created with a `transfer.create` call each. A
+    group result is yielded as soon as its transfers complete, gathering the
+    transfers created and the errors of those that failed.
+
+    Calls are sent with idempotency keys derived from their transfers, so
+    retries after server or network errors and reruns of an interrupted
+    batch do not create a transfer twice. Identical calls of a batch are
+    told apart by their occurrence number (see `OccurrenceKeys`), so they
+    are all made, and the keys of the other calls do not change when the
+    batch is edited before a rerun.
+
+    Args:
+        client : Razorpay client used for the transfers
+        max_workers : Maximum number of groups sent concurrently
+        rate_limiter : `RateLimiter` throttling the calls, on top of the one
+            of the client
+        retries : Number of additional attempts after server or network errors
+        backoff : Seconds to wait before the first retry, doubled after each one
+        rollback_partial : Reverse the created transfers of a group whose
+            other transfers failed
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client,
+        max_workers=8,
+        rate_limiter=None,
+        retries=2,
+        backoff=1.0,
+        rollback_partial=False,
+    ):
+        self.client = client
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.rollback_partial = rollback_partial
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            (CREATED, PARTIAL, FAILED, ROLLED_BACK, "transfers", "reversals"), 0
+        )
+
+    def transfer(self, groups):
+        """Create the transfers of every group, yielding a `TransferGroupResult` per group.
+
+        Results are yielded in completion order.
+
+        Args:
+            groups : Iterable of ``(payment_id, transfers)`` where transfers
+                are the dicts accepted by the Transfers API (`account`,
+                `amount`, `currency`, ...), see `group_by_payment`
+        """
+        for _, future in map_bounded(
+            self._transfer_group, _with_keys(groups), self.max_workers, name="razorpay-transfer"
+        ):
+            result = future.result()
+            with self._lock:
+                self._stats[result.status] += 1
+                self._stats["transfers"] += len(result.transfers)
+                self._stats["reversals"] += len(result.reversals)
+            yield result
+
+    def rollback(self, result):
+        """Reverse the transfers created for a group, e.g. when its order is cancelled.
+
+        Returns:
+            The `result` with status "rolled_back" and the reversals, or with
+            the errors of the transfers that could not be reversed
+        """
+        reversals, errors = self._reverse(result.transfers)
+        with self._lock:
+            self._stats["reversals"] += len(reversals)
+        if errors:
+            return result._replace(errors=result.errors + errors, reversals=reversals)
+        return result._replace(status=ROLLED_BACK, reversals=reversals)
+
+    def stats(self):
+        """Return the number of groups by status and of transfers created and reversed."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _send(self, group, fn, *args, **kwargs):
+        """Call `fn` throttled under the endpoint group the client limits it under."""
+        return call_with_retries(
+            lambda: fn(*args, **kwargs),
+            self.retries,
+            self.backoff,
+            self.rate_limiter,
+            self.client.rate_limit_key(),
+            group,
+        )
+
+    def _transfer_group(self, item):
+        payment_id, transfers, keys = item
+        if payment_id is None:
+            created, errors = self._create_direct(transfers, keys)
+        else:
+            created, errors = self._create_for_payment(payment_id, transfers, keys[0])
+
+        for transfer, code, error in errors:
+            logger.warning(f"Could not create transfer {transfer} of {payment_id}: {code} {error}")
+        if not errors:
+            return TransferGroupResult(payment_id, CREATED, created, [], [])
+        if not created:
+            return TransferGroupResult(payment_id, FAILED, [], errors, [])
+        result = TransferGroupResult(payment_id, PARTIAL, created, errors, [])
+        if self.rollback_partial:
+            reversals, reverse_errors = self._reverse(created)
+            if not reverse_errors:
+                return result._replace(status=ROLLED_BACK, reversals=reversals)
+            return result._replace(errors=errors + reverse_errors, reversals=reversals)
+        return result
+
+    def _create_direct(self, transfers, keys):
+        """Create direct transfers one by one, returning the created ones and the errors."""
+        created, errors = [], []
+        for index, transfer in enumerate(transfers):
+            try:
+                created.append(
+                    self._send(
+                        "transfers",
+                        self.client.transfer.create,
+                        dict(transfer),
+                        idempotency_key=keys[index],
+                    )
+                )
+            except Exception as e:
+                errors.append((transfer, error_code(e), str(e)))
+        return created, errors
+
+    def _create_for_payment(self, payment_id, transfers, key):
+        """Create the transfers of a payment together, returning the created ones and the errors."""
+        try:
+            # POST /payments/{id}/transfers is limited under "payments"
+            response = self._send(
+                "payments",
+                self.client.payment.transfer,
+                payment_id,
+                {"transfers": transfers},
+                idempotency_key=key,
+            )
+        except Exception as e:
+            return [], [(transfer, error_code(e), str(e)) for transfer in transfers]
+        return _sort_items(transfers, response.get("items", []))
+
+    def _reverse(self, transfers):
+        """Reverse `transfers` in full, returning the reversals and the errors."""
+        reversals, errors = [], []
+        for transfer in transfers:
+            transfer_id = transfer["id"]
+            key = idempotency_key("reversal", transfer_id)
+            try:
+                reversals.append(
+                    self._send(
+                        "transfers", self.client.transfer.reverse, transfer_id, idempotency_key=key
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Could not reverse transfer {transfer_id}: {e}")
+                errors.append((transfer, error_code(e), str(e)))
+        return reversals, errors
@@ -0,0 +1,167 @@
+"""Circuit breaker for API endpoint groups."""
+
+# Standard library imports
+import logging
+import threading
+import time
+
+# Razorpay SDK local imports
+from .errors import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState:
+    """Possible states of a circuit."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    """Failure bookkeeping of one endpoint group."""
+
+    __slots__ = ("failures", "opened_at", "state", "trial_calls")
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_calls = 0
+
+
+class CircuitBreaker:
+    """Fail fast on endpoint groups that keep failing.
+
+    Each endpoint group (e.g. "payments", "orders", "settlements") has its own
+    circuit. After `failure_threshold` consecutive failures (connection
+    errors, timeouts or 5xx responses) the circuit opens and requests to that
+    group raise `CircuitOpenError` without being sent. Once
+    `recovery_timeout` seconds have passed the circuit is half open and lets
+    `half_open_max_calls` trial requests through: a success closes it again,
+    a failure re-opens it.
+
+    Args:
+        failure_threshold : Consecutive failures that open a circuit
+        recovery_timeout : Seconds a circuit stays open before trial requests
+        half_open_max_calls : Trial requests allowed while half open
+        on_state_change : Callable invoked as ``(group, old_state, new_state)``
+            on every transition
+    """
+
+    def __init__(
+        self,
+        failure_threshold=5,
+        recovery_timeout=30,
+        half_open_max_calls=1,
+        on_state_change=None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._listeners = [on_state_change] if on_state_change else []
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def add_listener(self, listener):
+        """Register a callable invoked as ``(group, old_state, new_state)`` on transitions."""
+        self._listeners.append(listener)
+
+    def state(self, group):
+        """Return the current state of the circuit of `group`."""
+        with self._lock:
+            circuit = self._circuits.get(group)
+            if circuit is None:
+                return CircuitState.CLOSED
+            if circuit.state == CircuitState.OPEN and self._recovered(circuit):
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def before_call(self, group):
+        """Raise `CircuitOpenError` unless a request to `group` may be sent."""
+        transition = None
+        with self._lock:
+            circuit = self._circuits.setdefault(group, _Circuit())
+            if circuit.state == CircuitState.OPEN:
+                if not self._recovered(circuit):
+                    remaining = circuit.opened_at + self.recovery_timeout - time.monotonic()
+                    msg = f"Circuit for {group} is open, retry in {remaining:.1f}s"
+                    raise CircuitOpenError(msg)
+                transition = self._move(circuit, CircuitState.HALF_OPEN)
+            if circuit.state == CircuitState.HALF_OPEN:
+                if circuit.trial_calls >= self.half_open_max_calls:
+                    msg = f"Circuit for {group} is half open and waiting on trial requests"
+                    raise CircuitOpenError(msg)
+                circuit.trial_calls += 1
+        self._notify(group, transition)
+
+    def record_success(self, group):
+        """Record a request to `group` that reached a healthy API."""
+        transition = None
+        with self._lock:
+            circuit = self._circuits.get(group)
+            if circuit is None:
+                return
+            circuit.failures = 0
+            if circuit.state != CircuitState.CLOSED:
+                transition = self._move(circuit, CircuitState.CLOSED)
+        self._notify(group, transition)
+
+    def record_failure(self, group):
+        """Record a failed request to `group`, opening its circuit if needed."""
+        transition = None
+        with self._lock:
+            circuit = self._circuits.setdefault(group, _Circuit())
+            circuit.failures += 1
+            if circuit.state == CircuitState.HALF_OPEN or (
+                circuit.state == CircuitState.CLOSED and circuit.failures >= self.failure_threshold
+            ):
+                transition = self._move(circuit, CircuitState.OPEN)
+        self._notify(group, transition)
+
+    def release(self, group):
+        """Give back the trial slot of a request to `group` that ended without an outcome.
+
+        A request interrupted before its response (e.g. a cancelled task)
+        tells nothing about the health of the API, but must not keep a half
+        open circuit waiting on it forever.
+        """
+        with self._lock:
+            circuit = self._circuits.get(group)
+            if circuit is not None and circuit.state == CircuitState.HALF_OPEN:
+                circuit.trial_calls = max(circuit.trial_calls - 1, 0)
+
+    def reset(self, group=None):
+        """Close the circuit of `group`, or every circuit when no group is given."""
+        with self._lock:
+            groups = [group] if group is not None else list(self._circuits)
+            transitions = []
+            for name in groups:
+                circuit = self._circuits.pop(name, None)
+                if circuit is not None and circuit.state != CircuitState.CLOSED:
+                    transitions.append((name, (circuit.state, CircuitState.CLOSED)))
+        for name, transition in transitions:
+            self._notify(name, transition)
+
+    def _recovered(self, circuit):
+        return time.monotonic() - circuit.opened_at >= self.recovery_timeout
+
+    @staticmethod
+    def _move(circuit, state):
+        """Switch `circuit` to `state` and return the ``(old, new)`` transition."""
+        old_state = circuit.state
+        circuit.state = state
+        circuit.trial_calls = 0
+        if state == CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+        return old_state, state
+
+    def _notify(self, group, transition):
+        # Listeners run outside the lock so they may query the breaker
+        if transition is None:
+            return
+        old_state, new_state = transition
+        logger.warning(f"Circuit for {group} moved from {old_state} to {new_state}")
+        for listener in self._listeners:
+            listener(group, old_state, new_state)
@@ -3,18 +3,24 @@
 # Standard library imports
 import json
 import logging
+import math
 import os
 import random
 import time
+import uuid
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import cache
 from importlib.metadata import PackageNotFoundError, version
-from types import ModuleType
 
 # Other third-party library imports
 import requests
 
 # Razorpay SDK local imports
 from . import resources, utility
+from .adapters import RazorpayAdapter, keepalive_socket_options, shared_ssl_context
+from .codecs import get_codec
 from .constants import ERROR_CODE, URL, HttpStatusCode
 from .errors import BadRequestError, GatewayError, ServerError
 
@@ -24,16 +30,69 @@ def capitalize_camel_case(string):
     return "".join(map(str.capitalize, string.split("_")))
 
 
-# Create a dict of resource classes
-RESOURCE_CLASSES = {}
-for name, module in resources.__dict__.items():
-    if isinstance(module, ModuleType) and capitalize_camel_case(name) in module.__dict__:
-        RESOURCE_CLASSES[name] = module.__dict__[capitalize_camel_case(name)]
+def endpoint_group(path):
+    """Return the endpoint group of an API path, e.g. "payments" for "/v1/payments/pay_1"."""
+    parts = [part for part in path.split("/") if part]
+    if parts and parts[0] in (URL.V1.strip("/"), URL.V2.strip("/")):
+        parts = parts[1:]
+    return parts[0] if parts else ""
+
+
+# Client attribute of every resource, mapped to its class in `razorpay.resources`.
+# Kept static so the resource modules are only imported when first used.
+RESOURCE_NAMES = {
+    "account": "Account",
+    "addon": "Addon",
+    "card": "Card",
+    "customer": "Customer",
+    "device_activity": "DeviceActivity",
+    "dispute": "Dispute",
+    "document": "Document",
+    "fund_account": "FundAccount",
+    "iin": "Iin",
+    "invoice": "Invoice",
+    "item": "Item",
+    "order": "Order",
+    "payment": "Payment",
+    "payment_link": "PaymentLink",
+    "plan": "Plan",
+    "product": "Product",
+    "qrcode": "Qrcode",
+    "refund": "Refund",
+    "registration_link": "RegistrationLink",
+    "settlement": "Settlement",
+    "stakeholder": "Stakeholder",
+    "subscription": "Subscription",
+    "token": "Token",
+    "transfer": "Transfer",
+    "virtual_account": "VirtualAccount",
+    "webhook": "Webhook",
+}
+
+UTILITY_NAMES = {"utility": "Utility"}
+
+
+def resource_class(name):
+    """Return the resource or utility class exposed as client attribute `name`, or None."""
+    if name in RESOURCE_NAMES:
+        return getattr(resources, RESOURCE_NAMES[name])
+    if name in UTILITY_NAMES:
+        return getattr(utility, UTILITY_NAMES[name])
+    return None
+
+
+def __getattr__(name):
+    # RESOURCE_CLASSES and UTILITY_CLASSES import every resource module, so
+    # they are only built when asked for
+    if name == "RESOURCE_CLASSES":
+        return {attr: resource_class(attr) for attr in RESOURCE_NAMES}
+    if name == "UTILITY_CLASSES":
+        return {attr: resource_class(attr) for attr in UTILITY_NAMES}
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
 
-UTILITY_CLASSES = {}
-for name, module in utility.__dict__.items():
-    if isinstance(module, ModuleType) and name.capitalize() in module.__dict__:
-        UTILITY_CLASSES[name] = module.__dict__[name.capitalize()]
+CERT_PATH = os.path.dirname(__file__) + "/ca-bundle.crt"
 
 DEFAULT_RETRY_OPTIONS = {
     "base_url": URL.BASE_URL,
@@ -41,36 +100,99 @@ DEFAULT_RETRY_OPTIONS = {
     "initial_delay": 1,
     "max_delay": 60,
     "jitter": 0.25,
+    "retry_status_codes": (
+        HttpStatusCode.TOO_MANY_REQUESTS,
+        HttpStatusCode.INTERNAL_SERVER_ERROR,
+        HttpStatusCode.BAD_GATEWAY,
+        HttpStatusCode.SERVICE_UNAVAILABLE,
+        HttpStatusCode.GATEWAY_TIMEOUT,
+    ),
+    "max_retry_time": None,
 }
 
+# Connection pool settings, defaults match those of `requests`
+DEFAULT_POOL_OPTIONS = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    "tcp_keepalive": None,
+}
+
+# Header carrying the key that lets the API recognise a retried mutating call
+IDEMPOTENCY_HEADER = "X-Idempotency-Key"
+MUTATING_METHODS = frozenset(("post", "patch", "put", "delete"))
+
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _package_version():
+    """Return the installed SDK version, resolved once per process."""
+    try:
+        return version("razorpay-py")
+    except (PackageNotFoundError, NameError):
+        # If all else fails, use the hardcoded version from the package
+
+        warnings.warn(
+            "Could not detect razorpay package version. Using fallback version."
+            "This may indicate an installation issue.",
+            UserWarning,
+            stacklevel=6,
+        )
+        return "1.4.3"
+
+
 class Client:
     """Razorpay client class."""
 
     def __init__(self, session=None, auth=None, **options):
         self.session = session or requests.Session()
         self.auth = auth
-        file_dir = os.path.dirname(__file__)
-        self.cert_path = file_dir + "/ca-bundle.crt"
+        self.cert_path = CERT_PATH
+
+        self.pool_options = {
+            name: options.get(name, default) for name, default in DEFAULT_POOL_OPTIONS.items()
+        }
+        self.ssl_context = options.get("ssl_context") or shared_ssl_context(self.cert_path)
+        if session is None or any(name in options for name in DEFAULT_POOL_OPTIONS):
+            self._mount_adapter()
 
         self.base_url = self._set_base_url(**options)
         self.max_retries = options.get("max_retries", DEFAULT_RETRY_OPTIONS["max_retries"])
         self.initial_delay = options.get("initial_delay", DEFAULT_RETRY_OPTIONS["initial_delay"])
         self.max_delay = options.get("max_delay", DEFAULT_RETRY_OPTIONS["max_delay"])
         self.jitter = options.get("jitter", DEFAULT_RETRY_OPTIONS["jitter"])
+        self.retry_status_codes = frozenset(
+            options.get("retry_status_codes", DEFAULT_RETRY_OPTIONS["retry_status_codes"])
+        )
+        self.max_retry_time = options.get("max_retry_time", DEFAULT_RETRY_OPTIONS["max_retry_time"])
         self.retry_enabled = False
 
+        self.rate_limiter = options.get("rate_limiter")
+        self.circuit_breaker = options.get("circuit_breaker")
+        self.codec = get_codec(options.get("codec"))
+        self.response_cache = options.get("response_cache")
+        self.single_flight = options.get("single_flight")
+
         self.app_details = []
+        self._user_agent = None
 
-        # intializes each resource
-        # injecting this client object into the constructor
-        for name, Klass in RESOURCE_CLASSES.items():
-            setattr(self, name, Klass(self))
+    def __getattr__(self, name):
+        """Create a resource on first access, injecting this client into it.
 
-        for name, Klass in UTILITY_CLASSES.items():
-            setattr(self, name, Klass(self))
+        Only called for attributes that are not set yet, so every resource is
+        built once and later lookups are plain attribute reads.
+        """
+        Klass = resource_class(name)
+        if Klass is None:
+            msg = f"{type(self).__name__!r} object has no attribute {name!r}"
+            raise AttributeError(msg)
+        # setdefault keeps a single instance when threads race on first access
+        return self.__dict__.setdefault(name, Klass(self))
+
+    def __dir__(self):
+        """List the lazily created resources along with the regular attributes."""
+        return sorted({*super().__dir__(), *RESOURCE_NAMES, *UTILITY_NAMES})
 
     def _set_base_url(self, **options):
         base_url = DEFAULT_RETRY_OPTIONS["base_url"]
@@ -84,13 +206,13 @@ class Client:
         options.pop("initial_delay", None)
         options.pop("max_delay", None)
         options.pop("jitter", None)
+        options.pop("retry_status_codes", None)
+        options.pop("max_retry_time", None)
 
         return base_url
 
     def _update_user_agent_header(self, options):
-        user_agent = "{}{} {}".format(
-            "Razorpay-Python/", self._get_version(), self._get_app_details_ua()
-        )
+        user_agent = self._get_user_agent()
 
         if "headers" in options:
             options["headers"]["User-Agent"] = user_agent
@@ -99,19 +221,18 @@ class Client:
 
         return options
 
+    def _get_user_agent(self):
+        # The User-Agent only changes when app details are added, so it is
+        # built once and reused until `set_app_details` invalidates it.
+        if self._user_agent is None:
+            # Trailing whitespace is not a legal header value for stricter HTTP clients
+            self._user_agent = "{}{} {}".format(
+                "Razorpay-Python/", self._get_version(), self._get_app_details_ua()
+            ).rstrip()
+        return self._user_agent
+
     def _get_version(self):
-        try:
-            return version("razorpay-py")
-        except (PackageNotFoundError, NameError):
-            # If all else fails, use the hardcoded version from the package
-
-            warnings.warn(
-                "Could not detect razorpay package version. Using fallback version."
-                "This may indicate an installation issue.",
-                UserWarning,
-                stacklevel=4,
-            )
-            return "1.4.3"
+        return _package_version()
 
     def _get_app_details_ua(self):
         app_details_ua = ""
@@ -135,6 +256,7 @@ class Client:
                 keys describing the application using the SDK.
         """
         self.app_details.append(app_details)
+        self._user_agent = None
 
     def get_app_details(self):
         """Retrieve all app details added via `set_app_details`.
@@ -144,12 +266,113 @@ class Client:
         """
         return self.app_details
 
+    def _mount_adapter(self):
+        """Mount a connection pool sized by the pool options on the session."""
+        keepalive = self.pool_options["tcp_keepalive"]
+        adapter = RazorpayAdapter(
+            socket_options=keepalive_socket_options(keepalive) if keepalive else None,
+            ssl_context=self.ssl_context,
+            ca_bundle=self.cert_path,
+            pool_connections=self.pool_options["pool_connections"],
+            pool_maxsize=self.pool_options["pool_maxsize"],
+            pool_block=self.pool_options["pool_block"],
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def warmup(self, connections=None):
+        """Open pooled connections to the API ahead of the first requests.
+
+        The connections are opened concurrently and returned to the pool, so
+        the TLS handshakes happen now instead of on the first API calls.
+
+        Args:
+            connections : Number of connections to open, at most and by
+                default the `pool_maxsize` of the client
+
+        Returns:
+            Number of connections that were established
+        """
+        # Connections beyond the pool size could not be kept, and with
+        # `pool_block` the calls would wait for each other forever
+        pool_maxsize = self.pool_options["pool_maxsize"]
+        connections = min(connections or pool_maxsize, pool_maxsize)
+
+        def connect():
+            # Streamed responses keep their connection checked out, so every
+            # call opens a new one instead of reusing a warmed one
+            return self.session.get(self.base_url, stream=True, timeout=10, verify=self.cert_path)
+
+        responses = []
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(connect) for _ in range(connections)]
+            for future in futures:
+                try:
+                    responses.append(future.result())
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"Could not warm up connection: {e}")
+
+        for response in responses:
+            # Reading the body releases the connection back to the pool
+            response.content  # noqa: B018
+        return len(responses)
+
     def enable_retry(self, retry_enabled=False):
         """Enable/disable retry strategy."""
         self.retry_enabled = retry_enabled
 
-    def request(self, method, path, **options):  # noqa
+    def request(self, method, path, **options):
         """Dispatch a request to the Razorpay HTTP API with retry mechanism."""
+        auth_to_use, options = self._prepare_request(method, path, options)
+
+        url = f"{self.base_url}{path}"
+
+        retry = RetryState(self)
+        group = endpoint_group(path)
+
+        while True:
+            self._before_call(group)
+            try:
+                response = getattr(self.session, method)(
+                    url, auth=auth_to_use, verify=self.cert_path, **options
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                self._record_outcome(group)
+                delay = retry.next_delay(e)
+                if delay is None:
+                    retry.log_exhausted(e)
+                    raise
+                time.sleep(delay)
+                continue
+            except requests.exceptions.RequestException as e:
+                # For other request exceptions, don't retry
+                self._record_outcome(group)
+                logger.exception(f"Request error: {e}")
+                raise
+            except BaseException:
+                # Interrupted before the outcome was known
+                self._release_call(group)
+                raise
+
+            self._record_outcome(group, response.status_code)
+            if response.status_code in self.retry_status_codes:
+                delay = retry.next_delay(f"HTTP {response.status_code}", retry_after(response))
+                if delay is not None:
+                    time.sleep(delay)
+                    continue
+            return self._process_response(response)
+
+    def _prepare_request(self, method, path, options):
+        """Resolve the auth and headers to send with a request."""
+        if self.response_cache is not None and method in MUTATING_METHODS:
+            # Cached responses of the changed entity are out of date
+            self.response_cache.invalidate(path)
+
+        # Headers are added below, keep them off the dict of the caller
+        options["headers"] = dict(options.get("headers") or {})
         options = self._update_user_agent_header(options)
 
         # Determine authentication type
@@ -164,80 +387,95 @@ class Client:
         # Inject device mode header if provided
         device_mode = options.pop("device_mode", None)
         if device_mode:
-            options.setdefault("headers", {})["X-Razorpay-Device-Mode"] = device_mode
-
-        url = f"{self.base_url}{path}"
-
-        delay_seconds = self.initial_delay
-
-        # If retry is not enabled, set max attempts to 1
-        max_attempts = self.max_retries if self.retry_enabled else 1
+            options["headers"]["X-Razorpay-Device-Mode"] = device_mode
+
+        # Every attempt of a retried mutating call carries the same key, so the
+        # API can tell a retry from a new request
+        idempotency_key = options.pop("idempotency_key", None)
+        if idempotency_key is None and self.retry_enabled and method in MUTATING_METHODS:
+            idempotency_key = uuid.uuid4().hex
+        if idempotency_key is not None:
+            options["headers"].setdefault(IDEMPOTENCY_HEADER, str(idempotency_key))
+
+        return auth_to_use, options
+
+    def rate_limit_key(self):
+        """Return the identity whose requests share a rate limit bucket."""
+        if self.auth and isinstance(self.auth, tuple):
+            return self.auth[0]
+        return ""
+
+    def _record_outcome(self, group, status_code=None):
+        """Report a request outcome to the circuit breaker; no status means no response."""
+        if self.circuit_breaker is None:
+            return
+        if status_code is None or status_code >= HttpStatusCode.INTERNAL_SERVER_ERROR:
+            self.circuit_breaker.record_failure(group)
+        else:
+            self.circuit_breaker.record_success(group)
+
+    def _before_call(self, group):
+        """Wait for the rate limiter, then check the circuit of `group`."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.rate_limit_key(), group)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call(group)
+
+    def _release_call(self, group):
+        """Give back the circuit breaker slot of a request that ended without an outcome."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release(group)
+
+    def _process_response(self, response):
+        """Return the decoded body of a response or raise the matching error."""
+        if HttpStatusCode.OK <= response.status_code < HttpStatusCode.REDIRECT:
+            return (
+                json.dumps({})
+                if response.status_code == HttpStatusCode.NO_CONTENT
+                else self.codec.decode(response.content)
+            )
 
-        for attempt in range(max_attempts):
-            try:
-                response = getattr(self.session, method)(
-                    url, auth=auth_to_use, verify=self.cert_path, **options
-                )
+        try:
+            json_response = self.codec.decode(response.content)
+        except ValueError as e:
+            msg = f"Non-JSON response: {response.text}"
+            raise ServerError(msg) from e
 
-                if HttpStatusCode.OK <= response.status_code < HttpStatusCode.REDIRECT:
-                    return (
-                        json.dumps({})
-                        if response.status_code == HttpStatusCode.NO_CONTENT
-                        else response.json()
-                    )
+        error = json_response.get("error", {})
+        msg = error.get("description", "")
+        code = str(error.get("code", "")).upper()
 
-                try:
-                    json_response = response.json()
-                except ValueError as e:
-                    msg = f"Non-JSON response: {response.text}"
-                    raise ServerError(msg) from e
+        if code == ERROR_CODE.BAD_REQUEST_ERROR:
+            raise BadRequestError(msg)
+        if code == ERROR_CODE.GATEWAY_ERROR:
+            raise GatewayError(msg)
+        raise ServerError(msg)
 
-                error = json_response.get("error", {})
-                msg = error.get("description", "")
-                code = str(error.get("code", "")).upper()
+    def get(self, path, params, **options):
+        """Parse GET request options and dispatch a request."""
+        if self.response_cache is None and self.single_flight is None:
+            return self.request("get", path, params=params, **options)
 
-                if code == ERROR_CODE.BAD_REQUEST_ERROR:
-                    raise BadRequestError(msg)
-                if code == ERROR_CODE.GATEWAY_ERROR:
-                    raise GatewayError(msg)
-                raise ServerError(msg)
+        key = self._request_key(path, params, options)
 
-            except (
-                requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout,
-            ) as e:
-                if (
-                    self.retry_enabled and attempt < max_attempts - 1
-                ):  # Don't sleep on the last attempt
-                    # Apply exponential backoff with jitter
-                    jitter_value = random.uniform(  # noqa: S311
-                        -self.jitter, self.jitter
-                    )
-                    actual_delay = min(delay_seconds * (1 + jitter_value), self.max_delay)
-
-                    logger.warning(
-                        f"{type(e).__name__}: {e}. Retrying in {actual_delay:.2f}s... "
-                        f"(Attempt {attempt + 1}/{max_attempts})"
-                    )
-                    time.sleep(actual_delay)
-
-                    delay_seconds = min(delay_seconds * 2, self.max_delay)
-                    continue
+        def load():
+            if self.single_flight is None:
+                return self.request("get", path, params=params, **options)
+            return self.single_flight.do(
+                key, lambda: self.request("get", path, params=params, **options)
+            )
 
-                msg = f"{type(e).__name__} after {attempt + 1} attempts. " + (
-                    "Retries disabled or exhausted." if not self.retry_enabled else ""
-                )
-                logger.error(msg)
-                raise
-            except requests.exceptions.RequestException as e:
-                # For other request exceptions, don't retry
-                logger.exception(f"Request error: {e}")
-                raise
-        return None
+        if self.response_cache is None:
+            return load()
+        return self.response_cache.get(key, path, load, self.codec)
 
-    def get(self, path, params, **options):
-        """Parse GET request options and dispatch a request."""
-        return self.request("get", path, params=params, **options)
+    def _request_key(self, path, params, options):
+        """Return the key identifying the response of a GET request."""
+        return (
+            self.rate_limit_key(),
+            path,
+            json.dumps([params, options], sort_keys=True, default=str),
+        )
 
     def post(self, path, data, **options):
         """Parse POST request options and dispatches a request."""
@@ -279,7 +517,7 @@ class Client:
 
     def _update_request(self, data, options):
         """Update The resource data and header options."""
-        data = json.dumps(data)
+        data = self.codec.encode(data)
 
         if "headers" not in options:
             options["headers"] = {}
@@ -287,3 +525,74 @@ class Client:
         options["headers"].update({"Content-type": "application/json"})
 
         return data, options
+
+
+class RetryState:
+    """Track the attempts and backoff of a single API call."""
+
+    def __init__(self, client):
+        self.client = client
+        self.attempt = 0
+        # If retry is not enabled, set max attempts to 1
+        self.max_attempts = client.max_retries if client.retry_enabled else 1
+        self.delay_seconds = client.initial_delay
+        self.deadline = (
+            None if client.max_retry_time is None else time.monotonic() + client.max_retry_time
+        )
+
+    def next_delay(self, reason, retry_after=None):
+        """Return the seconds to wait before retrying, or None if retries are exhausted.
+
+        Args:
+            reason : Exception or description of why the attempt failed
+            retry_after : Delay requested by the server through `Retry-After`,
+                used instead of the exponential backoff when present, capped
+                at the client's `max_delay`
+        """
+        self.attempt += 1
+        if self.attempt >= self.max_attempts:  # Don't sleep on the last attempt
+            return None
+
+        if retry_after is None:
+            # Apply exponential backoff with jitter
+            jitter_value = random.uniform(-self.client.jitter, self.client.jitter)  # noqa: S311
+            delay = min(self.delay_seconds * (1 + jitter_value), self.client.max_delay)
+            self.delay_seconds = min(self.delay_seconds * 2, self.client.max_delay)
+        else:
+            delay = min(retry_after, self.client.max_delay)
+
+        if self.deadline is not None and time.monotonic() + delay > self.deadline:
+            logger.error(f"{reason}. Retry time budget exhausted after {self.attempt} attempts.")
+            return None
+
+        reason = f"{type(reason).__name__}: {reason}" if isinstance(reason, Exception) else reason
+        logger.warning(
+            f"{reason}. Retrying in {delay:.2f}s... (Attempt {self.attempt}/{self.max_attempts})"
+        )
+        return delay
+
+    def log_exhausted(self, error):
+        """Log that the call failed for good."""
+        msg = f"{type(error).__name__} after {self.attempt} attempts. " + (
+            "Retries disabled or exhausted." if not self.client.retry_enabled else ""
+        )
+        logger.error(msg)
+
+
+def retry_after(response):
+    """Return the delay in seconds requested by a `Retry-After` header, if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        pass
+    else:
+        # "inf" and "nan" parse as floats but are no usable delay
+        return max(0.0, delay) if math.isfinite(delay) else None
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
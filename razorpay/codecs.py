@@ -0,0 +1,97 @@
+"""JSON codecs used to encode request bodies and decode responses."""
+
+# Standard library imports
+import json
+from functools import cache
+from importlib import import_module
+
+
+class JsonCodec:
+    """Codec built on the standard library `json` module."""
+
+    name = "json"
+
+    def encode(self, obj):
+        """Serialize `obj` to a JSON document."""
+        return json.dumps(obj)
+
+    def decode(self, data):
+        """Parse a JSON document given as `bytes` or `str`."""
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec built on `orjson`, encoding to UTF-8 `bytes`."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = import_module("orjson")
+        # Dicts with int keys are accepted by the standard library too
+        self._options = self._orjson.OPT_NON_STR_KEYS
+
+    def encode(self, obj):
+        """Serialize `obj` to a JSON document."""
+        return self._orjson.dumps(obj, option=self._options)
+
+    def decode(self, data):
+        """Parse a JSON document given as `bytes` or `str`."""
+        return self._orjson.loads(data)
+
+
+class UjsonCodec:
+    """Codec built on `ujson`."""
+
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = import_module("ujson")
+
+    def encode(self, obj):
+        """Serialize `obj` to a JSON document."""
+        return self._ujson.dumps(obj)
+
+    def decode(self, data):
+        """Parse a JSON document given as `bytes` or `str`."""
+        return self._ujson.loads(data)
+
+
+# In order of preference when no codec is chosen
+CODECS = {codec.name: codec for codec in (OrjsonCodec, UjsonCodec, JsonCodec)}
+
+
+@cache
+def _codec_named(name):
+    return CODECS[name]()
+
+
+@cache
+def _fastest_codec():
+    for name in CODECS:
+        try:
+            return _codec_named(name)
+        except ImportError:
+            continue
+    return None  # pragma: no cover - JsonCodec is always available
+
+
+def get_codec(codec=None):
+    """Return the codec for `codec`.
+
+    Args:
+        codec : None for the fastest installed codec, the name of a codec
+            ("orjson", "ujson" or "json"), or an object with `encode` and
+            `decode` methods
+
+    Raises:
+        ValueError: If `codec` names an unknown codec.
+        ImportError: If the library of the named codec is not installed.
+    """
+    if codec is None:
+        return _fastest_codec()
+    if not isinstance(codec, str):
+        return codec
+    if codec not in CODECS:
+        msg = f"Unknown JSON codec: {codec}, expected one of {', '.join(CODECS)}"
+        raise ValueError(msg)
+    return _codec_named(codec)
@@ -7,3 +7,8 @@ class HttpStatusCode:
     OK = 200
     NO_CONTENT = 204
     REDIRECT = 300
+    TOO_MANY_REQUESTS = 429
+    INTERNAL_SERVER_ERROR = 500
+    BAD_GATEWAY = 502
+    SERVICE_UNAVAILABLE = 503
+    GATEWAY_TIMEOUT = 504
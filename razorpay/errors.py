@@ -27,3 +27,10 @@ class SignatureVerificationError(Exception):
 
     def __init__(self, message=None, *args, **kwargs):
         super().__init__(message)
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when a request is refused because its circuit is open."""
+
+    def __init__(self, message=None, *args, **kwargs):
+        super().__init__(message)
@@ -0,0 +1,229 @@
+"""In-process index of card IINs."""
+
+# Standard library imports
+import json
+import logging
+import os
+import threading
+from array import array
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Listings loaded by `IinIndex.load_from_api` when no queries are given
+DEFAULT_QUERIES = ({"flow": "otp"}, {"sub_type": "business"})
+
+SNAPSHOT_VERSION = 1
+
+
+class _Table:
+    """Immutable lookup table: IINs of each length as sorted integers."""
+
+    __slots__ = ("keys", "lengths", "records")
+
+    def __init__(self, records):
+        by_length = {}
+        for iin, record in records.items():
+            by_length.setdefault(len(iin), []).append((int(iin), record))
+        # Longest IINs first, as the most specific match wins
+        self.lengths = sorted(by_length, reverse=True)
+        self.keys = {}
+        self.records = {}
+        for length, entries in by_length.items():
+            entries.sort(key=lambda entry: entry[0])
+            self.keys[length] = array("Q", (key for key, _ in entries))
+            self.records[length] = tuple(record for _, record in entries)
+
+    def find(self, number):
+        for length in self.lengths:
+            if len(number) < length:
+                continue
+            keys = self.keys[length]
+            prefix = int(number[:length])
+            index = bisect_left(keys, prefix)
+            if index < len(keys) and keys[index] == prefix:
+                return number[:length], self.records[length][index]
+        return None, None
+
+    def __len__(self):
+        return sum(len(keys) for keys in self.keys.values())
+
+
+class IinIndex:
+    """Local lookup of card IIN properties, avoiding an `iin.fetch` per checkout.
+
+    The index is filled in bulk from `iin.all` listings, from IIN entities
+    returned by `iin.fetch`, or from a snapshot file. The query of a listing
+    is recorded on every IIN it returned under the plural of its property:
+    an IIN listed by ``{"flow": "otp"}`` and ``{"flow": "rupay"}`` has
+    ``"flows": ("otp", "rupay")``, so listings sharing a property do not
+    overwrite each other. IINs of each
+    length are kept as a sorted array of integers and a card number is
+    matched against its longest known IIN prefix with a binary search.
+
+    Lookups never block: refreshes build a new table and swap it in.
+
+    Args:
+        client : Razorpay client used to load listings and to fetch IINs
+            missing from the index
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self._lock = threading.Lock()
+        self._listings = {}
+        self._entities = {}
+        self._table = _Table({})
+        self._stop = threading.Event()
+        self._refresher = None
+
+    def __len__(self):
+        """Return the number of IINs in the index."""
+        return len(self._table)
+
+    def lookup(self, number):
+        """Return the known properties of the longest IIN prefixing `number`, or None.
+
+        Args:
+            number : Card number, or its first digits
+        """
+        iin, record = self._table.find(_digits(number))
+        return {**record, "iin": iin} if record is not None else None
+
+    def fetch(self, iin):
+        """Return the IIN entity of `iin`, fetching it from the API if it is not indexed.
+
+        Fetched entities are added to the index.
+        """
+        iin = _digits(iin)
+        record = self.lookup(iin)
+        if record is not None and record.get("entity") == "iin":
+            return record
+        entity = self.client.iin.fetch(iin)
+        self.load_entities([entity])
+        return self.lookup(iin)
+
+    def load(self, iins, **properties):
+        """Add the properties of an `iin.all` listing to every IIN it returned.
+
+        Args:
+            iins : IINs returned by the listing
+            properties : Query of the listing, e.g. ``flow="otp"``
+
+        Returns:
+            True if the index changed
+        """
+        query = tuple(sorted(properties.items()))
+        iins = frozenset(_digits(iin) for iin in iins)
+        with self._lock:
+            if self._listings.get(query) == iins:
+                return False
+            previous = self._listings.get(query, frozenset())
+            self._listings[query] = iins
+            self._rebuild()
+        logger.debug(
+            f"IIN listing {dict(query)}: {len(iins - previous)} added, "
+            f"{len(previous - iins)} removed"
+        )
+        return True
+
+    def load_entities(self, entities):
+        """Add IIN entities, as returned by `iin.fetch`, to the index."""
+        with self._lock:
+            for entity in entities:
+                self._entities[_digits(entity["iin"])] = dict(entity)
+            self._rebuild()
+
+    def load_from_api(self, queries=DEFAULT_QUERIES):
+        """Load the `iin.all` listing of every query, returning how many changed."""
+        changed = 0
+        for query in queries:
+            response = self.client.iin.all(dict(query))
+            changed += self.load(response.get("iins", ()), **query)
+        return changed
+
+    def save_snapshot(self, path):
+        """Write the content of the index to the JSON file `path`."""
+        with self._lock:
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "listings": [
+                    {"query": dict(query), "iins": sorted(iins)}
+                    for query, iins in self._listings.items()
+                ],
+                "entities": list(self._entities.values()),
+            }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load_snapshot(self, path):
+        """Replace the content of the index with a snapshot written by `save_snapshot`."""
+        with open(path) as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            msg = f"Unsupported IIN snapshot version: {snapshot.get('version')}"
+            raise ValueError(msg)
+        with self._lock:
+            self._listings = {
+                tuple(sorted(listing["query"].items())): frozenset(listing["iins"])
+                for listing in snapshot["listings"]
+            }
+            self._entities = {entity["iin"]: entity for entity in snapshot["entities"]}
+            self._rebuild()
+
+    def start_refresh(self, interval, queries=DEFAULT_QUERIES):
+        """Reload the listings every `interval` seconds on a background thread."""
+        if self._refresher is not None:
+            return
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval, queries), name="razorpay-iin", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_refresh(self):
+        """Stop the background refresh."""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_loop(self, interval, queries):
+        while not self._stop.wait(interval):
+            try:
+                self.load_from_api(queries)
+            except Exception as e:
+                logger.warning(f"Could not refresh the IIN index: {e}")
+
+    def _rebuild(self):
+        """Swap in a table built from the listings and entities, the lock must be held."""
+        records = {}
+        # IINs sharing the same listings share one record
+        shared = {}
+        for query, iins in self._listings.items():
+            for iin in iins:
+                records.setdefault(iin, []).append(query)
+        for iin, queries in records.items():
+            key = tuple(queries)
+            if key not in shared:
+                values = {}
+                for query in key:
+                    for name, value in query:
+                        values.setdefault(f"{name}s", []).append(value)
+                # Tuples, as the record is shared by the lookup results
+                shared[key] = {name: tuple(found) for name, found in values.items()}
+            records[iin] = shared[key]
+        for iin, entity in self._entities.items():
+            records[iin] = {**records.get(iin, {}), **entity}
+        self._table = _Table(records)
+
+
+def _digits(number):
+    number = str(number)
+    if number.isdigit():
+        return number
+    return "".join(char for char in str(number) if char.isdigit())
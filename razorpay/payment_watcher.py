@@ -0,0 +1,254 @@
+"""Watching payments and orders until they reach a final status."""
+
+# Standard library imports
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Razorpay SDK local imports
+from .errors import BadRequestError
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an entity does not change anymore, by entity
+TERMINAL_STATES = {
+    "payment": frozenset(("captured", "failed", "refunded")),
+    "order": frozenset(("paid",)),
+}
+
+# Entity watched for an id prefix
+ID_PREFIXES = {"pay_": "payment", "order_": "order"}
+
+
+class _Watch:
+    """Polling state of one watched entity."""
+
+    __slots__ = ("entity", "entity_id", "future", "kind", "polling", "started_at", "states")
+
+    def __init__(self, entity_id, kind, states, now):
+        self.entity_id = entity_id
+        self.kind = kind
+        self.states = states
+        self.started_at = now
+        self.future = Future()
+        self.entity = None
+        self.polling = False
+
+
+class PaymentWatcher:
+    """Track many payments or orders until they reach a final status.
+
+    Every watched id gets a `Future` resolved with the entity once its status
+    is one of the terminal states. A single scheduler thread keeps the next
+    poll of every id in a heap and hands the ids that are due to a bounded
+    pool of workers. Polls get further apart as an entity ages: the delay is
+    `backoff` times its age, between `min_interval` and `max_interval`, so
+    thousands of checkouts cost a bounded number of requests per second.
+
+    Webhook events passed to `handle_event` (e.g. registered with
+    ``processor.on("*", watcher.handle_event)``) resolve the watched ids
+    they report as final without waiting for the next poll.
+
+    Args:
+        client : Razorpay client used to fetch the entities
+        max_workers : Maximum number of concurrent polls
+        min_interval : Seconds before the first poll and between early polls
+        max_interval : Maximum seconds between two polls of an entity
+        backoff : Delay before the next poll as a fraction of the entity age
+        timeout : Seconds after which a watch fails with `TimeoutError`, None
+            to watch until a terminal status is reached
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        client,
+        max_workers=4,
+        min_interval=1,
+        max_interval=60,
+        backoff=0.25,
+        timeout=None,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="razorpay-watcher")
+        self._condition = threading.Condition()
+        self._watches = {}
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._closed = False
+        self._stats = {"polls": 0, "errors": 0, "webhooks": 0}
+        self._scheduler = threading.Thread(
+            target=self._run, name="razorpay-watcher-scheduler", daemon=True
+        )
+        self._scheduler.start()
+
+    def watch(self, entity_id, kind=None, states=None, callback=None):
+        """Start watching `entity_id`, returning a `Future` of its final entity.
+
+        Watching an id that is already watched returns the same future.
+
+        Args:
+            entity_id : Id of the payment or order
+            kind : "payment" or "order", guessed from the id prefix by default
+            states : Statuses ending the watch, defaults to TERMINAL_STATES
+            callback : Called with the future once it is done
+        """
+        kind = kind or next(
+            (kind for prefix, kind in ID_PREFIXES.items() if entity_id.startswith(prefix)), None
+        )
+        if kind not in TERMINAL_STATES:
+            msg = f"Cannot tell whether {entity_id} is a payment or an order, pass kind"
+            raise ValueError(msg)
+        with self._condition:
+            if self._closed:
+                msg = "PaymentWatcher is closed"
+                raise RuntimeError(msg)
+            watch = self._watches.get(entity_id)
+            if watch is None:
+                now = time.monotonic()
+                watch = _Watch(entity_id, kind, frozenset(states or TERMINAL_STATES[kind]), now)
+                self._watches[entity_id] = watch
+                self._push(watch, now + self.min_interval)
+        if callback is not None:
+            watch.future.add_done_callback(callback)
+        return watch.future
+
+    def unwatch(self, entity_id):
+        """Stop watching `entity_id`, cancelling its future."""
+        with self._condition:
+            watch = self._watches.pop(entity_id, None)
+        if watch is not None:
+            watch.future.cancel()
+
+    def handle_event(self, event):
+        """Resolve the watches of the entities a webhook event reports as final."""
+        payload = event.get("payload") or {}
+        for kind in TERMINAL_STATES:
+            entity = (payload.get(kind) or {}).get("entity")
+            if not entity:
+                continue
+            with self._condition:
+                watch = self._watches.get(entity.get("id"))
+                if watch is None or watch.kind != kind:
+                    continue
+                self._stats["webhooks"] += 1
+            self._update(watch, entity)
+
+    def pending(self):
+        """Return the number of entities being watched."""
+        with self._condition:
+            return len(self._watches)
+
+    def stats(self):
+        """Return the number of polls, failed polls and webhook updates."""
+        with self._condition:
+            return {**self._stats, "watching": len(self._watches)}
+
+    def close(self):
+        """Stop polling and cancel the futures of the entities still watched."""
+        with self._condition:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._condition.notify()
+        self._scheduler.join()
+        self._executor.shutdown(wait=True)
+        for watch in watches:
+            watch.future.cancel()
+
+    def __enter__(self):
+        """Return the watcher."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the watcher."""
+        self.close()
+
+    def _push(self, watch, due):
+        """Schedule the next poll of `watch`, the condition must be held."""
+        heapq.heappush(self._schedule, (due, next(self._sequence), watch))
+        self._condition.notify()
+
+    def _next_poll(self, watch, now):
+        age = now - watch.started_at
+        return now + min(self.max_interval, max(self.min_interval, age * self.backoff))
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._schedule and self._schedule[0][0] <= now:
+                        break
+                    timeout = self._schedule[0][0] - now if self._schedule else None
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+                due = []
+                while self._schedule and self._schedule[0][0] <= now:
+                    watch = heapq.heappop(self._schedule)[2]
+                    # Skip watches that were resolved or cancelled meanwhile
+                    if self._watches.get(watch.entity_id) is not watch:
+                        continue
+                    if watch.future.cancelled():
+                        del self._watches[watch.entity_id]
+                    elif not watch.polling:
+                        watch.polling = True
+                        due.append(watch)
+            for watch in due:
+                self._executor.submit(self._poll, watch)
+
+    def _poll(self, watch):
+        try:
+            entity = getattr(self.client, watch.kind).fetch(watch.entity_id)
+        except BadRequestError as e:
+            # The id does not exist, polling again will not help
+            self._finish(watch, error=e)
+            return
+        except Exception as e:
+            logger.warning(f"Could not poll {watch.entity_id}: {e}")
+            entity = None
+            with self._condition:
+                self._stats["errors"] += 1
+        with self._condition:
+            self._stats["polls"] += 1
+            watch.polling = False
+        if entity is None or not self._update(watch, entity):
+            self._reschedule(watch)
+
+    def _update(self, watch, entity):
+        """Record the latest `entity` of a watch, returning True if the watch is over."""
+        watch.entity = entity
+        if entity.get("status") in watch.states:
+            self._finish(watch, entity=entity)
+            return True
+        return False
+
+    def _reschedule(self, watch):
+        now = time.monotonic()
+        if self.timeout is not None and now - watch.started_at >= self.timeout:
+            status = (watch.entity or {}).get("status")
+            msg = f"{watch.entity_id} is still {status} after {self.timeout}s"
+            self._finish(watch, error=TimeoutError(msg))
+            return
+        with self._condition:
+            if self._watches.get(watch.entity_id) is watch:
+                self._push(watch, self._next_poll(watch, now))
+
+    def _finish(self, watch, entity=None, error=None):
+        with self._condition:
+            if self._watches.get(watch.entity_id) is not watch:
+                return
+            del self._watches[watch.entity_id]
+        if not watch.future.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(entity)
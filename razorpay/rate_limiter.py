@@ -0,0 +1,146 @@
+"""Client-side rate limiting."""
+
+# Standard library imports
+import json
+import os
+import threading
+import time
+
+try:
+    # Standard library imports
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class MemoryBackend:
+    """Token bucket state shared by the threads of a single process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def reserve(self, bucket, rate, capacity, tokens=1):
+        """Take `tokens` from a bucket and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._buckets.get(bucket)
+            level, wait = take_tokens(state, now, rate, capacity, tokens)
+            self._buckets[bucket] = (level, now)
+        return wait
+
+
+class FileBackend:
+    """Token bucket state shared by every process using the same state file.
+
+    Each reservation holds an exclusive ``flock`` on the file while the
+    bucket levels are read and updated, so worker processes on one host
+    draw from the same buckets.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            msg = "FileBackend requires fcntl, which is not available on this platform"
+            raise RuntimeError(msg)
+        self.path = path
+
+    def reserve(self, bucket, rate, capacity, tokens=1):
+        """Take `tokens` from a bucket and return the seconds to wait before using them."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                content = f.read()
+                buckets = json.loads(content) if content else {}
+                # Wall clock time, as monotonic clocks are not comparable across processes
+                now = time.time()
+                level, wait = take_tokens(buckets.get(bucket), now, rate, capacity, tokens)
+                buckets[bucket] = (level, now)
+                f.seek(0)
+                f.truncate()
+                json.dump(buckets, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+
+def take_tokens(state, now, rate, capacity, tokens):
+    """Refill a bucket up to `now` and take `tokens` from it.
+
+    Args:
+        state : ``(level, updated_at)`` of the bucket, or None for a full bucket
+        now : Current time on the clock used for `state`
+        rate : Tokens added per second
+        capacity : Maximum number of tokens the bucket holds
+        tokens : Number of tokens to take
+
+    Returns:
+        The new level, negative when tokens were borrowed from the future, and
+        the seconds to wait until the taken tokens are available
+    """
+    if state is None:
+        level = capacity
+    else:
+        level, updated_at = state
+        level = min(capacity, level + max(0.0, now - updated_at) * rate)
+    level -= tokens
+    return level, max(0.0, -level / rate)
+
+
+class RateLimiter:
+    """Token bucket rate limiter consulted by the client before every request.
+
+    Every request takes a token from the bucket of its API key and, when a
+    rate is configured for it, from the bucket of its endpoint group (the
+    first path segment after the API version, e.g. "payments" or "orders").
+    The request waits until both tokens are available.
+
+    Args:
+        rate : Requests per second allowed for each API key
+        burst : Number of requests that may be sent at once (defaults to `rate`)
+        group_rates : Mapping of endpoint group to requests per second
+        backend : Where bucket state is kept, `MemoryBackend` (default) for a
+            single process or `FileBackend` to share it across processes
+    """
+
+    def __init__(self, rate, burst=None, group_rates=None, backend=None):
+        self.rate = rate
+        self.burst = burst or rate
+        self.group_rates = dict(group_rates or {})
+        self.backend = backend or MemoryBackend()
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._wait_seconds = 0.0
+
+    def reserve(self, key, group=None):
+        """Reserve a token for a request and return the seconds to wait before sending it."""
+        wait = self.backend.reserve(f"key:{key}", self.rate, self.burst)
+        group_rate = self.group_rates.get(group)
+        if group_rate:
+            group_wait = self.backend.reserve(f"group:{key}:{group}", group_rate, group_rate)
+            wait = max(wait, group_wait)
+
+        with self._stats_lock:
+            self._acquired += 1
+            if wait > 0:
+                self._throttled += 1
+                self._wait_seconds += wait
+        return wait
+
+    def acquire(self, key, group=None):
+        """Block until a request to `group` may be sent with `key`."""
+        wait = self.reserve(key, group)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def stats(self):
+        """Return the number of requests let through, how many waited, and the total wait."""
+        with self._stats_lock:
+            return {
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "wait_seconds": self._wait_seconds,
+            }
@@ -0,0 +1,307 @@
+"""Reconciliation of payments, refunds and transfers against settlements."""
+
+# Standard library imports
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+# Settlement reports are generated for days in Indian Standard Time
+IST = timezone(timedelta(hours=5, minutes=30))
+
+UNSETTLED = "unsettled"
+DOUBLE_SETTLED = "double_settled"
+AMOUNT_DRIFT = "amount_drift"
+MISSING_ENTITY = "missing_entity"
+SETTLEMENT_DRIFT = "settlement_drift"
+
+NO_MISMATCHES = ()
+
+# Entity types matched between the listings and the settlement report
+RECONCILED_TYPES = frozenset(("payment", "refund", "transfer"))
+
+Mismatch = namedtuple(
+    "Mismatch", ("kind", "entity_id", "entity_type", "settlement_id", "expected", "actual")
+)
+Mismatch.__doc__ = """A difference between the listings and the settlement report.
+
+`kind` is one of:
+
+- "unsettled": the entity should have been settled but no settled row of
+  the report matches it
+- "double_settled": the entity is settled by two rows, `expected` and
+  `actual` are their settlement ids
+- "amount_drift": the amount of the entity (`expected`) differs from the
+  amount of its settlement row (`actual`)
+- "missing_entity": a settled row matches no listed entity
+- "settlement_drift": the amount of a settlement (`expected`) differs from
+  the credits minus the debits of its rows (`actual`)
+"""
+
+
+def expects_settlement(entity):
+    """Return whether a listed entity should appear as settled in the report."""
+    entity_type = entity.get("entity")
+    if entity_type == "payment":
+        return bool(entity.get("captured"))
+    if entity_type in ("refund", "transfer"):
+        return entity.get("status") == "processed"
+    return False
+
+
+class Reconciler:
+    """Join entity listings with settlement report rows, reporting mismatches.
+
+    Entities and report rows are joined on their entity id with two hash
+    indexes holding only the side of a pair that arrived first: a pair is
+    dropped from them as soon as both sides are seen. When the listings and
+    the report are consumed in step (see `reconcile`), these indexes stay
+    small.
+
+    The ids of settled entities are kept to detect double settlements. By
+    default they are kept for the whole run, so memory grows with the number
+    of entities. With `settled_horizon`, an id is forgotten once the report
+    has moved more than that many seconds past its row, which bounds memory
+    but misses the double settlements further apart.
+
+    Args:
+        amount_tolerance : Difference between the amounts of an entity and
+            its row tolerated before reporting a drift, in the currency
+            subunit (paise)
+        window : ``(start, end)`` Unix timestamps; report rows of entities
+            created outside the window are ignored, as they have no listed
+            entity to match
+        expects : Callable telling whether a listed entity should be settled,
+            defaults to `expects_settlement`
+        settled_horizon : Seconds, measured on the `settled_at` (or
+            `created_at`) of the rows, for which the ids of settled entities
+            are kept to detect double settlements; kept for the whole run
+            when None
+    """
+
+    def __init__(
+        self, amount_tolerance=0, window=None, expects=expects_settlement, settled_horizon=None
+    ):
+        self.amount_tolerance = amount_tolerance
+        self.window = window
+        self.expects = expects
+        self.settled_horizon = settled_horizon
+        # Entity id to (type, amount, expects settlement) of unmatched entities
+        self._entities = {}
+        # Entity id to (type, amount, settlement id, row time) of unmatched settled rows
+        self._rows = {}
+        # Entity id to (settlement id, row time) of matched entities, oldest first
+        self._settled = OrderedDict()
+        # Latest row time seen, from which the horizon is measured
+        self._cursor = 0
+        self._settlement_ids = {}
+        self._settlement_totals = {}
+        self._settlement_amounts = {}
+        self._stats = dict.fromkeys(("entities", "rows", "settlements", "matched"), 0)
+        self._mismatches = dict.fromkeys(
+            (UNSETTLED, DOUBLE_SETTLED, AMOUNT_DRIFT, MISSING_ENTITY, SETTLEMENT_DRIFT), 0
+        )
+        self._peak_pending = 0
+
+    def add_entity(self, entity):
+        """Index a payment, refund or transfer entity, returning the mismatches found."""
+        self._stats["entities"] += 1
+        entity_id = entity["id"]
+        record = (entity.get("entity"), entity.get("amount"), self.expects(entity))
+        row = self._rows.pop(entity_id, None)
+        if row is None:
+            if entity_id not in self._settled:
+                self._entities[entity_id] = record
+                self._track_pending()
+            return NO_MISMATCHES
+        return self._match(entity_id, record, row)
+
+    def add_row(self, row):
+        """Index a settlement report row, returning the mismatches found."""
+        self._stats["rows"] += 1
+        settlement_id = row.get("settlement_id")
+        if settlement_id:
+            settlement_id = self._settlement_ids.setdefault(settlement_id, settlement_id)
+            self._settlement_totals[settlement_id] = (
+                self._settlement_totals.get(settlement_id, 0)
+                + (row.get("credit") or 0)
+                - (row.get("debit") or 0)
+            )
+        entity_type = row.get("type")
+        if entity_type not in RECONCILED_TYPES or not row.get("settled"):
+            return NO_MISMATCHES
+        if (
+            self.window is not None
+            and not self.window[0] <= (row.get("created_at") or 0) < self.window[1]
+        ):
+            return NO_MISMATCHES
+
+        entity_id = row["entity_id"]
+        at = row.get("settled_at") or row.get("created_at") or 0
+        self._cursor = max(self._cursor, at)
+        first = self._settled.get(entity_id, (None,))[0]
+        if first is None and entity_id in self._rows:
+            first = self._rows[entity_id][2]
+        if first is not None:
+            return [
+                self._mismatch(
+                    DOUBLE_SETTLED, entity_id, entity_type, settlement_id, first, settlement_id
+                )
+            ]
+        record = self._entities.pop(entity_id, None)
+        if record is None:
+            self._rows[entity_id] = (entity_type, row.get("amount"), settlement_id, at)
+            self._track_pending()
+            return NO_MISMATCHES
+        return self._match(entity_id, record, (entity_type, row.get("amount"), settlement_id, at))
+
+    def add_settlement(self, settlement):
+        """Record the amount of a settlement entity, checked against its rows by `finish`."""
+        self._stats["settlements"] += 1
+        self._settlement_amounts[settlement["id"]] = settlement.get("amount")
+        return NO_MISMATCHES
+
+    def finish(self):
+        """Return the mismatches left once every source has been added.
+
+        Entities still waiting for a row are unsettled and rows still waiting
+        for an entity are missing one.
+        """
+        mismatches = []
+        for entity_id, (entity_type, amount, expected) in self._entities.items():
+            if expected:
+                mismatches.append(
+                    self._mismatch(UNSETTLED, entity_id, entity_type, None, amount, None)
+                )
+        for entity_id, (entity_type, amount, settlement_id, _) in self._rows.items():
+            mismatches.append(
+                self._mismatch(MISSING_ENTITY, entity_id, entity_type, settlement_id, None, amount)
+            )
+        for settlement_id, amount in self._settlement_amounts.items():
+            total = self._settlement_totals.get(settlement_id)
+            if total is not None and abs(total - amount) > self.amount_tolerance:
+                mismatches.append(
+                    self._mismatch(
+                        SETTLEMENT_DRIFT, settlement_id, "settlement", settlement_id, amount, total
+                    )
+                )
+        self._entities.clear()
+        self._rows.clear()
+        return mismatches
+
+    def reconcile(self, entities, rows, settlements=(), chunk_size=1000):
+        """Reconcile the sources, yielding every `Mismatch` as soon as it is found.
+
+        The sources are consumed in step, `chunk_size` items at a time from
+        each, so that most pairs meet while their entity is recent.
+
+        Args:
+            entities : Iterable of payment, refund and transfer entities
+            rows : Iterable of settlement report rows
+            settlements : Iterable of settlement entities
+            chunk_size : Number of items taken from a source at a time
+        """
+        sources = [
+            (iter(entities), self.add_entity),
+            (iter(rows), self.add_row),
+            (iter(settlements), self.add_settlement),
+        ]
+        while sources:
+            for source in list(sources):
+                items, add = source
+                chunk = list(islice(items, chunk_size))
+                if len(chunk) < chunk_size:
+                    sources.remove(source)
+                for item in chunk:
+                    mismatches = add(item)
+                    if mismatches:
+                        yield from mismatches
+        yield from self.finish()
+
+    def reconcile_api(self, client, start, end, settlement_days=7, page_size=100):
+        """Reconcile the entities created in ``[start, end)`` with the API.
+
+        Payments, refunds and transfers are listed with `iter_all` and the
+        settlement report is read day by day, from `start` until
+        `settlement_days` after `end` so that late settlements are included.
+        Report rows of entities created outside the window are ignored.
+        Unless set, `settled_horizon` becomes `settlement_days`.
+
+        Args:
+            client : Razorpay client
+            start : Unix timestamp of the start of the window (inclusive)
+            end : Unix timestamp of the end of the window (exclusive)
+            settlement_days : Days after `end` during which entities may settle
+            page_size : Number of items requested per page
+        """
+        self.window = (start, end)
+        if self.settled_horizon is None:
+            # Rows of the window all settle within `settlement_days`
+            self.settled_horizon = settlement_days * 86400
+        window = {"from": start, "to": end - 1}
+        report_end = end + settlement_days * 86400
+
+        def entities():
+            for resource in (client.payment, client.refund, client.transfer):
+                yield from resource.iter_all(window, page_size=page_size)
+
+        settlements = client.settlement.iter_all(
+            {"from": start, "to": report_end - 1}, page_size=page_size
+        )
+        return self.reconcile(
+            entities(), _report_rows(client, start, report_end, page_size), settlements
+        )
+
+    def stats(self):
+        """Return the number of items added and matched, and of mismatches by kind."""
+        return {
+            **self._stats,
+            "pending": len(self._entities) + len(self._rows),
+            "settled_ids": len(self._settled),
+            "peak_pending": self._peak_pending,
+            "mismatches": dict(self._mismatches),
+        }
+
+    def _match(self, entity_id, record, row):
+        entity_type, amount, _ = record
+        _, row_amount, settlement_id, at = row
+        self._stats["matched"] += 1
+        self._settle(entity_id, settlement_id, at)
+        if (
+            amount is not None
+            and row_amount is not None
+            and abs(amount - row_amount) > self.amount_tolerance
+        ):
+            return [
+                self._mismatch(
+                    AMOUNT_DRIFT, entity_id, entity_type, settlement_id, amount, row_amount
+                )
+            ]
+        return NO_MISMATCHES
+
+    def _settle(self, entity_id, settlement_id, at):
+        settled = self._settled
+        settled[entity_id] = (settlement_id, at)
+        if self.settled_horizon is None:
+            return
+        oldest = self._cursor - self.settled_horizon
+        # Rows arrive roughly in time order, so the oldest ids come first
+        while settled and next(iter(settled.values()))[1] < oldest:
+            settled.popitem(last=False)
+
+    def _mismatch(self, kind, *fields):
+        self._mismatches[kind] += 1
+        return Mismatch(kind, *fields)
+
+    def _track_pending(self):
+        pending = len(self._entities) + len(self._rows)
+        self._peak_pending = max(self._peak_pending, pending)
+
+
+def _report_rows(client, start, end, page_size):
+    """Yield the settlement report rows of every day of ``[start, end)`` as `ReconRecord`."""
+    day = datetime.fromtimestamp(start, IST).date()
+    last = datetime.fromtimestamp(end - 1, IST).date()
+    while day <= last:
+        query = {"year": day.year, "month": day.month, "day": day.day}
+        yield from client.settlement.iter_report(query, page_size=page_size)
+        day += timedelta(days=1)
@@ -1,30 +1,79 @@
-# Razorpay SDK local imports
-from .account import Account
-from .addon import Addon
-from .card import Card
-from .customer import Customer
-from .device_activity import DeviceActivity
-from .dispute import Dispute
-from .document import Document
-from .fund_account import FundAccount
-from .iin import Iin
-from .invoice import Invoice
-from .item import Item
-from .order import Order
-from .payment import Payment
-from .payment_link import PaymentLink
-from .plan import Plan
-from .product import Product
-from .qrcode import Qrcode
-from .refund import Refund
-from .registration_link import RegistrationLink
-from .settlement import Settlement
-from .stakeholder import Stakeholder
-from .subscription import Subscription
-from .token import Token
-from .transfer import Transfer
-from .virtual_account import VirtualAccount
-from .webhook import Webhook
+# Standard library imports
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Resource modules are imported on first access (PEP 562)
+_RESOURCE_MODULES = {
+    "Account": ".account",
+    "Addon": ".addon",
+    "Card": ".card",
+    "Customer": ".customer",
+    "DeviceActivity": ".device_activity",
+    "Dispute": ".dispute",
+    "Document": ".document",
+    "FundAccount": ".fund_account",
+    "Iin": ".iin",
+    "Invoice": ".invoice",
+    "Item": ".item",
+    "Order": ".order",
+    "Payment": ".payment",
+    "PaymentLink": ".payment_link",
+    "Plan": ".plan",
+    "Product": ".product",
+    "Qrcode": ".qrcode",
+    "Refund": ".refund",
+    "RegistrationLink": ".registration_link",
+    "Settlement": ".settlement",
+    "Stakeholder": ".stakeholder",
+    "Subscription": ".subscription",
+    "Token": ".token",
+    "Transfer": ".transfer",
+    "VirtualAccount": ".virtual_account",
+    "Webhook": ".webhook",
+}
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .addon import Addon
+    from .card import Card
+    from .customer import Customer
+    from .device_activity import DeviceActivity
+    from .dispute import Dispute
+    from .document import Document
+    from .fund_account import FundAccount
+    from .iin import Iin
+    from .invoice import Invoice
+    from .item import Item
+    from .order import Order
+    from .payment import Payment
+    from .payment_link import PaymentLink
+    from .plan import Plan
+    from .product import Product
+    from .qrcode import Qrcode
+    from .refund import Refund
+    from .registration_link import RegistrationLink
+    from .settlement import Settlement
+    from .stakeholder import Stakeholder
+    from .subscription import Subscription
+    from .token import Token
+    from .transfer import Transfer
+    from .virtual_account import VirtualAccount
+    from .webhook import Webhook
+
+
+def __getattr__(name):
+    module_name = _RESOURCE_MODULES.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_RESOURCE_MODULES})
+
 
 __all__ = [
     "Account",
@@ -1,5 +1,12 @@
 """Base Resource class."""
 
+# Standard library imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of entities the API returns for a single `count`
+MAX_PAGE_SIZE = 100
+
 
 class Resource:
     """Base resource class for interacting with Razorpay API."""
@@ -11,6 +18,93 @@ class Resource:
         """Retrieve all resources."""
         return self.get(self.base_url, data, **kwargs)
 
+    def iter_all(self, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Lazily iterate over every entity of a listing, page by page.
+
+        Pages are requested through `all` using `count`/`skip`, so at most one
+        page (two with `prefetch`) is held in memory at a time.
+
+        Args:
+            data : Filters for the listing, e.g. ``{"from": ..., "to": ...}``
+            page_size : Number of entities requested per page (max 100)
+            prefetch : Fetch the next page on a background thread while the
+                current page is being consumed
+
+        Yields:
+            Entity dicts in the order returned by the API
+        """
+        return self._iter_pages(self.all, data, page_size, prefetch, **kwargs)
+
+    def aiter_all(self, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Asynchronously iterate over every entity of a listing.
+
+        Counterpart of `iter_all` for resources bound to an `AsyncClient`;
+        with `prefetch` the next page is requested as a concurrent task.
+        """
+        return self._aiter_pages(self.all, data, page_size, prefetch, **kwargs)
+
+    def _iter_pages(self, list_page, data, page_size, prefetch, **kwargs):
+        """Yield the entities of the pages returned by ``list_page(page_data)``."""
+        page_size, pages = self._paginate(data, page_size)
+        if not prefetch:
+            for page_data in pages:
+                items = list_page(page_data, **kwargs).get("items", [])
+                yield from items
+                if len(items) < page_size:
+                    return
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(list_page, next(pages), **kwargs)
+            for page_data in pages:
+                items = pending.result().get("items", [])
+                if len(items) < page_size:
+                    yield from items
+                    return
+                pending = executor.submit(list_page, page_data, **kwargs)
+                yield from items
+
+    async def _aiter_pages(self, list_page, data, page_size, prefetch, **kwargs):
+        """Yield the entities of the pages returned by ``await list_page(page_data)``."""
+        page_size, pages = self._paginate(data, page_size)
+        if not prefetch:
+            for page_data in pages:
+                items = (await list_page(page_data, **kwargs)).get("items", [])
+                for item in items:
+                    yield item
+                if len(items) < page_size:
+                    return
+            return
+
+        pending = asyncio.ensure_future(list_page(next(pages), **kwargs))
+        try:
+            for page_data in pages:
+                items = (await pending).get("items", [])
+                if len(items) < page_size:
+                    for item in items:
+                        yield item
+                    return
+                pending = asyncio.ensure_future(list_page(page_data, **kwargs))
+                for item in items:
+                    yield item
+        finally:
+            pending.cancel()
+
+    @staticmethod
+    def _paginate(data, page_size):
+        """Return the effective page size and an endless iterator of page filters."""
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        data = dict(data or {})
+
+        def pages():
+            skip = data.pop("skip", 0)
+            while True:
+                # Some listings consume keys from the dict, so send a fresh copy
+                yield {**data, "count": page_size, "skip": skip}
+                skip += page_size
+
+        return page_size, pages()
+
     def fetch(self, resource_id, data, **kwargs):
         """Fetch a specific resource by its ID."""
         url = f"{self.base_url}/{resource_id}"
@@ -1,8 +1,136 @@
 """Settlement resource."""
 
+# Standard library imports
+import calendar
+import sys
+from functools import lru_cache
+
 # Razorpay SDK local imports
 from ..constants.url import URL
-from .base import Resource
+from .base import MAX_PAGE_SIZE, Resource
+
+# Columns of a row of the combined settlement recon report
+RECON_FIELDS = (
+    "entity_id",
+    "type",
+    "debit",
+    "credit",
+    "amount",
+    "currency",
+    "fee",
+    "tax",
+    "on_hold",
+    "settled",
+    "created_at",
+    "settled_at",
+    "settlement_id",
+    "posted_at",
+    "credit_type",
+    "description",
+    "notes",
+    "payment_id",
+    "settlement_utr",
+    "order_id",
+    "order_receipt",
+    "method",
+    "upi_flow",
+    "card_network",
+    "card_issuer",
+    "card_type",
+    "dispute_id",
+)
+
+_RECON_FIELD_SET = frozenset(RECON_FIELDS)
+
+# Columns with few distinct values, whose strings are shared between records
+_INTERNED_FIELDS = frozenset(
+    (
+        "type",
+        "currency",
+        "settlement_id",
+        "credit_type",
+        "settlement_utr",
+        "method",
+        "upi_flow",
+        "card_network",
+        "card_issuer",
+        "card_type",
+    )
+)
+
+
+# Stands for a column missing from a row
+_ABSENT = object()
+
+
+@lru_cache(maxsize=256)
+def _absent_fields(fields):
+    """Return the set of `fields`, shared by the records missing the same columns."""
+    return frozenset(fields)
+
+
+class ReconRecord:
+    """One row of the settlement recon report, stored without a per-row dict.
+
+    Columns are read as attributes, or with `get` and indexing like the row
+    dict. Columns unknown to RECON_FIELDS are kept in `extra`. Attributes of
+    columns the row does not have are None, while `get` and indexing treat
+    them as missing.
+    """
+
+    __slots__ = (*RECON_FIELDS, "absent", "extra")
+
+    def __init__(self, row):
+        absent = []
+        for field in RECON_FIELDS:
+            value = row.get(field, _ABSENT)
+            if value is _ABSENT:
+                absent.append(field)
+                value = None
+            elif value.__class__ is str and field in _INTERNED_FIELDS:
+                value = sys.intern(value)
+            setattr(self, field, value)
+        self.absent = _absent_fields(tuple(absent)) if absent else None
+        extra = {field: value for field, value in row.items() if field not in _RECON_FIELD_SET}
+        self.extra = extra or None
+
+    def get(self, field, default=None):
+        """Return the value of a column, or `default` if the row does not have it."""
+        if field in _RECON_FIELD_SET:
+            if self.absent is not None and field in self.absent:
+                return default
+            return getattr(self, field)
+        return (self.extra or {}).get(field, default)
+
+    def __getitem__(self, field):
+        """Return the value of a column."""
+        if field in _RECON_FIELD_SET:
+            if self.absent is not None and field in self.absent:
+                raise KeyError(field)
+            return getattr(self, field)
+        if self.extra is None or field not in self.extra:
+            raise KeyError(field)
+        return self.extra[field]
+
+    def to_dict(self):
+        """Return the row as a dict."""
+        absent = self.absent or ()
+        return {
+            **{field: getattr(self, field) for field in RECON_FIELDS if field not in absent},
+            **(self.extra or {}),
+        }
+
+    def __eq__(self, other):
+        """Compare the columns of two records."""
+        if not isinstance(other, ReconRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the record with its entity."""
+        return f"ReconRecord(type={self.type!r}, entity_id={self.entity_id!r})"
 
 
 class Settlement(Resource):
@@ -46,6 +174,61 @@ class Settlement(Resource):
         url = "{}/recon/{}".format(self.base_url, "combined")
         return self.get(url, data, **kwargs)
 
+    def iter_report(self, data, page_size=MAX_PAGE_SIZE, records=True, **kwargs):
+        """Lazily iterate over the rows of the settlement recon report.
+
+        The report of a month is requested day by day, or only for
+        ``data["day"]`` when given, one page of `count` rows at a time, so a
+        single page is decoded and held in memory whatever the size of the
+        month.
+
+        Args:
+            data : ``{"year": ..., "month": ...}`` and optionally ``"day"``
+            page_size : Number of rows requested per page (max 100)
+            records : Yield `ReconRecord` objects, or the row dicts if False
+
+        Yields:
+            Rows in the order returned by the API
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        for day in self._report_days(data):
+            skip = 0
+            while True:
+                query = {**day, "count": page_size, "skip": skip}
+                items = self.report(query, **kwargs).get("items", [])
+                yield from map(ReconRecord, items) if records else items
+                if len(items) < page_size:
+                    break
+                skip += page_size
+
+    async def aiter_report(self, data, page_size=MAX_PAGE_SIZE, records=True, **kwargs):
+        """Asynchronously iterate over the rows of the settlement recon report.
+
+        Counterpart of `iter_report` for resources bound to an `AsyncClient`.
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        for day in self._report_days(data):
+            skip = 0
+            while True:
+                query = {**day, "count": page_size, "skip": skip}
+                items = (await self.report(query, **kwargs)).get("items", [])
+                for item in items:
+                    yield ReconRecord(item) if records else item
+                if len(items) < page_size:
+                    break
+                skip += page_size
+
+    @staticmethod
+    def _report_days(data):
+        """Return the report query of every day covered by `data`."""
+        data = dict(data)
+        data.pop("count", None)
+        data.pop("skip", None)
+        if data.get("day"):
+            return [data]
+        days = calendar.monthrange(int(data["year"]), int(data["month"]))[1]
+        return [{**data, "day": day} for day in range(1, days + 1)]
+
     def create_ondemand_settlement(self, data=None, **kwargs):
         """Create Ondemand Settlement entity.
 
@@ -1,8 +1,11 @@
 """Stakeholder resource."""
 
+# Standard library imports
+from functools import partial
+
 # Razorpay SDK local imports
 from ..constants.url import URL
-from .base import Resource
+from .base import MAX_PAGE_SIZE, Resource
 
 
 class Stakeholder(Resource):
@@ -55,6 +58,14 @@ class Stakeholder(Resource):
         url = f"{self.base_url}/{account_id}{URL.STAKEHOLDER}"
         return self.get(url, data, **kwargs)
 
+    def iter_all(self, account_id, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Lazily iterate over every stakeholder of an account, see `Resource.iter_all`."""
+        return self._iter_pages(partial(self.all, account_id), data, page_size, prefetch, **kwargs)
+
+    def aiter_all(self, account_id, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Asynchronously iterate over every stakeholder of an account, see `Resource.aiter_all`."""
+        return self._aiter_pages(partial(self.all, account_id), data, page_size, prefetch, **kwargs)
+
     def edit(self, account_id, stakeholder_id, data=None, **kwargs):
         """Edit stakeholder information from given dict.
 
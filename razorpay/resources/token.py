@@ -1,8 +1,11 @@
 """Token resource."""
 
+# Standard library imports
+from functools import partial
+
 # Razorpay SDK local imports
 from ..constants.url import URL
-from .base import Resource
+from .base import MAX_PAGE_SIZE, Resource
 
 
 class Token(Resource):
@@ -52,6 +55,16 @@ class Token(Resource):
         url = f"{self.base_url}/{customer_id}/tokens"
         return self.get(url, data, **kwargs)
 
+    def iter_all(self, customer_id, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Lazily iterate over every token of a customer, see `Resource.iter_all`."""
+        return self._iter_pages(partial(self.all, customer_id), data, page_size, prefetch, **kwargs)
+
+    def aiter_all(self, customer_id, data=None, page_size=MAX_PAGE_SIZE, prefetch=False, **kwargs):
+        """Asynchronously iterate over every token of a customer, see `Resource.aiter_all`."""
+        return self._aiter_pages(
+            partial(self.all, customer_id), data, page_size, prefetch, **kwargs
+        )
+
     def delete(self, customer_id, token_id, data=None, **kwargs):
         """Delete Given Token For a Customer.
 
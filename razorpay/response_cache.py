@@ -0,0 +1,213 @@
+"""Client-side cache of GET responses for rarely changing data."""
+
+# Standard library imports
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy:
+    """How long the responses of an endpoint are cached.
+
+    Args:
+        ttl : Seconds a response is served from the cache
+        stale_ttl : Seconds a response keeps being served after `ttl` while
+            it is refreshed in the background
+    """
+
+    __slots__ = ("stale_ttl", "ttl")
+
+    def __init__(self, ttl, stale_ttl=0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def __repr__(self):
+        """Return the policy as code."""
+        return f"CachePolicy(ttl={self.ttl}, stale_ttl={self.stale_ttl})"
+
+
+# Request paths (without the base url) of reference data, matched with fnmatch
+DEFAULT_CACHE_POLICIES = {
+    # payment.fetchPaymentMethods
+    "/methods": CachePolicy(ttl=300, stale_ttl=3600),
+    # payment.fetchDownTime, downtimes change the most often
+    "/v1/payments/downtimes": CachePolicy(ttl=30, stale_ttl=60),
+    # iin.fetch
+    "/v1/iins/*": CachePolicy(ttl=86400, stale_ttl=86400),
+    # plan.fetch and item.fetch
+    "/v1/plans/*": CachePolicy(ttl=300, stale_ttl=3600),
+    "/v1/items/*": CachePolicy(ttl=300, stale_ttl=3600),
+    # product.fetchTnc
+    "/v2/products/*/tnc": CachePolicy(ttl=3600, stale_ttl=86400),
+}
+
+
+class _Entry:
+    """Encoded response cached for one request."""
+
+    __slots__ = ("data", "expires_at", "path", "refreshing", "stale_until")
+
+    def __init__(self, path, data, policy, now):
+        self.path = path
+        self.data = data
+        self.expires_at = now + policy.ttl
+        self.stale_until = self.expires_at + policy.stale_ttl
+        self.refreshing = False
+
+
+class ResponseCache:
+    """LRU cache of the responses of GET requests, with a TTL per endpoint.
+
+    Only requests whose path matches one of the `policies` are cached.
+    Responses are kept encoded, so every hit returns a new object that the
+    caller is free to modify, and the cache is bounded both by number of
+    entries and by their total size. Once a response is older than the
+    `ttl` of its policy but within `stale_ttl`, it is still served while a
+    single background request refreshes it.
+
+    Args:
+        policies : Mapping of fnmatch pattern of request paths to
+            `CachePolicy`, defaults to DEFAULT_CACHE_POLICIES
+        max_entries : Maximum number of cached responses
+        max_bytes : Maximum total size of the cached responses
+        refresh_workers : Number of threads refreshing stale responses
+    """
+
+    def __init__(
+        self, policies=None, max_entries=1024, max_bytes=16 * 1024 * 1024, refresh_workers=1
+    ):
+        self.policies = dict(DEFAULT_CACHE_POLICIES if policies is None else policies)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.refresh_workers = refresh_workers
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._executor = None
+        self._stats = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "refreshes", "refresh_errors", "evictions"), 0
+        )
+
+    def policy_for(self, path):
+        """Return the `CachePolicy` of a request path, or None if it is not cached."""
+        for pattern, policy in self.policies.items():
+            if fnmatchcase(path, pattern):
+                return policy
+        return None
+
+    def get(self, key, path, load, codec):
+        """Return the response for `key`, calling `load` unless it is cached.
+
+        Args:
+            key : Hashable identifying the request
+            path : Request path, matched against the policies
+            load : Callable sending the request and returning the response
+            codec : JSON codec used to encode cached responses
+
+        Returns:
+            The cached or loaded response
+        """
+        if self.policy_for(path) is None:
+            return load()
+        data, refresh = self.lookup(key)
+        if data is None:
+            value = load()
+            self.store(key, path, codec.encode(value))
+            return value
+        if refresh:
+            self._refresh_executor().submit(self._refresh, key, path, load, codec)
+        return codec.decode(data)
+
+    def lookup(self, key):
+        """Return the encoded response cached for `key`, or None, and whether to refresh it.
+
+        Only one caller is asked to refresh a stale response.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry.stale_until:
+                if entry is not None:
+                    self._remove(key)
+                self._stats["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if now < entry.expires_at:
+                self._stats["hits"] += 1
+                return entry.data, False
+            self._stats["stale_hits"] += 1
+            refresh = not entry.refreshing
+            entry.refreshing = True
+            return entry.data, refresh
+
+    def store(self, key, path, data):
+        """Cache the encoded response `data` of `key`, evicting the least recently used."""
+        policy = self.policy_for(path)
+        if policy is None or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(path, data, policy, time.monotonic())
+            self._bytes += len(data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def refresh_done(self, key, path, data):
+        """Cache the refreshed encoded response `data` of `key`."""
+        with self._lock:
+            self._stats["refreshes"] += 1
+        self.store(key, path, data)
+
+    def refresh_failed(self, key):
+        """Let a later lookup of `key` try to refresh it again."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+            self._stats["refresh_errors"] += 1
+
+    def invalidate(self, path=None):
+        """Drop the responses cached for `path` and its sub-paths, or every response."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if path is None or entry.path == path or entry.path.startswith(f"{path}/"):
+                    self._remove(key)
+
+    def stats(self):
+        """Return hit, miss, refresh and eviction counts along with the cache size."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes}
+
+    def close(self):
+        """Stop the background refresh threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.data)
+
+    def _refresh_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.refresh_workers, thread_name_prefix="razorpay-cache"
+                )
+            return self._executor
+
+    def _refresh(self, key, path, load, codec):
+        try:
+            data = codec.encode(load())
+        except Exception as e:
+            logger.warning(f"Could not refresh cached response of {path}: {e}")
+            self.refresh_failed(key)
+            return
+        self.refresh_done(key, path, data)
@@ -0,0 +1,104 @@
+"""Coalescing of concurrent identical requests."""
+
+# Standard library imports
+import asyncio
+import copy
+import threading
+
+
+class _Call:
+    """Outcome of an in-flight call, shared by every caller waiting on it."""
+
+    __slots__ = ("done", "error", "result", "shared")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # Number of callers waiting on the call besides the one running it
+        self.shared = 0
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers asking for the same key.
+
+    The first caller of `do` for a key runs the call, callers arriving while
+    it is in flight wait for it and receive a copy of its result, or its
+    exception. When a result was shared, the caller that ran the call gets a
+    copy too, so no caller sees the changes of another. Once the call has
+    returned, the next caller runs it again: nothing is cached.
+
+    Args:
+        copy_result : Callable applied to the result handed to the callers
+            of a shared call, so that they can modify it independently
+    """
+
+    def __init__(self, copy_result=copy.deepcopy):
+        self.copy_result = copy_result
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self._stats = {"calls": 0, "shared": 0}
+
+    def do(self, key, fn):
+        """Return the result of `fn()`, sharing it with concurrent calls for `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self._stats["calls"] += 1
+            else:
+                call.shared += 1
+                leader = False
+                self._stats["shared"] += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            # No caller can join the call anymore; the result given out is
+            # left untouched for the waiters to copy
+            return self.copy_result(call.result) if call.shared else call.result
+
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return self.copy_result(call.result)
+
+    async def ado(self, key, fn):
+        """Return the result of ``await fn()``, sharing it with concurrent calls for `key`.
+
+        Calls are shared between the tasks of one event loop.
+        """
+        entry = self._tasks.get(key)
+        if entry is None:
+            call = _Call()
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task, call
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            with self._lock:
+                self._stats["calls"] += 1
+            leader = True
+        else:
+            task, call = entry
+            call.shared += 1
+            with self._lock:
+                self._stats["shared"] += 1
+            leader = False
+        # A cancelled caller must not cancel the call for the others
+        result = await asyncio.shield(task)
+        # The task is out of `_tasks` before any caller resumes, so
+        # `call.shared` is final here
+        return result if leader and not call.shared else self.copy_result(result)
+
+    def stats(self):
+        """Return the number of calls run and of callers that shared one."""
+        with self._lock:
+            return dict(self._stats)
@@ -1,4 +1,5 @@
 # Razorpay SDK local imports
 from .utility import Utility
+from .webhook_verifier import WebhookKeyring, WebhookVerifier
 
-__all__ = ["Utility"]
+__all__ = ["Utility", "WebhookKeyring", "WebhookVerifier"]
@@ -0,0 +1,88 @@
+"""Batch verification of webhook and checkout signatures."""
+
+# Standard library imports
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+
+# Razorpay SDK local imports
+from .webhook_verifier import WebhookVerifier
+
+DEFAULT_CHUNK_SIZE = 1000
+
+POOLS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def checkout_message(parameters):
+    """Return the signed message of checkout callback `parameters`, or None if incomplete.
+
+    Payment, subscription and payment link callbacks are recognised by
+    their keys, as sent to the checkout handler.
+    """
+    try:
+        if "razorpay_order_id" in parameters:
+            return f"{parameters['razorpay_order_id']}|{parameters['razorpay_payment_id']}"
+        if "razorpay_subscription_id" in parameters:
+            return f"{parameters['razorpay_payment_id']}|{parameters['razorpay_subscription_id']}"
+        if "payment_link_id" in parameters:
+            return (
+                f"{parameters['payment_link_id']}|{parameters['payment_link_reference_id']}|"
+                f"{parameters['payment_link_status']}|{parameters['razorpay_payment_id']}"
+            )
+    except KeyError:
+        pass
+    return None
+
+
+def verify_webhooks(items):
+    """Verify ``(body, signature, secret)`` items serially, returning a list of bools."""
+    verifiers = {}
+    results = []
+    for body, signature, secret in items:
+        verifier = verifiers.get(secret)
+        if verifier is None:
+            verifier = verifiers[secret] = WebhookVerifier(secret)
+        results.append(verifier.is_valid(body, signature))
+    return results
+
+
+def verify_checkouts(items, secret=None):
+    """Verify checkout parameter dicts serially, returning a list of bools.
+
+    A ``"secret"`` key of a dict takes precedence over `secret`.
+    """
+    webhooks = []
+    for parameters in items:
+        message = checkout_message(parameters)
+        key = parameters.get("secret", secret)
+        signature = parameters.get("razorpay_signature")
+        if message is None or key is None or signature is None:
+            # Never valid, whatever the key
+            webhooks.append(("", "", ""))
+        else:
+            webhooks.append((message, signature, str(key)))
+    return verify_webhooks(webhooks)
+
+
+def run_batch(verify, items, pool=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Apply `verify` to `items` in chunks, optionally fanned out over a pool.
+
+    Args:
+        verify : Function verifying a list of items, returning a list of bools;
+            it must be picklable (defined at module level) for process pools
+        items : Iterable of items to verify
+        pool : None to verify in the calling thread, "thread" or "process"
+        max_workers : Maximum number of workers of the pool
+        chunk_size : Number of items handed to a worker at once
+
+    Returns:
+        List with one bool per item, in the order of `items`
+    """
+    if pool is None:
+        return verify(list(items))
+    if pool not in POOLS:
+        msg = f"Unsupported pool: {pool}, expected 'thread' or 'process'"
+        raise ValueError(msg)
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+    with POOLS[pool](max_workers) as executor:
+        return list(chain.from_iterable(executor.map(verify, chunks)))
@@ -3,9 +3,11 @@
 # Standard library imports
 import hashlib
 import hmac
+from functools import partial
 
 # Razorpay SDK local imports
 from ..errors import SignatureVerificationError
+from .batch_verifier import DEFAULT_CHUNK_SIZE, run_batch, verify_checkouts, verify_webhooks
 
 
 class Utility:
@@ -103,6 +105,50 @@ class Utility:
         """
         return self.verify_signature(body, signature, secret)
 
+    def verify_webhook_signatures(
+        self, items, pool=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE
+    ):
+        """Verify many webhook signatures, without raising on invalid ones.
+
+        Items signed with the same secret share one pre-keyed verifier. Large
+        batches can be fanned out over a pool: processes scale with the
+        number of cores, threads are enough for large bodies as hashlib
+        releases the GIL while hashing them.
+
+        Args:
+            items (iterable): ``(body, signature, secret)`` tuples.
+            pool (str): None to verify in the calling thread, "thread" or "process".
+            max_workers (int): Maximum number of workers of the pool.
+            chunk_size (int): Number of items handed to a worker at once.
+
+        Returns:
+            list: One bool per item, True where the signature is valid.
+        """
+        return run_batch(verify_webhooks, items, pool, max_workers, chunk_size)
+
+    def verify_checkout_signatures(
+        self, items, pool=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE
+    ):
+        """Verify many checkout signatures, without raising on invalid ones.
+
+        Each item holds the parameters passed to `verify_payment_signature`,
+        `verify_subscription_payment_signature` or
+        `verify_payment_link_signature`. Items without a 'secret' are checked
+        with the secret of the client.
+
+        Args:
+            items (iterable): Dicts of checkout callback parameters.
+            pool (str): None to verify in the calling thread, "thread" or "process".
+            max_workers (int): Maximum number of workers of the pool.
+            chunk_size (int): Number of items handed to a worker at once.
+
+        Returns:
+            list: One bool per item, True where the signature is valid.
+        """
+        secret = str(self.client.auth[1]) if self.client and self.client.auth else None
+        verify = partial(verify_checkouts, secret=secret)
+        return run_batch(verify, items, pool, max_workers, chunk_size)
+
     def verify_signature(self, body, signature, key):
         """Verify a Razorpay signature using HMAC SHA256.
 
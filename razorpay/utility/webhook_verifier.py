@@ -0,0 +1,171 @@
+"""Reusable webhook signature verification."""
+
+# Standard library imports
+import hashlib
+import hmac
+import threading
+from collections import OrderedDict
+
+# Razorpay SDK local imports
+from ..errors import SignatureVerificationError
+
+# Length of a hex encoded SHA256 signature
+SIGNATURE_LENGTH = 2 * hashlib.sha256().digest_size
+
+
+def signature_digest(signature):
+    """Decode a hex encoded signature, returning None when it is missing or malformed."""
+    if isinstance(signature, (bytes, bytearray, memoryview)):
+        signature = bytes(signature).decode("ascii", "replace")
+    elif not isinstance(signature, str):
+        return None
+    if len(signature) != SIGNATURE_LENGTH:
+        return None
+    try:
+        return bytes.fromhex(signature)
+    except ValueError:
+        return None
+
+
+class WebhookVerifier:
+    """Verify webhook signatures made with one secret.
+
+    The HMAC key schedule is computed once, when the verifier is created,
+    and copied for every message. Bodies may be given as received, as
+    `bytes` or `memoryview`, and signatures are compared as binary digests,
+    so verifying a webhook does not encode or decode anything.
+
+    Args:
+        secret : The webhook secret configured in Razorpay dashboard
+    """
+
+    __slots__ = ("_mac",)
+
+    def __init__(self, secret):
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        self._mac = hmac.new(secret, digestmod=hashlib.sha256)
+
+    def digest(self, body):
+        """Return the binary HMAC SHA256 digest of `body`."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        mac = self._mac.copy()
+        mac.update(body)
+        return mac.digest()
+
+    def is_valid(self, body, signature):
+        """Return True if `signature` is the signature of `body`.
+
+        Args:
+            body : The raw request body, as `bytes`, `memoryview` or `str`
+            signature : The signature sent in the `X-Razorpay-Signature` header
+        """
+        expected = signature_digest(signature)
+        if expected is None:
+            return False
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        mac = self._mac.copy()
+        mac.update(body)
+        return hmac.compare_digest(mac.digest(), expected)
+
+    def verify(self, body, signature):
+        """Verify the signature of a webhook.
+
+        Raises:
+            SignatureVerificationError: If `signature` is not the signature of `body`.
+
+        Returns:
+            bool: True if the signature is valid.
+        """
+        if not self.is_valid(body, signature):
+            msg = "Razorpay Signature Verification Failed"
+            raise SignatureVerificationError(msg)
+        return True
+
+
+class WebhookKeyring:
+    """Verify webhook signatures against several secrets, e.g. while rotating one.
+
+    Secrets are tried in order, without raising on the ones that do not
+    match. The key that last matched the webhooks of an account is tried
+    first for that account, so once most senders use the same secret a
+    webhook costs a single HMAC.
+
+    Args:
+        secrets : Mapping of key id to secret, or a sequence of secrets whose
+            key ids are their positions
+        cache_size : Maximum number of accounts whose last matching key is kept
+    """
+
+    def __init__(self, secrets, cache_size=10000):
+        if not hasattr(secrets, "items"):
+            secrets = dict(enumerate(secrets))
+        self._verifiers = {key_id: WebhookVerifier(secret) for key_id, secret in secrets.items()}
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._last_match = OrderedDict()
+
+    @property
+    def key_ids(self):
+        """Return the key ids in the order they are tried."""
+        return list(self._verifiers)
+
+    def match(self, body, signature, account_id=None):
+        """Return the id of the key that signed `body`, or None if no key did.
+
+        A missing or malformed signature matches no key.
+
+        Args:
+            body : The raw request body, as `bytes`, `memoryview` or `str`
+            signature : The signature sent in the `X-Razorpay-Signature` header
+            account_id : Account the webhook was sent for, e.g. the
+                `X-Razorpay-Account-Id` header or the `account_id` of the payload
+        """
+        expected = signature_digest(signature)
+        if expected is None:
+            return None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        with self._lock:
+            cached = self._last_match.get(account_id)
+        if cached is not None and self._matches(cached, body, expected):
+            return cached
+
+        for key_id in self._verifiers:
+            if key_id != cached and self._matches(key_id, body, expected):
+                self._remember(account_id, key_id)
+                return key_id
+        return None
+
+    def is_valid(self, body, signature, account_id=None):
+        """Return True if one of the keys signed `body`."""
+        return self.match(body, signature, account_id) is not None
+
+    def verify(self, body, signature, account_id=None):
+        """Verify the signature of a webhook.
+
+        Raises:
+            SignatureVerificationError: If none of the keys signed `body`.
+
+        Returns:
+            The id of the key that signed `body`.
+        """
+        key_id = self.match(body, signature, account_id)
+        if key_id is None:
+            msg = "Razorpay Signature Verification Failed"
+            raise SignatureVerificationError(msg)
+        return key_id
+
+    def _matches(self, key_id, body, expected):
+        verifier = self._verifiers.get(key_id)
+        return verifier is not None and hmac.compare_digest(verifier.digest(body), expected)
+
+    def _remember(self, account_id, key_id):
+        with self._lock:
+            self._last_match[account_id] = key_id
+            self._last_match.move_to_end(account_id)
+            while len(self._last_match) > self.cache_size:
+                self._last_match.popitem(last=False)
@@ -0,0 +1,276 @@
+"""Verification, deduplication and dispatch of incoming webhooks."""
+
+# Standard library imports
+import json
+import logging
+import queue
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# Razorpay SDK local imports
+from .utility.webhook_verifier import WebhookKeyring, WebhookVerifier
+
+SIGNATURE_HEADER = "x-razorpay-signature"
+EVENT_ID_HEADER = "x-razorpay-event-id"
+ACCOUNT_ID_HEADER = "x-razorpay-account-id"
+
+# Handlers registered for this event type receive every event
+ANY_EVENT = "*"
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookStatus:
+    """Outcome of submitting a webhook to a `WebhookProcessor`."""
+
+    ACCEPTED = "accepted"
+    DUPLICATE = "duplicate"
+    IGNORED = "ignored"
+    INVALID = "invalid"
+    OVERLOADED = "overloaded"
+
+
+class RecentIds:
+    """Bounded set of the ids seen within the last `ttl` seconds.
+
+    Holds at most `max_size` ids, the oldest are forgotten first, so memory
+    use stays constant whatever the rate of ids added.
+    """
+
+    def __init__(self, max_size=100000, ttl=86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._seen = OrderedDict()
+
+    def add(self, item_id):
+        """Record `item_id`, returning False if it was already seen recently."""
+        now = time.monotonic()
+        with self._lock:
+            # Ids are kept in the order they were added, so expired ones are first
+            while self._seen and next(iter(self._seen.values())) <= now - self.ttl:
+                self._seen.popitem(last=False)
+            if item_id in self._seen:
+                return False
+            self._seen[item_id] = now
+            if len(self._seen) > self.max_size:
+                self._seen.popitem(last=False)
+            return True
+
+    def discard(self, item_id):
+        """Forget `item_id`, so that it is accepted again."""
+        with self._lock:
+            self._seen.pop(item_id, None)
+
+    def __len__(self):
+        """Return the number of ids remembered."""
+        return len(self._seen)
+
+
+def ordering_key(event):
+    """Return the id of the entity an event is about, preferring its payment.
+
+    Events sharing an ordering key are handled one at a time in the order
+    they were submitted.
+    """
+    payload = event.get("payload")
+    if isinstance(payload, dict):
+        for name in ("payment", *payload):
+            item = payload.get(name)
+            entity = item.get("entity") if isinstance(item, dict) else None
+            if isinstance(entity, dict) and "id" in entity:
+                return str(entity["id"])
+    return str(event.get("account_id", ""))
+
+
+class WebhookProcessor:
+    """Verify, deduplicate and dispatch webhooks to handlers on worker threads.
+
+    `submit` checks the signature of the raw body before parsing it, drops
+    events whose `X-Razorpay-Event-Id` was already seen and queues the rest.
+    Worker threads call the handlers registered for the event type. Events
+    about the same entity (e.g. the same payment) always go to the same
+    worker, so they are handled in the order they were received.
+
+    Queues are bounded: when they are full `submit` waits up to `timeout`
+    seconds, then returns `WebhookStatus.OVERLOADED` so the endpoint can
+    answer with an error and let Razorpay deliver the webhook again later.
+
+    An accepted webhook is acknowledged before its handlers run, so Razorpay
+    does not deliver it again when a handler fails: handlers must record
+    their own failures to retry them. The id of a failed event is forgotten,
+    so a later delivery of it (e.g. resent from the Dashboard) is handled.
+
+    Args:
+        verifier : Webhook secret, `WebhookVerifier` or `WebhookKeyring`
+        max_workers : Number of worker threads
+        queue_size : Maximum number of events waiting for the workers
+        dedupe_size : Maximum number of event ids remembered
+        dedupe_ttl : Seconds an event id is remembered
+    """
+
+    def __init__(
+        self,
+        verifier,
+        max_workers=4,
+        queue_size=1000,
+        dedupe_size=100000,
+        dedupe_ttl=86400,
+    ):
+        if isinstance(verifier, (str, bytes)):
+            verifier = WebhookVerifier(verifier)
+        self.verifier = verifier
+        self.recent_ids = RecentIds(dedupe_size, dedupe_ttl)
+        self._handlers = {}
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            (
+                "received",
+                WebhookStatus.ACCEPTED,
+                WebhookStatus.DUPLICATE,
+                WebhookStatus.IGNORED,
+                WebhookStatus.INVALID,
+                WebhookStatus.OVERLOADED,
+                "handled",
+                "failed",
+            ),
+            0,
+        )
+        self._queues = [queue.Queue(max(1, queue_size // max_workers)) for _ in range(max_workers)]
+        self._workers = [
+            threading.Thread(
+                target=self._work, args=(q,), name=f"razorpay-webhook-{index}", daemon=True
+            )
+            for index, q in enumerate(self._queues)
+        ]
+        self._closed = False
+        for worker in self._workers:
+            worker.start()
+
+    def on(self, event_type, handler=None):
+        """Register `handler` for `event_type`, e.g. "payment.captured", or "*" for all.
+
+        Can be used as a decorator when `handler` is not given.
+        """
+        if handler is None:
+            return lambda handler: self.on(event_type, handler)
+        self._handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    def submit(self, body, headers, timeout=1.0):
+        """Verify a webhook and queue it for its handlers.
+
+        Args:
+            body : The raw request body, as `bytes`, `memoryview` or `str`
+            headers : Mapping of the request headers
+            timeout : Seconds to wait for room in a full queue, None to wait
+                as long as needed. Keep it well below the delivery timeout of
+                Razorpay webhooks (5 seconds)
+
+        Returns:
+            A `WebhookStatus`
+        """
+        if self._closed:
+            msg = "WebhookProcessor is closed"
+            raise RuntimeError(msg)
+        headers = {name.lower(): value for name, value in headers.items()}
+        status, event, event_id = self._accept(body, headers)
+        if status == WebhookStatus.ACCEPTED:
+            q = self._queues[zlib.crc32(ordering_key(event).encode()) % len(self._queues)]
+            try:
+                q.put((event, event_id), timeout=timeout)
+            except queue.Full:
+                if event_id is not None:
+                    self.recent_ids.discard(event_id)
+                status = WebhookStatus.OVERLOADED
+        self._count("received", status)
+        return status
+
+    def join(self):
+        """Wait until every queued event has been handled."""
+        for q in self._queues:
+            q.join()
+
+    def close(self, wait=True):
+        """Stop the workers once the queued events are handled."""
+        if self._closed:
+            return
+        self._closed = True
+        for q in self._queues:
+            q.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def stats(self):
+        """Return counts of webhooks per outcome and of events waiting in the queues."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = sum(q.qsize() for q in self._queues)
+        return stats
+
+    def __enter__(self):
+        """Return the processor."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Handle the queued events and stop the workers."""
+        self.close()
+
+    def _accept(self, body, headers):
+        """Return the status, parsed event and event id of a webhook."""
+        signature = headers.get(SIGNATURE_HEADER)
+        if signature is None or not self._is_valid(body, signature, headers):
+            return WebhookStatus.INVALID, None, None
+        # Only parse bodies known to come from Razorpay
+        try:
+            event = json.loads(bytes(body) if isinstance(body, memoryview) else body)
+        except ValueError:
+            return WebhookStatus.INVALID, None, None
+        if not isinstance(event, dict):
+            return WebhookStatus.INVALID, None, None
+        if not self._handlers_for(event.get("event")):
+            return WebhookStatus.IGNORED, None, None
+        event_id = headers.get(EVENT_ID_HEADER)
+        if event_id is not None and not self.recent_ids.add(event_id):
+            return WebhookStatus.DUPLICATE, None, None
+        return WebhookStatus.ACCEPTED, event, event_id
+
+    def _is_valid(self, body, signature, headers):
+        if isinstance(self.verifier, WebhookKeyring):
+            return self.verifier.is_valid(body, signature, headers.get(ACCOUNT_ID_HEADER))
+        return self.verifier.is_valid(body, signature)
+
+    def _handlers_for(self, event_type):
+        return [*self._handlers.get(event_type, ()), *self._handlers.get(ANY_EVENT, ())]
+
+    def _work(self, q):
+        while True:
+            item = q.get()
+            try:
+                if item is None:
+                    return
+                self._dispatch(*item)
+            finally:
+                q.task_done()
+
+    def _dispatch(self, event, event_id):
+        try:
+            for handler in self._handlers_for(event.get("event")):
+                handler(event)
+        except Exception:
+            logger.exception(f"Webhook handler failed for event {event_id}")
+            # The webhook was acknowledged already and is not redelivered by
+            # Razorpay, but a delivery resent by hand is handled again
+            if event_id is not None:
+                self.recent_ids.discard(event_id)
+            self._count("failed")
+        else:
+            self._count("handled")
+
+    def _count(self, *keys):
+        with self._stats_lock:
+            for key in keys:
+                self._stats[key] += 1
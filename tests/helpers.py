@@ -1,10 +1,17 @@
 # Standard library imports
+import http.server
+import json
 import os
+import ssl
+import threading
 import unittest
 
 # Razorpay SDK imports
 import razorpay
 
+CERT_FILE = os.path.join(os.path.dirname(__file__), 'certs', 'localhost.crt')
+KEY_FILE = os.path.join(os.path.dirname(__file__), 'certs', 'localhost.key')
+
 
 def mock_file(filename):
     if not filename:
@@ -36,3 +43,66 @@ class ClientTestCase(unittest.TestCase):
         self.secondary_client = razorpay.Client(
             auth=("key_id", "key_secret"), base_url=self.secondary_url
         )
+
+
+class StubServer:
+    """Local HTTP server answering with canned JSON responses.
+
+    Routes map ``(method, path)`` to ``(status, body)``; a body may also be a
+    callable taking the request handler. Every request is recorded in
+    ``requests`` as ``(method, path, headers, body)`` and the client port of
+    every connection in ``ports``. With ``tls`` the server speaks HTTPS using
+    the self-signed certificate in ``tests/certs`` (see ``CERT_FILE``).
+    """
+
+    def __init__(self, routes=None, tls=False):
+        self.routes = routes or {}
+        self.requests = []
+        self.ports = set()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                path = self.path.split('?')[0]
+                stub.requests.append((self.command, self.path, dict(self.headers), body))
+                stub.ports.add(self.client_address[1])
+                status, payload = stub.routes.get(
+                    (self.command, path), (404, {'error': {'code': 'BAD_REQUEST_ERROR'}}))
+                if callable(payload):
+                    payload = payload(self)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        scheme = 'http'
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERT_FILE, KEY_FILE)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            scheme = 'https'
+        self.url = '{}://127.0.0.1:{}'.format(scheme, self.server.server_address[1])
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,76 @@
+# Standard library imports
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.errors import BadRequestError
+
+# Razorpay SDK local imports
+from .helpers import StubServer, mock_file
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.order = json.loads(mock_file('fake_order'))
+        self.payment = json.loads(mock_file('fake_payment'))
+        self.server = StubServer({
+            ('POST', '/v1/orders'): (200, self.order),
+            ('GET', '/v1/payments/fake_payment_id'): (200, self.payment),
+            ('GET', '/v1/payments'): (400, {'error': {
+                'code': 'BAD_REQUEST_ERROR',
+                'description': 'The count may not be greater than 100.'}}),
+        })
+        self.server.__enter__()
+
+    def tearDown(self):
+        self.server.__exit__(None, None, None)
+
+    def make_client(self, **options):
+        return razorpay.AsyncClient(
+            auth=('key_id', 'key_secret'), base_url=self.server.url, **options)
+
+    async def test_order_create(self):
+        async with self.make_client() as client:
+            result = await client.order.create({'amount': 5000, 'currency': 'INR'})
+        self.assertEqual(result, self.order)
+        method, path, headers, body = self.server.requests[0]
+        self.assertEqual((method, path), ('POST', '/v1/orders'))
+        self.assertEqual(json.loads(body), {'amount': 5000, 'currency': 'INR'})
+        self.assertEqual(headers['Content-type'], 'application/json')
+        self.assertTrue(headers['User-Agent'].startswith('Razorpay-Python/'))
+        self.assertTrue(headers['Authorization'].startswith('Basic '))
+
+    async def test_concurrent_fetches(self):
+        async with self.make_client() as client:
+            results = await asyncio.gather(
+                *(client.payment.fetch('fake_payment_id') for _ in range(20)))
+        self.assertEqual(results, [self.payment] * 20)
+
+    async def test_error_mapping(self):
+        async with self.make_client() as client:
+            with self.assertRaises(BadRequestError):
+                await client.payment.all({'count': 1000})
+
+    async def test_retry_uses_non_blocking_sleep(self):
+        client = razorpay.AsyncClient(
+            auth=('key_id', 'key_secret'), base_url='http://127.0.0.1:1',
+            max_retries=3)
+        client.enable_retry(True)
+        with mock.patch('razorpay.async_client.asyncio.sleep',
+                        new=mock.AsyncMock()) as sleep, \
+                mock.patch('razorpay.client.time.sleep') as blocking_sleep:
+            with self.assertRaises(httpx.ConnectError):
+                await client.payment.fetch('fake_payment_id')
+        await client.aclose()
+        self.assertEqual(sleep.await_count, 2)
+        blocking_sleep.assert_not_called()
@@ -0,0 +1,104 @@
+# Standard library imports
+import json
+import re
+import threading
+import unittest
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay import RateLimiter
+from razorpay.bulk import BulkCapturer
+from razorpay.bulk.executor import map_bounded
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase
+
+
+class TestBulkCapturer(ClientTestCase):
+
+    def setUp(self):
+        super(TestBulkCapturer, self).setUp()
+        self.base_url = f'{self.base_url}/payments'
+        self.attempts = {}
+        self.keys = {}
+        self.lock = threading.Lock()
+
+    def serve(self, request):
+        payment_id = request.url.split('/')[-2]
+        body = json.loads(request.body)
+        with self.lock:
+            attempt = self.attempts[payment_id] = self.attempts.get(payment_id, 0) + 1
+            self.keys.setdefault(payment_id, set()).add(
+                request.headers.get('X-Idempotency-Key'))
+        if payment_id == 'pay_bad':
+            return 400, {}, json.dumps({'error': {
+                'code': 'BAD_REQUEST_ERROR',
+                'description': 'This payment has already been captured'}})
+        if payment_id == 'pay_flaky' and attempt == 1:
+            return 500, {}, json.dumps({'error': {'code': 'SERVER_ERROR'}})
+        return 200, {}, json.dumps({'id': payment_id, 'status': 'captured',
+                                    'amount': body['amount'], 'currency': body['currency']})
+
+    def add_callback(self):
+        responses.add_callback(responses.POST, re.compile(rf'{self.base_url}/\w+/capture'),
+                               callback=self.serve)
+
+    @responses.activate
+    def test_capture_reports_every_item(self):
+        self.add_callback()
+        items = [(f'pay_{i}', 100 + i, 'INR') for i in range(20)]
+        items += [('pay_bad', 500, 'INR'), ('pay_flaky', 700, 'INR')]
+        capturer = BulkCapturer(self.client, max_workers=4, backoff=0)
+        results = {result.payment_id: result for result in capturer.capture(items)}
+
+        self.assertEqual(len(results), 22)
+        self.assertEqual(results['pay_3'].status, 'captured')
+        self.assertEqual(results['pay_3'].payment['amount'], 103)
+        self.assertEqual(results['pay_3'].payment['currency'], 'INR')
+        self.assertEqual(results['pay_bad'].status, 'failed')
+        self.assertEqual(results['pay_bad'].error_code, 'BAD_REQUEST_ERROR')
+        self.assertEqual(results['pay_bad'].error, 'This payment has already been captured')
+        # Server errors are retried with the same idempotency key
+        self.assertEqual(results['pay_flaky'].status, 'captured')
+        self.assertEqual(self.attempts['pay_flaky'], 2)
+        self.assertEqual(self.attempts['pay_bad'], 1)
+        self.assertEqual(self.keys['pay_flaky'], {'capture:pay_flaky:700'})
+        self.assertEqual(capturer.stats(), {'captured': 21, 'failed': 1})
+
+    @responses.activate
+    def test_retries_exhausted(self):
+        responses.add(responses.POST, f'{self.base_url}/pay_down/capture', status=503,
+                      json={'error': {'code': 'SERVER_ERROR', 'description': 'down'}})
+        capturer = BulkCapturer(self.client, retries=1, backoff=0)
+        [result] = capturer.capture([('pay_down', 100, 'INR')])
+        self.assertEqual((result.status, result.error_code), ('failed', 'SERVER_ERROR'))
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_rate_limiter(self):
+        self.add_callback()
+        limiter = RateLimiter(rate=1000)
+        capturer = BulkCapturer(self.client, rate_limiter=limiter)
+        results = list(capturer.capture((f'pay_{i}', 100, 'INR') for i in range(5)))
+        self.assertEqual(len(results), 5)
+        self.assertEqual(limiter.stats()['acquired'], 5)
+
+
+class TestMapBounded(unittest.TestCase):
+
+    def test_reads_items_lazily(self):
+        read = []
+
+        def items():
+            for i in range(100):
+                read.append(i)
+                yield i
+
+        results = map_bounded(lambda i: i * 2, items(), max_workers=2, max_pending=4)
+        first = [next(results) for _ in range(3)]
+        self.assertLessEqual(len(read), 7)
+        rest = list(results)
+        self.assertEqual(sorted(future.result() for _, future in first + rest),
+                         [i * 2 for i in range(100)])
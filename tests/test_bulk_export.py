@@ -0,0 +1,165 @@
+# Standard library imports
+import csv
+import json
+import os
+import tempfile
+import threading
+from urllib.parse import parse_qs, urlparse
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay.bulk import BulkExporter
+from razorpay.errors import ServerError
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase
+
+START = 1700000000
+HOUR = 3600
+
+
+class TestBulkExporter(ClientTestCase):
+
+    def setUp(self):
+        super(TestBulkExporter, self).setUp()
+        self.base_url = f'{self.base_url}/payments'
+        # One payment every 10 minutes for a day, plus one exactly on an hour edge
+        self.payments = [
+            {'id': f'pay_{i}', 'entity': 'payment', 'amount': 100 + i,
+             'currency': 'INR', 'status': 'captured', 'created_at': START + i * 600,
+             'notes': {'n': i}}
+            for i in range(144)
+        ]
+        self.failing = set()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmpdir.name, 'payments.jsonl')
+        self.checkpoint = os.path.join(self.tmpdir.name, 'payments.ckpt')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def serve(self, request):
+        query = parse_qs(urlparse(request.url).query)
+        since, until = int(query['from'][0]), int(query['to'][0])
+        if since in self.failing:
+            return 500, {}, json.dumps({'error': {'code': 'SERVER_ERROR'}})
+        count, skip = int(query['count'][0]), int(query['skip'][0])
+        # Overlapping windows: `to` is treated as one second later than asked
+        matched = [p for p in self.payments if since <= p['created_at'] <= until + 1]
+        items = matched[skip:skip + count]
+        return 200, {}, json.dumps({'entity': 'collection', 'count': len(items),
+                                    'items': items})
+
+    def read_ids(self):
+        with open(self.out) as f:
+            return [json.loads(line)['id'] for line in f]
+
+    @responses.activate
+    def test_export_jsonl_dedupes_shard_edges(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        exporter = BulkExporter(self.client, 'payment', max_workers=4,
+                                shard_seconds=HOUR, page_size=4)
+        written = exporter.export(self.out, START, START + 24 * HOUR)
+        self.assertEqual(written, 144)
+        self.assertEqual(self.read_ids(), [p['id'] for p in self.payments])
+        self.assertEqual(
+            [name for name in os.listdir(self.tmpdir.name) if name.startswith('.')], [])
+
+    @responses.activate
+    def test_export_csv(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        out = os.path.join(self.tmpdir.name, 'payments.csv')
+        exporter = BulkExporter(self.client, 'payment', shard_seconds=6 * HOUR)
+        exporter.export(out, START, START + 2 * HOUR, fmt='csv',
+                        fields=['id', 'amount', 'notes'])
+        with open(out, newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['id', 'amount', 'notes'])
+        self.assertEqual(rows[1], ['pay_0', '100', '{"n": 0}'])
+        self.assertEqual(len(rows), 13)
+
+    @responses.activate
+    def test_export_resumes_from_checkpoint(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        exporter = BulkExporter(self.client, 'payment', max_workers=2,
+                                shard_seconds=HOUR, page_size=10)
+        self.failing = {START + 5 * HOUR}
+        with self.assertRaises(ServerError):
+            exporter.export(self.out, START, START + 24 * HOUR,
+                            checkpoint=self.checkpoint)
+        with open(self.checkpoint) as f:
+            self.assertEqual(json.load(f)['next_shard'], 5)
+        self.assertEqual(len(self.read_ids()), 31)
+
+        self.failing = set()
+        responses.calls.reset()
+        written = exporter.export(self.out, START, START + 24 * HOUR,
+                                  checkpoint=self.checkpoint)
+        self.assertEqual(written, 113)
+        self.assertEqual(self.read_ids(), [p['id'] for p in self.payments])
+        first_query = parse_qs(urlparse(responses.calls[0].request.url).query)
+        self.assertGreaterEqual(int(first_query['from'][0]), START + 5 * HOUR)
+
+    @responses.activate
+    def test_failed_shard_stops_fetching_ahead(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        exporter = BulkExporter(self.client, 'payment', max_workers=2,
+                                shard_seconds=HOUR, page_size=10)
+        self.failing = {START + 5 * HOUR}
+        with self.assertRaises(ServerError):
+            exporter.export(self.out, START, START + 24 * HOUR)
+        requested = {int(parse_qs(urlparse(call.request.url).query)['from'][0])
+                     for call in responses.calls}
+        # Shards are fetched at most max_workers ahead of the one written
+        self.assertLessEqual(max(requested), START + 7 * HOUR)
+        self.assertEqual(
+            [name for name in os.listdir(self.tmpdir.name) if name.startswith('.')], [])
+
+    @responses.activate
+    def test_concurrent_exports(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        exporter = BulkExporter(self.client, 'payment', max_workers=2, shard_seconds=HOUR)
+        out_csv = os.path.join(self.tmpdir.name, 'payments.csv')
+        threads = [
+            threading.Thread(target=exporter.export, args=(self.out, START, START + 24 * HOUR)),
+            threading.Thread(target=exporter.export, args=(out_csv, START, START + 12 * HOUR),
+                             kwargs={'fmt': 'csv', 'fields': ['id']}),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.read_ids(), [p['id'] for p in self.payments])
+        with open(out_csv, newline='') as f:
+            self.assertEqual([row[0] for row in csv.reader(f)],
+                             ['id'] + [p['id'] for p in self.payments[:72]])
+
+    def test_checkpoint_for_other_window_is_rejected(self):
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'start': 1, 'end': 2, 'next_shard': 1, 'offset': 0}, f)
+        exporter = BulkExporter(self.client, 'payment')
+        with self.assertRaises(ValueError):
+            exporter.export(self.out, START, START + HOUR, checkpoint=self.checkpoint)
+
+    @responses.activate
+    def test_checkpoint_with_other_arguments_is_rejected(self):
+        responses.add_callback(responses.GET, self.base_url, callback=self.serve)
+        self.failing = {START + 2 * HOUR}
+        exporter = BulkExporter(self.client, 'payment', shard_seconds=HOUR)
+        with self.assertRaises(ServerError):
+            exporter.export(self.out, START, START + 4 * HOUR, checkpoint=self.checkpoint)
+        self.failing = set()
+        for exporter, kwargs in (
+            (BulkExporter(self.client, 'payment', shard_seconds=2 * HOUR), {}),
+            (exporter, {'fmt': 'csv'}),
+            (exporter, {'fields': ['id']}),
+            (exporter, {'data': {'status': 'captured'}}),
+        ):
+            with self.assertRaises(ValueError):
+                exporter.export(self.out, START, START + 4 * HOUR,
+                                checkpoint=self.checkpoint, **kwargs)
+        exporter = BulkExporter(self.client, 'payment', shard_seconds=HOUR)
+        exporter.export(self.out, START, START + 4 * HOUR, checkpoint=self.checkpoint)
+        self.assertEqual(self.read_ids(), [p['id'] for p in self.payments[:24]])
@@ -0,0 +1,145 @@
+# Standard library imports
+import json
+import os
+import re
+import tempfile
+import threading
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay.bulk import BulkRefunder, read_instructions
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase
+
+
+class TestBulkRefunder(ClientTestCase):
+
+    def setUp(self):
+        super(TestBulkRefunder, self).setUp()
+        self.base_url = f'{self.base_url}/payments'
+        self.requests = []
+        self.failing = set()
+        self.lock = threading.Lock()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.tmpdir.name, 'refunds.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def serve(self, request):
+        payment_id = request.url.split('/')[-2]
+        body = json.loads(request.body)
+        with self.lock:
+            self.requests.append((payment_id, body, request.headers.get('X-Idempotency-Key')))
+        if payment_id in self.failing:
+            return 400, {}, json.dumps({'error': {
+                'code': 'BAD_REQUEST_ERROR', 'description': 'Payment not found'}})
+        return 200, {}, json.dumps({'id': f'rfnd_{payment_id}', 'payment_id': payment_id,
+                                    'amount': body.get('amount', 1000)})
+
+    def add_callback(self):
+        responses.add_callback(responses.POST, re.compile(rf'{self.base_url}/\w+/refund'),
+                               callback=self.serve)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_read_instructions(self):
+        csv_path = self.write('refunds.csv', 'payment_id,amount,speed,notes\n'
+                                             'pay_1,100,optimum,"{""reason"": ""outage""}"\n'
+                                             'pay_2,,,\n')
+        self.assertEqual(list(read_instructions(csv_path)), [
+            {'payment_id': 'pay_1', 'amount': 100, 'speed': 'optimum',
+             'notes': {'reason': 'outage'}},
+            {'payment_id': 'pay_2'},
+        ])
+        jsonl_path = self.write('refunds.jsonl', '{"payment_id": "pay_1", "amount": 100}\n\n')
+        self.assertEqual(list(read_instructions(jsonl_path)),
+                         [{'payment_id': 'pay_1', 'amount': 100}])
+        with self.assertRaises(ValueError):
+            list(read_instructions(jsonl_path, fmt='xml'))
+
+    @responses.activate
+    def test_refund(self):
+        self.add_callback()
+        self.failing.add('pay_bad')
+        instructions = [{'payment_id': f'pay_{i}', 'amount': 100, 'speed': 'optimum'}
+                        for i in range(10)]
+        instructions += [{'payment_id': 'pay_full'}, {'payment_id': 'pay_bad'}]
+        refunder = BulkRefunder(self.client, max_workers=4)
+        results = {result.payment_id: result for result in refunder.refund(instructions)}
+
+        self.assertEqual(results['pay_3'].status, 'refunded')
+        self.assertEqual(results['pay_3'].refund['id'], 'rfnd_pay_3')
+        self.assertEqual(results['pay_full'].amount, None)
+        self.assertEqual(results['pay_bad'].status, 'failed')
+        self.assertEqual(results['pay_bad'].error_code, 'BAD_REQUEST_ERROR')
+        sent = {payment_id: (body, key) for payment_id, body, key in self.requests}
+        self.assertEqual(sent['pay_3'],
+                         ({'amount': 100, 'speed': 'optimum'}, 'refund:pay_3:100:'))
+        self.assertEqual(sent['pay_full'], ({}, 'refund:pay_full:full:'))
+
+        stats = refunder.stats()
+        self.assertEqual((stats['refunded'], stats['failed'], stats['skipped']), (11, 1, 0))
+        self.assertGreater(stats['throughput'], 0)
+        self.assertGreaterEqual(stats['latency_max'], stats['latency_p95'])
+        self.assertGreaterEqual(stats['latency_p95'], stats['latency_p50'])
+
+    @responses.activate
+    def test_duplicate_instructions(self):
+        self.add_callback()
+        path = self.write('refunds.csv', 'payment_id,amount\npay_1,100\npay_1,100\n')
+        refunder = BulkRefunder(self.client, checkpoint=self.checkpoint)
+        self.assertEqual(len(list(refunder.refund_file(path))), 2)
+        self.assertEqual(len({key for _, _, key in self.requests}), 2)
+
+        # Both are known to be refunded on the next run
+        refunder = BulkRefunder(self.client, checkpoint=self.checkpoint)
+        self.assertEqual(list(refunder.refund_file(path)), [])
+        self.assertEqual(refunder.stats()['skipped'], 2)
+
+        # Lines added before them do not change their keys
+        path = self.write('refunds.csv', 'payment_id,amount\npay_2,100\npay_1,100\n'
+                                         'pay_1,100\npay_1,100\n')
+        self.requests.clear()
+        refunder = BulkRefunder(self.client, checkpoint=self.checkpoint)
+        self.assertEqual({r.payment_id for r in refunder.refund_file(path)}, {'pay_1', 'pay_2'})
+        self.assertEqual(sorted(key for _, _, key in self.requests),
+                         ['refund:pay_1:100::3', 'refund:pay_2:100:'])
+
+    @responses.activate
+    def test_resume_from_checkpoint(self):
+        self.add_callback()
+        path = self.write('refunds.jsonl', ''.join(
+            json.dumps({'payment_id': f'pay_{i}', 'amount': 100}) + '\n' for i in range(20)))
+        self.failing.add('pay_7')
+        refunder = BulkRefunder(self.client, max_workers=2, checkpoint=self.checkpoint)
+        results = refunder.refund_file(path)
+        for _ in range(10):
+            next(results)
+        results.close()
+        logged = [json.loads(line) for line in open(self.checkpoint)]
+        refunded = {entry['payment_id'] for entry in logged if entry['status'] == 'refunded'}
+        self.assertGreaterEqual(len(logged), 10)
+
+        # A line cut short by a crash is ignored
+        with open(self.checkpoint, 'a') as f:
+            f.write('{"key": "refund:pay_')
+
+        self.failing.clear()
+        self.requests.clear()
+        refunder = BulkRefunder(self.client, max_workers=2, checkpoint=self.checkpoint)
+        resumed = {result.payment_id for result in refunder.refund_file(path)}
+        self.assertEqual(resumed, {f'pay_{i}' for i in range(20)} - refunded)
+        self.assertIn('pay_7', resumed)
+        self.assertEqual(refunder.stats()['skipped'], len(refunded))
+
+        logged = [json.loads(line) for line in open(self.checkpoint) if line.endswith('}\n')]
+        refunded = {entry['payment_id'] for entry in logged if entry['status'] == 'refunded'}
+        self.assertEqual(refunded, {f'pay_{i}' for i in range(20)})
@@ -0,0 +1,188 @@
+# Standard library imports
+import json
+import re
+import threading
+from unittest import mock
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay import RateLimiter
+from razorpay.bulk import BulkTransferer, group_by_payment
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase
+
+
+class TestBulkTransferer(ClientTestCase):
+
+    def setUp(self):
+        super(TestBulkTransferer, self).setUp()
+        self.lock = threading.Lock()
+        self.ids = iter(range(1000))
+        self.keys = []
+        self.reversed = []
+        self.failing_accounts = set()
+        self.rejected_accounts = set()
+
+    def new_transfer(self, split):
+        with self.lock:
+            transfer_id = f'trf_{next(self.ids)}'
+        return {'id': transfer_id, 'entity': 'transfer', 'recipient': split['account'],
+                'amount': split['amount'], 'currency': split['currency']}
+
+    def failure(self):
+        return 400, {}, json.dumps({'error': {
+            'code': 'BAD_REQUEST_ERROR', 'description': 'Account is not activated'}})
+
+    def serve_payment(self, request):
+        splits = json.loads(request.body)['transfers']
+        with self.lock:
+            self.keys.append(request.headers['X-Idempotency-Key'])
+        if any(split['account'] in self.failing_accounts for split in splits):
+            return self.failure()
+        items = [self.new_transfer(split) for split in splits]
+        for item in items:
+            if item['recipient'] in self.rejected_accounts:
+                item.update(status='failed', error={
+                    'code': 'BAD_REQUEST_ERROR', 'description': 'Linked account is suspended'})
+        return 200, {}, json.dumps({'entity': 'collection', 'count': len(items),
+                                    'items': items})
+
+    def serve_direct(self, request):
+        split = json.loads(request.body)
+        with self.lock:
+            self.keys.append(request.headers['X-Idempotency-Key'])
+        if split['account'] in self.failing_accounts:
+            return self.failure()
+        return 200, {}, json.dumps(self.new_transfer(split))
+
+    def serve_reversal(self, request):
+        with self.lock:
+            self.reversed.append(request.url.split('/')[-2])
+        return 200, {}, json.dumps({'id': 'rvrsl_1', 'entity': 'reversal'})
+
+    def add_callbacks(self):
+        responses.add_callback(
+            responses.POST, re.compile(rf'{self.base_url}/payments/\w+/transfers'),
+            callback=self.serve_payment)
+        responses.add_callback(responses.POST, f'{self.base_url}/transfers',
+                               callback=self.serve_direct)
+        responses.add_callback(
+            responses.POST, re.compile(rf'{self.base_url}/transfers/\w+/reversals'),
+            callback=self.serve_reversal)
+
+    def test_group_by_payment(self):
+        groups = group_by_payment([
+            {'payment_id': 'pay_1', 'account': 'acc_a', 'amount': 100},
+            {'account': 'acc_c', 'amount': 50},
+            {'payment_id': 'pay_2', 'account': 'acc_a', 'amount': 300},
+            {'payment_id': 'pay_1', 'account': 'acc_b', 'amount': 200},
+            {'account': 'acc_d', 'amount': 60},
+        ])
+        self.assertEqual(groups, [
+            ('pay_1', [{'account': 'acc_a', 'amount': 100}, {'account': 'acc_b', 'amount': 200}]),
+            ('pay_2', [{'account': 'acc_a', 'amount': 300}]),
+            (None, [{'account': 'acc_c', 'amount': 50}]),
+            (None, [{'account': 'acc_d', 'amount': 60}]),
+        ])
+
+    @responses.activate
+    def test_transfer_groups(self):
+        self.add_callbacks()
+        self.failing_accounts.add('acc_inactive')
+        groups = [(f'pay_{i}', [{'account': 'acc_a', 'amount': 100, 'currency': 'INR'},
+                                {'account': 'acc_b', 'amount': 200, 'currency': 'INR'}])
+                  for i in range(10)]
+        groups.append(('pay_bad', [{'account': 'acc_inactive', 'amount': 100,
+                                    'currency': 'INR'}]))
+        transferer = BulkTransferer(self.client, max_workers=4)
+        results = {result.payment_id: result for result in transferer.transfer(groups)}
+
+        self.assertEqual(results['pay_3'].status, 'created')
+        self.assertEqual([t['recipient'] for t in results['pay_3'].transfers],
+                         ['acc_a', 'acc_b'])
+        self.assertEqual(results['pay_bad'].status, 'failed')
+        self.assertEqual(results['pay_bad'].errors[0][1:],
+                         ('BAD_REQUEST_ERROR', 'Account is not activated'))
+        self.assertEqual(len(set(self.keys)), 11)
+        self.assertEqual(transferer.stats(), {'created': 10, 'partial': 0, 'failed': 1,
+                                              'rolled_back': 0, 'transfers': 20,
+                                              'reversals': 0})
+
+    @responses.activate
+    def test_rate_limiter_groups(self):
+        self.add_callbacks()
+        limiter = RateLimiter(rate=1000)
+        split = {'account': 'acc_a', 'amount': 100, 'currency': 'INR'}
+        transferer = BulkTransferer(self.client, rate_limiter=limiter)
+        with mock.patch.object(limiter, 'acquire', wraps=limiter.acquire) as acquire:
+            list(transferer.transfer([('pay_1', [split]), (None, [split])]))
+        # Throttled under the group the client limits each endpoint under
+        self.assertEqual(sorted(call.args for call in acquire.call_args_list),
+                         [('key_id', 'payments'), ('key_id', 'transfers')])
+
+    @responses.activate
+    def test_partial_direct_transfers_rolled_back(self):
+        self.add_callbacks()
+        self.failing_accounts.add('acc_inactive')
+        group = (None, [{'account': 'acc_a', 'amount': 100, 'currency': 'INR'},
+                        {'account': 'acc_inactive', 'amount': 100, 'currency': 'INR'}])
+
+        [partial] = BulkTransferer(self.client).transfer([group])
+        self.assertEqual(partial.status, 'partial')
+        self.assertEqual(len(partial.transfers), 1)
+        self.assertEqual(partial.errors[0][0]['account'], 'acc_inactive')
+        self.assertEqual(self.reversed, [])
+
+        transferer = BulkTransferer(self.client, rollback_partial=True)
+        [rolled_back] = transferer.transfer([group])
+        self.assertEqual(rolled_back.status, 'rolled_back')
+        self.assertEqual(self.reversed, [rolled_back.transfers[0]['id']])
+        self.assertEqual(len(rolled_back.reversals), 1)
+
+    @responses.activate
+    def test_identical_direct_transfers(self):
+        self.add_callbacks()
+        split = {'account': 'acc_a', 'amount': 100, 'currency': 'INR'}
+        groups = group_by_payment([split, split])
+        results = list(BulkTransferer(self.client).transfer(groups))
+        self.assertEqual([result.status for result in results], ['created', 'created'])
+        self.assertEqual(len(set(self.keys)), 2)
+        keys = list(self.keys)
+
+        # Keys follow the content of a transfer, not its position in the batch
+        other = {'account': 'acc_b', 'amount': 100, 'currency': 'INR'}
+        self.keys.clear()
+        list(BulkTransferer(self.client).transfer(group_by_payment([other, split, split])))
+        self.assertEqual(len(self.keys), 3)
+        self.assertEqual(len(set(self.keys) - set(keys)), 1)
+
+    @responses.activate
+    def test_partial_payment_transfers(self):
+        self.add_callbacks()
+        self.rejected_accounts.add('acc_suspended')
+        group = ('pay_1', [{'account': 'acc_a', 'amount': 100, 'currency': 'INR'},
+                           {'account': 'acc_suspended', 'amount': 200, 'currency': 'INR'}])
+        transferer = BulkTransferer(self.client, rollback_partial=True)
+        [result] = transferer.transfer([group])
+
+        self.assertEqual(result.status, 'rolled_back')
+        self.assertEqual([t['recipient'] for t in result.transfers], ['acc_a'])
+        self.assertEqual(result.errors, [(group[1][1], 'BAD_REQUEST_ERROR',
+                                          'Linked account is suspended')])
+        self.assertEqual(self.reversed, [result.transfers[0]['id']])
+        self.assertEqual(transferer.stats()['transfers'], 1)
+
+    @responses.activate
+    def test_rollback(self):
+        self.add_callbacks()
+        transferer = BulkTransferer(self.client)
+        [result] = transferer.transfer([('pay_1', [
+            {'account': 'acc_a', 'amount': 100, 'currency': 'INR'},
+            {'account': 'acc_b', 'amount': 200, 'currency': 'INR'}])])
+        rolled_back = transferer.rollback(result)
+        self.assertEqual(rolled_back.status, 'rolled_back')
+        self.assertEqual(sorted(self.reversed), sorted(t['id'] for t in result.transfers))
+        self.assertEqual(transferer.stats()['reversals'], 2)
@@ -0,0 +1,152 @@
+# Standard library imports
+import json
+import unittest
+from unittest import mock
+
+# Other third-party library imports
+import requests
+import responses
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.circuit_breaker import CircuitBreaker, CircuitState
+from razorpay.errors import BadRequestError, CircuitOpenError, ServerError
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase, mock_file
+
+SERVER_ERROR = json.dumps({'error': {'code': 'SERVER_ERROR', 'description': 'down'}})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('razorpay.circuit_breaker.time.monotonic',
+                             side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.transitions = []
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, recovery_timeout=10,
+            on_state_change=lambda *t: self.transitions.append(t))
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.before_call('payments')
+            self.breaker.record_failure('payments')
+        self.breaker.record_success('payments')
+        for _ in range(3):
+            self.breaker.before_call('payments')
+            self.breaker.record_failure('payments')
+        self.assertEqual(self.breaker.state('payments'), CircuitState.OPEN)
+        self.assertRaises(CircuitOpenError, self.breaker.before_call, 'payments')
+        # Other groups are unaffected
+        self.breaker.before_call('orders')
+        self.assertEqual(self.transitions, [('payments', 'closed', 'open')])
+
+    def test_half_open_trial_closes_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure('payments')
+        self.now += 10
+        self.assertEqual(self.breaker.state('payments'), CircuitState.HALF_OPEN)
+        self.breaker.before_call('payments')
+        # Only one trial request is let through at a time
+        self.assertRaises(CircuitOpenError, self.breaker.before_call, 'payments')
+        self.breaker.record_success('payments')
+        self.assertEqual(self.breaker.state('payments'), CircuitState.CLOSED)
+        self.assertEqual(self.transitions, [
+            ('payments', 'closed', 'open'),
+            ('payments', 'open', 'half_open'),
+            ('payments', 'half_open', 'closed'),
+        ])
+
+    def test_half_open_failure_reopens_circuit(self):
+        for _ in range(3):
+            self.breaker.record_failure('payments')
+        self.now += 10
+        self.breaker.before_call('payments')
+        self.breaker.record_failure('payments')
+        self.assertEqual(self.breaker.state('payments'), CircuitState.OPEN)
+        self.now += 5
+        self.assertRaises(CircuitOpenError, self.breaker.before_call, 'payments')
+
+    def test_reset(self):
+        for _ in range(3):
+            self.breaker.record_failure('payments')
+        self.breaker.reset()
+        self.assertEqual(self.breaker.state('payments'), CircuitState.CLOSED)
+        self.breaker.before_call('payments')
+
+
+class TestClientCircuitBreaker(ClientTestCase):
+
+    def setUp(self):
+        super(TestClientCircuitBreaker, self).setUp()
+        self.breaker = razorpay.CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        self.client = razorpay.Client(auth=('key_id', 'key_secret'),
+                                      circuit_breaker=self.breaker)
+        self.payment_url = f'{self.base_url}/payments/{self.payment_id}'
+
+    @responses.activate
+    def test_open_circuit_fails_fast(self):
+        responses.add(responses.GET, self.payment_url, status=503, body=SERVER_ERROR)
+        responses.add(responses.GET, f'{self.base_url}/orders/fake_order_id',
+                      status=200, json=json.loads(mock_file('fake_order')))
+        for _ in range(2):
+            self.assertRaises(ServerError, self.client.payment.fetch, self.payment_id)
+        self.assertRaises(CircuitOpenError, self.client.payment.fetch, self.payment_id)
+        self.assertEqual(len(responses.calls), 2)
+        self.client.order.fetch('fake_order_id')
+
+    @responses.activate
+    def test_connection_errors_count_as_failures(self):
+        responses.add(responses.GET, self.payment_url,
+                      body=requests.exceptions.ConnectionError('reset'))
+        for _ in range(2):
+            self.assertRaises(requests.exceptions.ConnectionError,
+                              self.client.payment.fetch, self.payment_id)
+        self.assertEqual(self.breaker.state('payments'), CircuitState.OPEN)
+
+    @responses.activate
+    def test_open_circuit_stops_retries(self):
+        self.client.enable_retry(True)
+        responses.add(responses.GET, self.payment_url, status=503, body=SERVER_ERROR)
+        with mock.patch('razorpay.client.time.sleep'):
+            self.assertRaises(CircuitOpenError, self.client.payment.fetch, self.payment_id)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_client_errors_do_not_open_circuit(self):
+        responses.add(responses.GET, self.payment_url, status=400, json={
+            'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'bad'}})
+        for _ in range(3):
+            self.assertRaises(BadRequestError, self.client.payment.fetch, self.payment_id)
+        self.assertEqual(self.breaker.state('payments'), CircuitState.CLOSED)
+
+    @responses.activate
+    def test_half_open_trial_errors_release_the_circuit(self):
+        now = [1000.0]
+        with mock.patch('razorpay.circuit_breaker.time.monotonic', side_effect=lambda: now[0]):
+            self.breaker.failure_threshold = 1
+            responses.add(responses.GET, self.payment_url, status=503, body=SERVER_ERROR)
+            self.assertRaises(ServerError, self.client.payment.fetch, self.payment_id)
+
+            # A trial cut short by a broken response body re-opens the circuit
+            now[0] += 60
+            responses.replace(responses.GET, self.payment_url,
+                              body=requests.exceptions.ChunkedEncodingError('truncated'))
+            self.assertRaises(requests.exceptions.ChunkedEncodingError,
+                              self.client.payment.fetch, self.payment_id)
+            self.assertEqual(self.breaker.state('payments'), CircuitState.OPEN)
+
+            # A trial interrupted before any outcome gives its slot back
+            now[0] += 60
+            with mock.patch.object(self.client.session, 'get', side_effect=KeyboardInterrupt):
+                self.assertRaises(KeyboardInterrupt, self.client.payment.fetch, self.payment_id)
+            self.assertEqual(self.breaker.state('payments'), CircuitState.HALF_OPEN)
+
+            responses.replace(responses.GET, self.payment_url, status=200,
+                              json=json.loads(mock_file('fake_payment')))
+            self.client.payment.fetch(self.payment_id)
+            self.assertEqual(self.breaker.state('payments'), CircuitState.CLOSED)
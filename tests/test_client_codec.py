@@ -0,0 +1,106 @@
+# Standard library imports
+import json
+import unittest
+
+# Other third-party library imports
+import responses
+
+try:
+    # Other third-party library imports
+    import orjson
+except ImportError:
+    orjson = None
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.codecs import JsonCodec, OrjsonCodec, get_codec
+from razorpay.errors import BadRequestError, ServerError
+
+from .helpers import ClientTestCase
+
+
+class RecordingCodec(JsonCodec):
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, obj):
+        self.calls.append(('encode', obj))
+        return super().encode(obj)
+
+    def decode(self, data):
+        self.calls.append(('decode', data))
+        return super().decode(data)
+
+
+class TestGetCodec(unittest.TestCase):
+
+    def test_named_codecs(self):
+        self.assertIsInstance(get_codec('json'), JsonCodec)
+        self.assertIs(get_codec('json'), get_codec('json'))
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
+
+    def test_codec_objects_are_used_as_is(self):
+        codec = RecordingCodec()
+        self.assertIs(get_codec(codec), codec)
+
+    @unittest.skipUnless(orjson, 'orjson is not installed')
+    def test_fastest_codec(self):
+        self.assertIsInstance(get_codec(), OrjsonCodec)
+
+    @unittest.skipUnless(orjson, 'orjson is not installed')
+    def test_orjson_matches_json(self):
+        data = {'amount': 100, 'notes': {'name': 'café'}, 1: [True, None, 1.5]}
+        self.assertEqual(
+            json.loads(get_codec('orjson').encode(data)),
+            json.loads(get_codec('json').encode(data)))
+        body = json.dumps(data).encode()
+        self.assertEqual(get_codec('orjson').decode(body), get_codec('json').decode(body))
+
+
+class TestClientCodec(ClientTestCase):
+
+    def setUp(self):
+        super(TestClientCodec, self).setUp()
+        self.codec = RecordingCodec()
+        self.client = razorpay.Client(auth=('key_id', 'key_secret'), codec=self.codec)
+        self.url = f'{self.base_url}/orders'
+
+    @responses.activate
+    def test_codec_encodes_and_decodes(self):
+        result = {'id': 'order_1', 'amount': 100}
+        responses.add(responses.POST, self.url, status=200, body=json.dumps(result))
+        self.assertEqual(self.client.order.create({'amount': 100}), result)
+        self.assertEqual(
+            self.codec.calls,
+            [('encode', {'amount': 100}), ('decode', json.dumps(result).encode())])
+        self.assertEqual(json.loads(responses.calls[0].request.body), {'amount': 100})
+
+    @responses.activate
+    def test_no_content(self):
+        responses.add(responses.DELETE, f'{self.base_url}/items/item_1', status=204)
+        self.assertEqual(self.client.item.delete('item_1'), '{}')
+        self.assertEqual(self.codec.calls, [('encode', {})])
+
+    @responses.activate
+    def test_errors(self):
+        error = {'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'Invalid amount'}}
+        responses.add(responses.GET, self.url, status=400, body=json.dumps(error))
+        with self.assertRaisesRegex(BadRequestError, 'Invalid amount'):
+            self.client.order.all()
+
+    @responses.activate
+    def test_non_json_error(self):
+        responses.add(responses.GET, self.url, status=502, body='<html>Bad Gateway</html>')
+        with self.assertRaisesRegex(ServerError, 'Non-JSON response'):
+            self.client.order.all()
+
+    @responses.activate
+    def test_default_codec(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'))
+        result = {'entity': 'collection', 'count': 1, 'items': [{'id': 'order_1'}]}
+        responses.add(responses.POST, self.url, status=200, body=json.dumps(result))
+        self.assertEqual(client.order.create({'amount': 100, 'notes': {1: 'a'}}), result)
+        self.assertEqual(
+            json.loads(responses.calls[0].request.body), {'amount': 100, 'notes': {'1': 'a'}})
@@ -0,0 +1,128 @@
+# Standard library imports
+import json
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+import razorpay
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase, StubServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def paged_collection(total):
+    """Return a callback serving `total` fake entities through count/skip."""
+    def callback(query):
+        count = int(query['count'][0])
+        skip = int(query['skip'][0])
+        items = [{'id': f'pay_{i}'} for i in range(skip, min(skip + count, total))]
+        return {'entity': 'collection', 'count': len(items), 'items': items}
+    return callback
+
+
+class TestClientPagination(ClientTestCase):
+
+    def setUp(self):
+        super(TestClientPagination, self).setUp()
+        self.base_url = f'{self.base_url}/payments'
+
+    def add_collection(self, url, total):
+        serve = paged_collection(total)
+
+        def callback(request):
+            query = parse_qs(urlparse(request.url).query)
+            return 200, {}, json.dumps(serve(query))
+
+        responses.add_callback(responses.GET, url, callback=callback)
+
+    @responses.activate
+    def test_iter_all_walks_every_page(self):
+        self.add_collection(self.base_url, 250)
+        ids = [p['id'] for p in self.client.payment.iter_all(page_size=100)]
+        self.assertEqual(ids, [f'pay_{i}' for i in range(250)])
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_iter_all_passes_filters(self):
+        self.add_collection(self.base_url, 5)
+        list(self.client.payment.iter_all({'from': 1400000000, 'to': 1500000000}))
+        query = parse_qs(urlparse(responses.calls[0].request.url).query)
+        self.assertEqual(query['from'], ['1400000000'])
+        self.assertEqual(query['to'], ['1500000000'])
+        self.assertEqual(query['count'], ['100'])
+        self.assertEqual(query['skip'], ['0'])
+
+    @responses.activate
+    def test_iter_all_is_lazy(self):
+        self.add_collection(self.base_url, 1000)
+        payments = self.client.payment.iter_all(page_size=10)
+        self.assertEqual(len(responses.calls), 0)
+        for _ in range(15):
+            next(payments)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_iter_all_with_prefetch(self):
+        self.add_collection(self.base_url, 95)
+        ids = [p['id'] for p in self.client.payment.iter_all(page_size=10, prefetch=True)]
+        self.assertEqual(ids, [f'pay_{i}' for i in range(95)])
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_iter_all_keeps_transfer_filters(self):
+        url = f'{self.base_url}/fake_payment_id/transfers'
+        self.add_collection(url, 150)
+        transfers = list(self.client.transfer.iter_all({'payment_id': 'fake_payment_id'}))
+        self.assertEqual(len(transfers), 150)
+
+    @responses.activate
+    def test_iter_all_of_nested_listings(self):
+        v1_url = self.base_url.rsplit('/', 1)[0]
+        self.add_collection(f'{v1_url}/customers/cust_1/tokens', 120)
+        self.add_collection(
+            f"{v1_url.rsplit('/', 1)[0]}/v2/accounts/acc_1/stakeholders", 30)
+        tokens = list(self.client.token.iter_all('cust_1', page_size=50))
+        self.assertEqual(len(tokens), 120)
+        stakeholders = list(self.client.stakeholder.iter_all('acc_1', {'skip': 10}))
+        self.assertEqual(len(stakeholders), 20)
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClientPagination(unittest.IsolatedAsyncioTestCase):
+
+    async def test_aiter_all(self):
+        serve = paged_collection(45)
+
+        def payload(handler):
+            return serve(parse_qs(urlparse(handler.path).query))
+
+        with StubServer({('GET', '/v1/orders'): (200, payload)}) as server:
+            async with razorpay.AsyncClient(auth=('key_id', 'key_secret'),
+                                            base_url=server.url) as client:
+                for prefetch in (False, True):
+                    ids = [o['id'] async for o in client.order.aiter_all(
+                        page_size=10, prefetch=prefetch)]
+                    self.assertEqual(ids, [f'pay_{i}' for i in range(45)])
+
+    async def test_aiter_report(self):
+        def payload(handler):
+            query = parse_qs(urlparse(handler.path).query)
+            skip = int(query['skip'][0])
+            items = [{'entity_id': f'pay_{i}', 'type': 'payment'}
+                     for i in range(skip, min(skip + int(query['count'][0]), 15))]
+            return {'entity': 'collection', 'count': len(items), 'items': items}
+
+        with StubServer({('GET', '/v1/settlements/recon/combined'): (200, payload)}) as server:
+            async with razorpay.AsyncClient(auth=('key_id', 'key_secret'),
+                                            base_url=server.url) as client:
+                rows = [row.entity_id async for row in client.settlement.aiter_report(
+                    {'year': 2024, 'month': 2, 'day': 1}, page_size=10)]
+        self.assertEqual(rows, [f'pay_{i}' for i in range(15)])
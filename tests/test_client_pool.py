@@ -0,0 +1,80 @@
+# Standard library imports
+import socket
+import unittest
+
+# Other third-party library imports
+import requests
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.adapters import RazorpayAdapter
+
+# Razorpay SDK local imports
+from .helpers import StubServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TestClientPool(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubServer({('GET', '/v1/payments/pay_1'): (200, {'id': 'pay_1'})})
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_pool_options(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'), pool_maxsize=64,
+                                 pool_block=True)
+        adapter = client.session.get_adapter('https://api.razorpay.com')
+        self.assertIsInstance(adapter, RazorpayAdapter)
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertTrue(adapter._pool_block)
+
+    def test_tcp_keepalive(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'), tcp_keepalive=30)
+        adapter = client.session.get_adapter('https://api.razorpay.com')
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options)
+
+    def test_custom_session_is_left_alone(self):
+        session = requests.Session()
+        razorpay.Client(session=session, auth=('key_id', 'key_secret'))
+        adapter = session.get_adapter('https://api.razorpay.com')
+        self.assertNotIsInstance(adapter, RazorpayAdapter)
+
+    def test_warmup_opens_reusable_connections(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'), base_url=self.server.url,
+                                 pool_maxsize=4)
+        self.assertEqual(client.warmup(), 4)
+        self.assertEqual(len(self.server.ports), 4)
+        warm_ports = set(self.server.ports)
+        for _ in range(8):
+            client.payment.fetch('pay_1')
+        self.assertEqual(self.server.ports, warm_ports)
+
+    def test_warmup_is_limited_to_the_pool_size(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'), base_url=self.server.url,
+                                 pool_maxsize=2, pool_block=True)
+        self.assertEqual(client.warmup(3), 2)
+        self.assertEqual(client.payment.fetch('pay_1'), {'id': 'pay_1'})
+
+    def test_warmup_failure_is_not_raised(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'),
+                                 base_url='http://127.0.0.1:1')
+        self.assertEqual(client.warmup(2), 0)
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClientPool(unittest.IsolatedAsyncioTestCase):
+
+    async def test_warmup(self):
+        with StubServer({('GET', '/v1/payments/pay_1'): (200, {'id': 'pay_1'})}) as server:
+            async with razorpay.AsyncClient(auth=('key_id', 'key_secret'),
+                                            base_url=server.url, pool_maxsize=3) as client:
+                self.assertEqual(await client.warmup(), 3)
+                warm_ports = set(server.ports)
+                self.assertEqual(len(warm_ports), 3)
+                await client.payment.fetch('pay_1')
+                self.assertEqual(server.ports, warm_ports)
@@ -0,0 +1,48 @@
+# Standard library imports
+import threading
+import unittest
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.client import RESOURCE_CLASSES, UTILITY_CLASSES
+
+
+class TestClientResources(unittest.TestCase):
+
+    def setUp(self):
+        self.client = razorpay.Client(auth=('key_id', 'key_secret'))
+
+    def test_resources_are_created_on_first_access(self):
+        self.assertNotIn('payment', vars(self.client))
+        payment = self.client.payment
+        self.assertIsInstance(payment, razorpay.Payment)
+        self.assertIs(payment.client, self.client)
+        self.assertIs(vars(self.client)['payment'], payment)
+        self.assertIs(self.client.payment, payment)
+        self.assertNotIn('order', vars(self.client))
+
+    def test_every_resource_is_available(self):
+        for name, klass in {**RESOURCE_CLASSES, **UTILITY_CLASSES}.items():
+            self.assertIsInstance(getattr(self.client, name), klass)
+        self.assertIn('device_activity', dir(self.client))
+        self.assertIn('utility', dir(self.client))
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.client.not_a_resource
+        self.assertFalse(hasattr(self.client, 'not_a_resource'))
+
+    def test_concurrent_first_access_returns_one_instance(self):
+        seen = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            seen.append(self.client.order)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(order) for order in seen}), 1)
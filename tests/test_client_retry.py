@@ -0,0 +1,161 @@
+# Standard library imports
+import json
+from unittest import mock
+
+# Other third-party library imports
+import requests
+import responses
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.client import IDEMPOTENCY_HEADER, retry_after
+from razorpay.errors import BadRequestError, ServerError
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase, mock_file
+
+SERVER_ERROR = json.dumps({'error': {'code': 'SERVER_ERROR', 'description': 'down'}})
+
+
+class TestClientRetry(ClientTestCase):
+
+    def setUp(self):
+        super(TestClientRetry, self).setUp()
+        self.client.enable_retry(True)
+        self.payment = json.loads(mock_file('fake_payment'))
+        self.url = f'{self.base_url}/payments/{self.payment_id}'
+        sleep_patch = mock.patch('razorpay.client.time.sleep')
+        self.sleep = sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+    @responses.activate
+    def test_retries_server_errors(self):
+        responses.add(responses.GET, self.url, status=502, body=SERVER_ERROR)
+        responses.add(responses.GET, self.url, status=503, body=SERVER_ERROR)
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        self.assertEqual(self.client.payment.fetch(self.payment_id), self.payment)
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    @responses.activate
+    def test_honours_retry_after(self):
+        responses.add(responses.GET, self.url, status=429, body=SERVER_ERROR,
+                      headers={'Retry-After': '7'})
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        self.client.payment.fetch(self.payment_id)
+        self.sleep.assert_called_once_with(7.0)
+
+    @responses.activate
+    def test_retry_after_is_capped(self):
+        responses.add(responses.GET, self.url, status=503, body=SERVER_ERROR,
+                      headers={'Retry-After': '86400'})
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        self.client.payment.fetch(self.payment_id)
+        self.sleep.assert_called_once_with(self.client.max_delay)
+
+    @responses.activate
+    def test_infinite_retry_after_uses_backoff(self):
+        responses.add(responses.GET, self.url, status=503, body=SERVER_ERROR,
+                      headers={'Retry-After': 'inf'})
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        self.client.payment.fetch(self.payment_id)
+        [delay], _ = self.sleep.call_args
+        self.assertLessEqual(delay, self.client.max_delay)
+
+    @responses.activate
+    def test_retry_time_budget(self):
+        client = razorpay.Client(auth=('key_id', 'key_secret'), max_retry_time=5)
+        client.enable_retry(True)
+        responses.add(responses.GET, self.url, status=503, body=SERVER_ERROR,
+                      headers={'Retry-After': '10'})
+        with self.assertRaises(ServerError):
+            client.payment.fetch(self.payment_id)
+        self.assertEqual(len(responses.calls), 1)
+        self.sleep.assert_not_called()
+
+    @responses.activate
+    def test_gives_up_after_max_retries(self):
+        responses.add(responses.GET, self.url, status=500, body=SERVER_ERROR)
+        with self.assertRaises(ServerError):
+            self.client.payment.fetch(self.payment_id)
+        self.assertEqual(len(responses.calls), self.client.max_retries)
+
+    @responses.activate
+    def test_client_errors_are_not_retried(self):
+        responses.add(responses.GET, self.url, status=400, json={
+            'error': {'code': 'BAD_REQUEST_ERROR', 'description': 'bad'}})
+        with self.assertRaises(BadRequestError):
+            self.client.payment.fetch(self.payment_id)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_status_retry_disabled(self):
+        self.client.enable_retry(False)
+        responses.add(responses.GET, self.url, status=503, body=SERVER_ERROR)
+        with self.assertRaises(ServerError):
+            self.client.payment.fetch(self.payment_id)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_connection_errors_are_retried(self):
+        responses.add(responses.GET, self.url,
+                      body=requests.exceptions.ConnectionError('reset'))
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        self.assertEqual(self.client.payment.fetch(self.payment_id), self.payment)
+        self.assertEqual(self.sleep.call_count, 1)
+
+    @responses.activate
+    def test_idempotency_key_is_kept_across_attempts(self):
+        url = f'{self.url}/capture'
+        responses.add(responses.POST, url, status=503, body=SERVER_ERROR)
+        responses.add(responses.POST, url, status=200, json=self.payment)
+        self.client.payment.capture(self.payment_id, 1000)
+        keys = [call.request.headers[IDEMPOTENCY_HEADER] for call in responses.calls]
+        self.assertEqual(len(keys), 2)
+        self.assertEqual(keys[0], keys[1])
+
+        responses.calls.reset()
+        responses.add(responses.POST, url, status=200, json=self.payment)
+        self.client.payment.capture(self.payment_id, 1000)
+        self.assertNotEqual(responses.calls[0].request.headers[IDEMPOTENCY_HEADER], keys[0])
+
+    @responses.activate
+    def test_shared_headers_get_a_key_per_call(self):
+        url = f'{self.base_url}/orders'
+        responses.add(responses.POST, url, status=200, json={'id': 'order_1'})
+        headers = {'X-Trace': 'abc'}
+        self.client.order.create({'amount': 100}, headers=headers)
+        self.client.order.create({'amount': 200}, headers=headers)
+        keys = {call.request.headers[IDEMPOTENCY_HEADER] for call in responses.calls}
+        self.assertEqual(len(keys), 2)
+        self.assertNotIn(IDEMPOTENCY_HEADER, headers)
+        self.assertEqual(responses.calls[1].request.headers['X-Trace'], 'abc')
+
+    @responses.activate
+    def test_explicit_idempotency_key(self):
+        url = f'{self.url}/capture'
+        responses.add(responses.POST, url, status=200, json=self.payment)
+        self.client.enable_retry(False)
+        self.client.payment.capture(self.payment_id, 1000, idempotency_key='capture-1')
+        self.assertEqual(responses.calls[0].request.headers[IDEMPOTENCY_HEADER], 'capture-1')
+
+    @responses.activate
+    def test_no_idempotency_key_without_retries(self):
+        self.client.enable_retry(False)
+        responses.add(responses.GET, self.url, status=200, json=self.payment)
+        responses.add(responses.POST, f'{self.url}/capture', status=200, json=self.payment)
+        self.client.payment.fetch(self.payment_id)
+        self.client.payment.capture(self.payment_id, 1000)
+        for call in responses.calls:
+            self.assertNotIn(IDEMPOTENCY_HEADER, call.request.headers)
+
+    def test_retry_after_parsing(self):
+        def parse(value):
+            return retry_after(mock.Mock(headers={'Retry-After': value} if value else {}))
+
+        self.assertIsNone(parse(None))
+        self.assertEqual(parse('3'), 3.0)
+        self.assertEqual(parse('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse('soon'))
+        self.assertIsNone(parse('inf'))
+        self.assertIsNone(parse('nan'))
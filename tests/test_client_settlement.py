@@ -1,10 +1,19 @@
 import json
+from urllib.parse import parse_qs, urlparse
 
 import responses
 
+from razorpay.resources.settlement import ReconRecord
+
 from .helpers import ClientTestCase, mock_file
 
 
+def recon_row(day, index):
+    return {'entity_id': f'pay_{day}_{index}', 'type': 'payment', 'amount': 1000,
+            'credit': 976, 'debit': 0, 'currency': 'INR', 'settled': True,
+            'settlement_id': f'setl_{day}', 'method': 'upi', 'notes': {'n': index}}
+
+
 class TestClientSettlement(ClientTestCase):
 
     def setUp(self):
@@ -74,4 +83,60 @@ class TestClientSettlement(ClientTestCase):
         url = "{}/ondemand/{}".format(self.base_url, 'fake_settlement_id')
         responses.add(responses.GET, url, status=200, body=json.dumps(result),
                       match_querystring=True)
-        self.assertEqual(self.client.settlement.fetch_ondemand_settlement_id('fake_settlement_id'), result)
\ No newline at end of file
+        self.assertEqual(self.client.settlement.fetch_ondemand_settlement_id('fake_settlement_id'), result)
+
+    def add_report(self, rows_per_day):
+        def callback(request):
+            query = {k: int(v[0]) for k, v in parse_qs(urlparse(request.url).query).items()}
+            rows = [recon_row(query['day'], i) for i in range(rows_per_day.get(query['day'], 0))]
+            items = rows[query['skip']:query['skip'] + query['count']]
+            return 200, {}, json.dumps({'entity': 'collection', 'count': len(items),
+                                        'items': items})
+        responses.add_callback(responses.GET, f'{self.base_url}/recon/combined',
+                               callback=callback)
+
+    def report_queries(self):
+        return [{k: int(v[0]) for k, v in parse_qs(urlparse(call.request.url).query).items()}
+                for call in responses.calls]
+
+    @responses.activate
+    def test_settlement_iter_report_day(self):
+        self.add_report({5: 25})
+        rows = list(self.client.settlement.iter_report(
+            {'year': 2024, 'month': 2, 'day': 5}, page_size=10))
+        self.assertEqual([row.entity_id for row in rows], [f'pay_5_{i}' for i in range(25)])
+        self.assertEqual([(q['day'], q['count'], q['skip']) for q in self.report_queries()],
+                         [(5, 10, 0), (5, 10, 10), (5, 10, 20)])
+
+    @responses.activate
+    def test_settlement_iter_report_month(self):
+        self.add_report({1: 3, 29: 100})
+        rows = list(self.client.settlement.iter_report(
+            {'year': 2024, 'month': 2}, records=False))
+        self.assertEqual(len(rows), 103)
+        self.assertEqual(rows[0], recon_row(1, 0))
+        queries = self.report_queries()
+        # Every day of February 2024, with a second page for the full one
+        self.assertEqual([q['day'] for q in queries], list(range(1, 30)) + [29])
+        self.assertEqual(queries[-1]['skip'], 100)
+
+    def test_recon_record(self):
+        row = dict(recon_row(1, 0), unknown_column='x')
+        record = ReconRecord(row)
+        self.assertEqual(record.amount, 1000)
+        self.assertEqual(record['settlement_id'], 'setl_1')
+        self.assertEqual(record.get('fee'), None)
+        self.assertEqual(record.fee, None)
+        self.assertEqual(record.get('unknown_column'), 'x')
+        self.assertEqual(record.get('missing', 0), 0)
+        # Known columns absent from the row behave like missing keys
+        self.assertEqual(record.get('fee', 0), 0)
+        self.assertEqual(ReconRecord(dict(row, fee=None)).get('fee', 0), None)
+        with self.assertRaises(KeyError):
+            record['missing']
+        with self.assertRaises(KeyError):
+            record['fee']
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual(record.to_dict(), row)
+        self.assertEqual(record, ReconRecord(row))
+        self.assertIs(record.method, ReconRecord(recon_row(2, 1)).method)
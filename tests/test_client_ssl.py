@@ -0,0 +1,85 @@
+# Standard library imports
+import socket
+import ssl
+import unittest
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.adapters import ResumingSSLContext, shared_ssl_context
+from razorpay.client import CERT_PATH
+
+# Razorpay SDK local imports
+from .helpers import CERT_FILE, StubServer
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def trusting_context():
+    context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_verify_locations(cafile=CERT_FILE)
+    return context
+
+
+class TestClientSSL(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubServer({('GET', '/v1/payments/pay_1'): (200, {'id': 'pay_1'})},
+                                 tls=True)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+
+    def test_context_is_shared_between_clients(self):
+        first = razorpay.Client(auth=('key_a', 'secret'))
+        second = razorpay.Client(auth=('key_b', 'secret'))
+        self.assertIs(first.ssl_context, second.ssl_context)
+        self.assertIs(first.ssl_context, shared_ssl_context(CERT_PATH))
+        adapter = first.session.get_adapter('https://api.razorpay.com')
+        self.assertIs(adapter.ssl_context, first.ssl_context)
+
+    def test_requests_use_preloaded_context(self):
+        context = trusting_context()
+        client = razorpay.Client(auth=('key_id', 'secret'), base_url=self.server.url,
+                                 ssl_context=context)
+        self.assertEqual(client.payment.fetch('pay_1'), {'id': 'pay_1'})
+        adapter = client.session.get_adapter(self.server.url)
+        pool = adapter.poolmanager.connection_from_url(self.server.url)
+        # No CA bundle is loaded per connection
+        self.assertIsNone(pool.ca_certs)
+        self.assertEqual(len(context.get_ca_certs()), 1)
+
+    def test_untrusted_certificate_is_rejected(self):
+        client = razorpay.Client(auth=('key_id', 'secret'), base_url=self.server.url)
+        with self.assertRaises(Exception) as error:
+            client.payment.fetch('pay_1')
+        self.assertIn('CERTIFICATE_VERIFY_FAILED', str(error.exception))
+
+    def test_tls_sessions_are_resumed(self):
+        context = trusting_context()
+        port = int(self.server.url.rsplit(':', 1)[1])
+        reused = []
+        for _ in range(3):
+            with socket.create_connection(('127.0.0.1', port)) as sock:
+                with context.wrap_socket(sock, server_hostname='localhost') as tls:
+                    tls.sendall(b'GET /v1/payments/pay_1 HTTP/1.1\r\nHost: localhost\r\n'
+                                b'Connection: close\r\n\r\n')
+                    while tls.recv(4096):
+                        pass
+                    reused.append(tls.session_reused)
+                    # Keep the connection referenced until its ticket is taken
+                    if len(reused) < 3:
+                        context._session_for('localhost')
+        self.assertEqual(reused, [False, True, True])
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClientSSL(unittest.IsolatedAsyncioTestCase):
+
+    async def test_async_client_uses_ssl_context(self):
+        with StubServer({('GET', '/v1/payments/pay_1'): (200, {'id': 'pay_1'})},
+                        tls=True) as server:
+            async with razorpay.AsyncClient(auth=('key_id', 'secret'), base_url=server.url,
+                                            ssl_context=trusting_context()) as client:
+                self.assertEqual(await client.payment.fetch('pay_1'), {'id': 'pay_1'})
@@ -1,5 +1,9 @@
+import unittest
+from unittest import mock
+
 import responses
 
+from razorpay import Utility, WebhookKeyring, WebhookVerifier
 from razorpay.errors import SignatureVerificationError
 
 from .helpers import ClientTestCase, mock_file
@@ -85,3 +89,173 @@ class TestClientValidator(ClientTestCase):
             body,
             sig,
             secret)
+
+
+class TestWebhookVerifier(unittest.TestCase):
+
+    def setUp(self):
+        self.secret = 'key_secret'
+        self.sig = 'd60e67fd884556c045e9be7dad57903e33efc7172c17c6e3ef77db42d2b366e9'
+        self.body = mock_file('fake_payment_authorized_webhook')
+        self.verifier = WebhookVerifier(self.secret)
+
+    def test_verify_str_bytes_and_memoryview_bodies(self):
+        raw = self.body.encode('utf-8')
+        for body in (self.body, raw, bytearray(raw), memoryview(raw)):
+            self.assertTrue(self.verifier.is_valid(body, self.sig))
+            self.assertTrue(self.verifier.verify(body, self.sig))
+
+    def test_signature_as_bytes(self):
+        self.assertTrue(self.verifier.is_valid(self.body, self.sig.encode()))
+
+    def test_matches_utility(self):
+        utility = Utility()
+        self.assertTrue(utility.verify_webhook_signature(self.body, self.sig, self.secret))
+        self.assertEqual(
+            self.verifier.digest(self.body).hex(),
+            self.sig)
+
+    def test_invalid_signatures(self):
+        for sig in ('', 'test_signature', self.sig[:-2], 'zz' + self.sig[2:],
+                    self.sig[:-1] + '0', b'\xff' * 64, None, 123):
+            self.assertFalse(self.verifier.is_valid(self.body, sig))
+            self.assertRaises(
+                SignatureVerificationError, self.verifier.verify, self.body, sig)
+
+    def test_wrong_secret(self):
+        verifier = WebhookVerifier(b'other_secret')
+        self.assertFalse(verifier.is_valid(self.body, self.sig))
+
+    def test_verifier_is_reusable(self):
+        self.assertFalse(self.verifier.is_valid('{}', self.sig))
+        self.assertTrue(self.verifier.is_valid(self.body, self.sig))
+        self.assertTrue(self.verifier.is_valid(self.body, self.sig))
+
+
+class TestBatchVerification(ClientTestCase):
+
+    def setUp(self):
+        super(TestBatchVerification, self).setUp()
+        self.body = mock_file('fake_payment_authorized_webhook')
+        self.sig = 'd60e67fd884556c045e9be7dad57903e33efc7172c17c6e3ef77db42d2b366e9'
+        self.webhooks = [
+            (self.body, self.sig, 'key_secret'),
+            (self.body.encode(), self.sig, 'key_secret'),
+            (self.body, self.sig, 'other_secret'),
+            ('{}', self.sig, 'key_secret'),
+            (self.body, 'test_signature', 'key_secret'),
+        ]
+        self.expected = [True, True, False, False, False]
+
+    def test_verify_webhook_signatures(self):
+        self.assertEqual(
+            self.client.utility.verify_webhook_signatures(iter(self.webhooks)),
+            self.expected)
+
+    def test_verify_webhook_signatures_in_pools(self):
+        for pool in ('thread', 'process'):
+            self.assertEqual(
+                self.client.utility.verify_webhook_signatures(
+                    self.webhooks * 3, pool=pool, max_workers=2, chunk_size=2),
+                self.expected * 3)
+
+    def test_unsupported_pool(self):
+        with self.assertRaises(ValueError):
+            self.client.utility.verify_webhook_signatures(self.webhooks, pool='fiber')
+
+    def test_verify_checkout_signatures(self):
+        items = [
+            {
+                'razorpay_order_id': 'fake_order_id',
+                'razorpay_payment_id': 'fake_payment_id',
+                'razorpay_signature': 'b2335e3b0801106b84a7faff035df56ecffde06918c9ddd1f0fafbb37a51cc89',
+            },
+            {
+                'razorpay_subscription_id': 'sub_ID6MOhgkcoHj9I',
+                'razorpay_payment_id': 'pay_IDZNwZZFtnjyym',
+                'razorpay_signature': '601f383334975c714c91a7d97dd723eb56520318355863dcf3821c0d07a17693',
+                'secret': 'EnLs21M47BllR3X8PSFtjtbd',
+            },
+            {
+                'razorpay_payment_id': 'pay_IH3d0ara9bSsjQ',
+                'payment_link_id': 'plink_IH3cNucfVEgV68',
+                'payment_link_reference_id': 'TSsd1989',
+                'payment_link_status': 'paid',
+                'razorpay_signature': '07ae18789e35093e51d0a491eb9922646f3f82773547e5b0f67ee3f2d3bf7d5b',
+                'secret': 'EnLs21M47BllR3X8PSFtjtbd',
+            },
+            {
+                'razorpay_order_id': 'fake_order_id',
+                'razorpay_payment_id': 'fake_payment_id',
+                'razorpay_signature': 'test_signature',
+            },
+            {'razorpay_order_id': 'fake_order_id', 'razorpay_signature': 'test_signature'},
+            {'razorpay_payment_id': 'pay_IH3d0ara9bSsjQ'},
+        ]
+        expected = [True, True, True, False, False, False]
+        self.assertEqual(self.client.utility.verify_checkout_signatures(items), expected)
+        self.assertEqual(
+            self.client.utility.verify_checkout_signatures(
+                items, pool='process', max_workers=2, chunk_size=4),
+            expected)
+
+
+class TestWebhookKeyring(unittest.TestCase):
+
+    def setUp(self):
+        self.body = mock_file('fake_payment_authorized_webhook')
+        self.sig = 'd60e67fd884556c045e9be7dad57903e33efc7172c17c6e3ef77db42d2b366e9'
+        self.keyring = WebhookKeyring({'old': 'old_secret', 'new': 'key_secret'})
+
+    def count_digests(self):
+        return mock.patch.object(
+            WebhookVerifier, 'digest', autospec=True, side_effect=WebhookVerifier.digest)
+
+    def test_match_reports_key(self):
+        self.assertEqual(self.keyring.key_ids, ['old', 'new'])
+        self.assertEqual(self.keyring.match(self.body, self.sig), 'new')
+        self.assertEqual(self.keyring.verify(self.body.encode(), self.sig), 'new')
+        self.assertTrue(self.keyring.is_valid(memoryview(self.body.encode()), self.sig))
+
+    def test_sequence_of_secrets(self):
+        keyring = WebhookKeyring(['old_secret', 'key_secret'])
+        self.assertEqual(keyring.match(self.body, self.sig), 1)
+
+    def test_no_match(self):
+        self.assertIsNone(self.keyring.match(self.body, 'test_signature'))
+        self.assertIsNone(self.keyring.match(self.body, None))
+        self.assertFalse(self.keyring.is_valid(self.body, None, account_id='acc_1'))
+        self.assertRaises(
+            SignatureVerificationError, self.keyring.verify, self.body, None)
+        self.assertIsNone(self.keyring.match('{}', self.sig))
+        self.assertFalse(self.keyring.is_valid('{}', self.sig))
+        self.assertRaises(
+            SignatureVerificationError, self.keyring.verify, '{}', self.sig)
+
+    def test_last_match_is_tried_first(self):
+        with self.count_digests() as digest:
+            self.keyring.match(self.body, self.sig, account_id='acc_1')
+            self.assertEqual(digest.call_count, 2)
+            digest.reset_mock()
+            self.assertEqual(self.keyring.match(self.body, self.sig, account_id='acc_1'), 'new')
+            self.assertEqual(digest.call_count, 1)
+            digest.reset_mock()
+            # Other accounts have no cached key yet
+            self.keyring.match(self.body, self.sig, account_id='acc_2')
+            self.assertEqual(digest.call_count, 2)
+
+    def test_falls_back_when_cached_key_stops_matching(self):
+        self.keyring.match(self.body, self.sig, account_id='acc_1')
+        old_sig = WebhookVerifier('old_secret').digest(self.body).hex()
+        self.assertEqual(self.keyring.match(self.body, old_sig, account_id='acc_1'), 'old')
+        with self.count_digests() as digest:
+            self.assertEqual(self.keyring.match(self.body, old_sig, account_id='acc_1'), 'old')
+            self.assertEqual(digest.call_count, 1)
+
+    def test_cache_is_bounded(self):
+        keyring = WebhookKeyring({'old': 'old_secret', 'new': 'key_secret'}, cache_size=2)
+        for account_id in ('acc_1', 'acc_2', 'acc_3'):
+            keyring.match(self.body, self.sig, account_id=account_id)
+        with self.count_digests() as digest:
+            keyring.match(self.body, self.sig, account_id='acc_1')
+            self.assertEqual(digest.call_count, 2)
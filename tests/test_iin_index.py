@@ -0,0 +1,127 @@
+# Standard library imports
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay import IinIndex
+
+from .helpers import ClientTestCase, mock_file
+
+
+class TestIinIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = IinIndex()
+        self.index.load(['512967', '401704', '123512967'], flow='otp')
+        self.index.load(['401704', '607389'], sub_type='business')
+
+    def test_lookup_by_card_number(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(
+            self.index.lookup('4017 0400 0000 0000'),
+            {'iin': '401704', 'flows': ('otp',), 'sub_types': ('business',)})
+        self.assertEqual(self.index.lookup('5129670000000000'),
+                         {'iin': '512967', 'flows': ('otp',)})
+        self.assertEqual(self.index.lookup(607389),
+                         {'iin': '607389', 'sub_types': ('business',)})
+        self.assertIsNone(self.index.lookup('4111111111111111'))
+        self.assertIsNone(self.index.lookup('5129'))
+        self.assertIsNone(self.index.lookup(''))
+
+    def test_longest_prefix_wins(self):
+        self.index.load(['123512'], sub_type='business')
+        self.assertEqual(self.index.lookup('1235129670000000')['iin'], '123512967')
+        self.assertEqual(self.index.lookup('1235120000000000')['iin'], '123512')
+
+    def test_lookups_return_copies(self):
+        self.index.lookup('512967')['flows'] = 'changed'
+        self.assertEqual(self.index.lookup('512967')['flows'], ('otp',))
+
+    def test_listings_sharing_a_property(self):
+        self.index.load(['512967', '411111'], flow='rupay')
+        self.assertEqual(self.index.lookup('512967')['flows'], ('otp', 'rupay'))
+        self.assertEqual(self.index.lookup('411111')['flows'], ('rupay',))
+
+    def test_reloading_a_listing_replaces_it(self):
+        self.assertFalse(self.index.load(['401704', '607389'], sub_type='business'))
+        self.assertTrue(self.index.load(['607389', '652203'], sub_type='business'))
+        self.assertEqual(self.index.lookup('401704'), {'iin': '401704', 'flows': ('otp',)})
+        self.assertIsNotNone(self.index.lookup('652203'))
+
+    def test_entities(self):
+        entity = json.loads(mock_file('fake_iin'))
+        self.index.load_entities([entity])
+        self.assertEqual(self.index.lookup('4123450000000000'), entity)
+
+    def test_snapshot(self):
+        self.index.load_entities([json.loads(mock_file('fake_iin'))])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'iins.json')
+            self.index.save_snapshot(path)
+            index = IinIndex()
+            index.load_snapshot(path)
+        for number in ('512967', '401704', '123512967', '607389', '412345'):
+            self.assertEqual(index.lookup(number), self.index.lookup(number))
+
+    def test_snapshot_version(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'iins.json')
+            with open(path, 'w') as f:
+                json.dump({'version': 99}, f)
+            with self.assertRaises(ValueError):
+                IinIndex().load_snapshot(path)
+
+
+class TestIinIndexWithClient(ClientTestCase):
+
+    def setUp(self):
+        super(TestIinIndexWithClient, self).setUp()
+        self.index = IinIndex(self.client)
+        self.list_url = f'{self.base_url}/iins/list'
+
+    def add_listings(self, otp, business):
+        responses.add(responses.GET, f'{self.list_url}?flow=otp', status=200,
+                      body=json.dumps({'count': len(otp), 'iins': otp}),
+                      match_querystring=True)
+        responses.add(responses.GET, f'{self.list_url}?sub_type=business', status=200,
+                      body=json.dumps({'count': len(business), 'iins': business}),
+                      match_querystring=True)
+
+    @responses.activate
+    def test_load_from_api(self):
+        self.add_listings(['512967', '401704'], ['401704'])
+        self.assertEqual(self.index.load_from_api(), 2)
+        self.assertEqual(
+            self.index.lookup('401704'),
+            {'iin': '401704', 'flows': ('otp',), 'sub_types': ('business',)})
+        self.assertEqual(self.index.load_from_api(), 0)
+
+    @responses.activate
+    def test_fetch_falls_back_to_the_api(self):
+        self.index.load(['412345'], flow='otp')
+        entity = json.loads(mock_file('fake_iin'))
+        responses.add(responses.GET, f'{self.base_url}/iins/412345', status=200,
+                      body=json.dumps(entity))
+        self.assertEqual(self.index.fetch('412345'), {**entity, 'flows': ('otp',)})
+        self.assertEqual(self.index.fetch('412345'), {**entity, 'flows': ('otp',)})
+        self.assertEqual(len(responses.calls), 1)
+
+    def test_background_refresh(self):
+        refreshed = threading.Event()
+
+        def load_from_api(queries):
+            refreshed.set()
+            raise ValueError('unavailable')
+
+        with mock.patch.object(self.index, 'load_from_api', side_effect=load_from_api):
+            with self.assertLogs('razorpay.iin_index', 'WARNING'):
+                self.index.start_refresh(0.01)
+                self.assertTrue(refreshed.wait(5))
+                self.index.stop_refresh()
@@ -0,0 +1,66 @@
+# Standard library imports
+import json
+import subprocess
+import sys
+import unittest
+
+# Razorpay SDK imports
+import razorpay
+
+
+def loaded_modules(code):
+    """Run `code` in a fresh interpreter and return the razorpay, requests and httpx modules loaded."""
+    script = (
+        f'{code}\n'
+        'import json, sys\n'
+        'print(json.dumps(sorted(m for m in sys.modules'
+        ' if m.split(".")[0] in ("razorpay", "requests", "httpx"))))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stdout))
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_loads_no_submodules(self):
+        self.assertEqual(loaded_modules('import razorpay'), {'razorpay'})
+
+    def test_resource_loads_only_its_module(self):
+        modules = loaded_modules('import razorpay; razorpay.Payment')
+        self.assertIn('razorpay.resources.payment', modules)
+        self.assertNotIn('razorpay.resources.order', modules)
+        self.assertNotIn('razorpay.client', modules)
+        self.assertNotIn('httpx', modules)
+
+    def test_client_does_not_load_async_client(self):
+        modules = loaded_modules(
+            "import razorpay; razorpay.Client(auth=('key', 'secret')).order"
+        )
+        self.assertIn('requests', modules)
+        self.assertIn('razorpay.resources.order', modules)
+        self.assertNotIn('razorpay.resources.payment', modules)
+        self.assertNotIn('razorpay.async_client', modules)
+
+    def test_exported_names_resolve(self):
+        for name in razorpay.__all__:
+            self.assertIsNotNone(getattr(razorpay, name))
+            self.assertIn(name, dir(razorpay))
+        for name in razorpay.resources.__all__:
+            self.assertIsInstance(getattr(razorpay.resources, name), type)
+
+    def test_submodules_resolve(self):
+        modules = loaded_modules(
+            'import razorpay; razorpay.errors.BadRequestError; razorpay.utility.Utility'
+        )
+        self.assertIn('razorpay.errors', modules)
+        self.assertNotIn('razorpay.client', modules)
+        self.assertTrue(issubclass(razorpay.errors.BadRequestError, Exception))
+        self.assertIs(razorpay.constants.ERROR_CODE, razorpay.ERROR_CODE)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            razorpay.NotAResource
+        with self.assertRaises(ImportError):
+            exec('from razorpay import NotAResource', {})
@@ -0,0 +1,127 @@
+# Standard library imports
+import threading
+import unittest
+
+# Razorpay SDK imports
+from razorpay import PaymentWatcher
+from razorpay.errors import BadRequestError, ServerError
+
+
+class FakeResource:
+
+    def __init__(self, statuses):
+        # Statuses returned by successive fetches of each id, the last one repeats
+        self.statuses = statuses
+        self.fetches = {}
+        self.lock = threading.Lock()
+
+    def fetch(self, entity_id):
+        with self.lock:
+            count = self.fetches[entity_id] = self.fetches.get(entity_id, 0) + 1
+        statuses = self.statuses[entity_id]
+        status = statuses[min(count, len(statuses)) - 1]
+        if isinstance(status, Exception):
+            raise status
+        return {'id': entity_id, 'status': status}
+
+
+class FakeClient:
+
+    def __init__(self, payments=None, orders=None):
+        self.payment = FakeResource(payments or {})
+        self.order = FakeResource(orders or {})
+
+
+class TestPaymentWatcher(unittest.TestCase):
+
+    def make_watcher(self, client, **options):
+        options.setdefault('min_interval', 0.01)
+        options.setdefault('max_interval', 0.05)
+        watcher = PaymentWatcher(client, **options)
+        self.addCleanup(watcher.close)
+        return watcher
+
+    def test_resolves_on_terminal_status(self):
+        client = FakeClient(
+            payments={'pay_1': ['created', 'authorized', 'captured'],
+                      'pay_2': ['authorized', 'failed']},
+            orders={'order_1': ['attempted', 'paid']})
+        watcher = self.make_watcher(client)
+        futures = [watcher.watch(entity_id) for entity_id in ('pay_1', 'pay_2', 'order_1')]
+        self.assertEqual(
+            [future.result(5)['status'] for future in futures], ['captured', 'failed', 'paid'])
+        self.assertEqual(client.payment.fetches, {'pay_1': 3, 'pay_2': 2})
+        self.assertEqual(watcher.pending(), 0)
+        self.assertEqual(watcher.stats()['polls'], 7)
+
+    def test_custom_states_and_callbacks(self):
+        client = FakeClient(payments={'pay_1': ['created', 'authorized', 'captured']})
+        watcher = self.make_watcher(client)
+        done = []
+        future = watcher.watch('pay_1', states={'authorized'}, callback=done.append)
+        self.assertEqual(future.result(5)['status'], 'authorized')
+        self.assertEqual(done, [future])
+
+    def test_same_id_shares_a_future(self):
+        client = FakeClient(payments={'pay_1': ['created']})
+        watcher = self.make_watcher(client, min_interval=10)
+        self.assertIs(watcher.watch('pay_1'), watcher.watch('pay_1'))
+        self.assertEqual(watcher.pending(), 1)
+
+    def test_kind(self):
+        watcher = self.make_watcher(FakeClient(payments={'1': ['captured']}))
+        with self.assertRaises(ValueError):
+            watcher.watch('inv_1')
+        self.assertEqual(watcher.watch('1', kind='payment').result(5)['status'], 'captured')
+
+    def test_webhooks_short_circuit_polling(self):
+        client = FakeClient(payments={'pay_1': ['authorized']})
+        watcher = self.make_watcher(client, min_interval=10)
+        future = watcher.watch('pay_1')
+        watcher.handle_event({'event': 'payment.authorized', 'payload': {
+            'payment': {'entity': {'id': 'pay_1', 'status': 'authorized'}}}})
+        self.assertFalse(future.done())
+        watcher.handle_event({'event': 'payment.captured', 'payload': {
+            'payment': {'entity': {'id': 'pay_1', 'status': 'captured'}}}})
+        self.assertEqual(future.result(0)['status'], 'captured')
+        self.assertEqual(client.payment.fetches, {})
+        self.assertEqual(watcher.stats()['webhooks'], 2)
+        # Unwatched entities are ignored
+        watcher.handle_event({'payload': {'payment': {'entity': {'id': 'pay_2'}}}})
+
+    def test_errors(self):
+        client = FakeClient(payments={
+            'pay_1': [ServerError('unavailable'), 'captured'],
+            'pay_2': [BadRequestError('The id provided does not exist')],
+        })
+        watcher = self.make_watcher(client)
+        with self.assertLogs('razorpay.payment_watcher', 'WARNING'):
+            self.assertEqual(watcher.watch('pay_1').result(5)['status'], 'captured')
+        with self.assertRaises(BadRequestError):
+            watcher.watch('pay_2').result(5)
+        self.assertEqual(watcher.stats()['errors'], 1)
+
+    def test_timeout(self):
+        client = FakeClient(payments={'pay_1': ['authorized']})
+        watcher = self.make_watcher(client, timeout=0.05)
+        with self.assertRaisesRegex(TimeoutError, 'still authorized'):
+            watcher.watch('pay_1').result(5)
+
+    def test_polls_back_off_as_entities_age(self):
+        watcher = self.make_watcher(FakeClient(), min_interval=1, max_interval=60, backoff=0.5)
+        watch = type('Watch', (), {'started_at': 100})
+        self.assertEqual(watcher._next_poll(watch, 100), 101)
+        self.assertEqual(watcher._next_poll(watch, 110), 115)
+        self.assertEqual(watcher._next_poll(watch, 1000), 1060)
+
+    def test_unwatch_and_close(self):
+        client = FakeClient(payments={'pay_1': ['created'], 'pay_2': ['created']})
+        watcher = PaymentWatcher(client, min_interval=0.01)
+        first = watcher.watch('pay_1')
+        second = watcher.watch('pay_2')
+        watcher.unwatch('pay_1')
+        self.assertTrue(first.cancelled())
+        watcher.close()
+        self.assertTrue(second.cancelled())
+        with self.assertRaises(RuntimeError):
+            watcher.watch('pay_3')
@@ -0,0 +1,97 @@
+# Standard library imports
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+import razorpay
+from razorpay.client import endpoint_group
+from razorpay.rate_limiter import FileBackend, MemoryBackend, RateLimiter, take_tokens
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase, mock_file
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_take_tokens(self):
+        level, wait = take_tokens(None, 100.0, rate=2, capacity=4, tokens=1)
+        self.assertEqual((level, wait), (3, 0.0))
+        # Refill is capped at capacity
+        level, wait = take_tokens((3, 100.0), 200.0, rate=2, capacity=4, tokens=1)
+        self.assertEqual((level, wait), (3, 0.0))
+        # Borrowing from the future reports the wait until the token exists
+        level, wait = take_tokens((0, 100.0), 100.0, rate=2, capacity=4, tokens=1)
+        self.assertEqual((level, wait), (-1, 0.5))
+
+    def test_burst_then_throttle(self):
+        limiter = RateLimiter(rate=10, burst=2)
+        waits = [limiter.reserve('key_id') for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.01)
+        self.assertAlmostEqual(waits[3], 0.2, delta=0.01)
+        stats = limiter.stats()
+        self.assertEqual(stats['acquired'], 4)
+        self.assertEqual(stats['throttled'], 2)
+        self.assertAlmostEqual(stats['wait_seconds'], 0.3, delta=0.02)
+
+    def test_buckets_per_key_and_group(self):
+        limiter = RateLimiter(rate=100, group_rates={'payments': 1})
+        self.assertEqual(limiter.reserve('key_a', 'payments'), 0.0)
+        self.assertGreater(limiter.reserve('key_a', 'payments'), 0.9)
+        self.assertEqual(limiter.reserve('key_a', 'orders'), 0.0)
+        self.assertEqual(limiter.reserve('key_b', 'payments'), 0.0)
+
+    def test_memory_backend_is_thread_safe(self):
+        backend = MemoryBackend()
+        waits = []
+
+        def worker():
+            for _ in range(100):
+                waits.append(backend.reserve('bucket', rate=1000, capacity=1))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 800 tokens at 1000/s: the last reservation waits for roughly 0.8s
+        self.assertAlmostEqual(max(waits), 0.8, delta=0.1)
+
+    def test_file_backend_is_shared(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'buckets.json')
+            first = RateLimiter(rate=1, backend=FileBackend(path))
+            second = RateLimiter(rate=1, backend=FileBackend(path))
+            self.assertEqual(first.reserve('key_id'), 0.0)
+            self.assertGreater(second.reserve('key_id'), 0.9)
+            with open(path) as f:
+                self.assertIn('key:key_id', json.load(f))
+
+    def test_endpoint_group(self):
+        self.assertEqual(endpoint_group('/v1/payments/pay_1/capture'), 'payments')
+        self.assertEqual(endpoint_group('/v2/accounts'), 'accounts')
+        self.assertEqual(endpoint_group('/v1/settlements/recon/combined'), 'settlements')
+
+
+class TestClientRateLimiter(ClientTestCase):
+
+    @responses.activate
+    def test_client_waits_for_tokens(self):
+        limiter = razorpay.RateLimiter(rate=1)
+        client = razorpay.Client(auth=('key_id', 'key_secret'), rate_limiter=limiter)
+        payment = json.loads(mock_file('fake_payment'))
+        responses.add(responses.GET, f'{self.base_url}/payments/{self.payment_id}',
+                      status=200, json=payment)
+        with mock.patch('razorpay.rate_limiter.time.sleep') as sleep:
+            client.payment.fetch(self.payment_id)
+            client.payment.fetch(self.payment_id)
+        sleep.assert_called_once()
+        self.assertGreater(sleep.call_args[0][0], 0.9)
+        self.assertEqual(limiter.stats()['throttled'], 1)
@@ -0,0 +1,146 @@
+# Standard library imports
+import json
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+# Other third-party library imports
+import responses
+
+# Razorpay SDK imports
+from razorpay import Reconciler
+
+# Razorpay SDK local imports
+from .helpers import ClientTestCase
+
+# 2024-01-01 00:00 IST
+START = 1704047400
+DAY = 86400
+
+
+def payment(payment_id, amount=1000, captured=True):
+    return {'id': payment_id, 'entity': 'payment', 'amount': amount, 'captured': captured,
+            'created_at': START + 60}
+
+
+def row(entity_id, amount=1000, settlement_id='setl_1', entity_type='payment', settled=True,
+        credit=None, debit=0):
+    return {'entity_id': entity_id, 'type': entity_type, 'amount': amount,
+            'credit': amount if credit is None else credit, 'debit': debit,
+            'settled': settled, 'settlement_id': settlement_id, 'created_at': START + 60}
+
+
+class TestReconciler(unittest.TestCase):
+
+    def mismatches(self, reconciler, entities, rows, settlements=(), chunk_size=2):
+        return sorted((m.kind, m.entity_id, m.expected, m.actual) for m in
+                      reconciler.reconcile(entities, rows, settlements, chunk_size=chunk_size))
+
+    def test_matching_sources(self):
+        reconciler = Reconciler()
+        entities = [payment(f'pay_{i}') for i in range(10)]
+        rows = [row(f'pay_{i}') for i in range(10)]
+        self.assertEqual(self.mismatches(reconciler, entities, rows,
+                                         [{'id': 'setl_1', 'amount': 10000}]), [])
+        stats = reconciler.stats()
+        self.assertEqual((stats['entities'], stats['rows'], stats['matched']), (10, 10, 10))
+        self.assertEqual(stats['pending'], 0)
+        # Pairs are dropped once matched
+        self.assertEqual(stats['peak_pending'], 2)
+
+    def test_mismatches(self):
+        reconciler = Reconciler(amount_tolerance=1)
+        entities = [
+            payment('pay_ok'),
+            payment('pay_unsettled'),
+            payment('pay_pending'),
+            payment('pay_failed', captured=False),
+            payment('pay_drift', amount=1000),
+            payment('pay_rounded', amount=1000),
+            payment('pay_twice'),
+            {'id': 'rfnd_1', 'entity': 'refund', 'amount': 500, 'status': 'processed'},
+        ]
+        rows = [
+            row('pay_ok'),
+            row('pay_pending', settled=False, settlement_id=None),
+            row('pay_drift', amount=900),
+            row('pay_rounded', amount=1001),
+            row('pay_twice'),
+            row('pay_twice', settlement_id='setl_2'),
+            row('pay_unknown'),
+            row('adj_1', entity_type='adjustment', credit=0, debit=25),
+        ]
+        self.assertEqual(self.mismatches(reconciler, entities, rows,
+                                         [{'id': 'setl_1', 'amount': 5000}]), [
+            ('amount_drift', 'pay_drift', 1000, 900),
+            ('double_settled', 'pay_twice', 'setl_1', 'setl_2'),
+            ('missing_entity', 'pay_unknown', None, 1000),
+            ('settlement_drift', 'setl_1', 5000, 4876),
+            ('unsettled', 'pay_pending', 1000, None),
+            ('unsettled', 'pay_unsettled', 1000, None),
+            ('unsettled', 'rfnd_1', 500, None),
+        ])
+        self.assertEqual(reconciler.stats()['mismatches'], {
+            'unsettled': 3, 'double_settled': 1, 'amount_drift': 1,
+            'missing_entity': 1, 'settlement_drift': 1})
+
+    def test_window_ignores_older_rows(self):
+        reconciler = Reconciler(window=(START, START + DAY))
+        older = dict(row('pay_old'), created_at=START - DAY)
+        self.assertEqual(self.mismatches(reconciler, [payment('pay_1')],
+                                         [older, row('pay_1')]), [])
+
+    def test_settled_horizon(self):
+        reconciler = Reconciler(settled_horizon=DAY)
+        entities = [payment(f'pay_{i}') for i in range(4)]
+        rows = [dict(row(f'pay_{i}'), settled_at=START + i * DAY) for i in range(4)]
+        rows += [dict(row('pay_3', settlement_id='setl_2'), settled_at=START + 3 * DAY),
+                 dict(row('pay_0', settlement_id='setl_2'), settled_at=START + 3 * DAY)]
+        # Only the double settlement within the horizon is detected
+        self.assertEqual(self.mismatches(reconciler, entities, rows, chunk_size=1), [
+            ('double_settled', 'pay_3', 'setl_1', 'setl_2'),
+            ('missing_entity', 'pay_0', None, 1000),
+        ])
+        self.assertEqual(reconciler.stats()['settled_ids'], 2)
+
+
+class TestReconcileApi(ClientTestCase):
+
+    def setUp(self):
+        super(TestReconcileApi, self).setUp()
+        self.report_days = []
+
+    def listing(self, items):
+        def serve(request):
+            skip = int(parse_qs(urlparse(request.url).query)['skip'][0])
+            page = items[skip:skip + 2]
+            return 200, {}, json.dumps({'entity': 'collection', 'count': len(page),
+                                        'items': page})
+        return serve
+
+    def serve_report(self, request):
+        query = {k: int(v[0]) for k, v in parse_qs(urlparse(request.url).query).items()}
+        self.report_days.append((query['month'], query['day'], query['skip']))
+        rows = {2: [row('pay_1'), row('pay_2'), row('rfnd_1', 300, entity_type='refund',
+                                                    credit=0, debit=300)],
+                3: [row('pay_3', settlement_id='setl_2')]}.get(query['day'], [])
+        page = rows[query['skip']:query['skip'] + query['count']]
+        return 200, {}, json.dumps({'entity': 'collection', 'count': len(page), 'items': page})
+
+    @responses.activate
+    def test_reconcile_api(self):
+        payments = [payment(f'pay_{i}') for i in range(1, 5)]
+        refunds = [{'id': 'rfnd_1', 'entity': 'refund', 'amount': 300, 'status': 'processed'}]
+        settlements = [{'id': 'setl_1', 'amount': 1700}, {'id': 'setl_2', 'amount': 1000}]
+        for path, items in (('payments', payments), ('refunds', refunds), ('transfers', []),
+                            ('settlements', settlements)):
+            responses.add_callback(responses.GET, f'{self.base_url}/{path}',
+                                   callback=self.listing(items))
+        responses.add_callback(responses.GET, f'{self.base_url}/settlements/recon/combined',
+                               callback=self.serve_report)
+
+        reconciler = Reconciler()
+        mismatches = list(reconciler.reconcile_api(self.client, START, START + DAY,
+                                                   settlement_days=2, page_size=2))
+        self.assertEqual([(m.kind, m.entity_id) for m in mismatches], [('unsettled', 'pay_4')])
+        self.assertEqual(self.report_days,
+                         [(1, 1, 0), (1, 2, 0), (1, 2, 2), (1, 3, 0)])
@@ -0,0 +1,207 @@
+# Standard library imports
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+# Other third-party library imports
+import responses
+
+try:
+    # Other third-party library imports
+    import httpx
+except ImportError:
+    httpx = None
+
+# Razorpay SDK imports
+import razorpay
+from razorpay import CachePolicy, ResponseCache
+from razorpay.codecs import get_codec
+
+from .helpers import ClientTestCase, StubServer, mock_file
+
+NOW = 'razorpay.response_cache.time.monotonic'
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache({'/v1/items/*': CachePolicy(ttl=10, stale_ttl=20)})
+        self.addCleanup(self.cache.close)
+        self.codec = get_codec('json')
+        self.loads = 0
+
+    def load(self, value=None):
+        self.loads += 1
+        return value or {'id': 'item_1', 'version': self.loads}
+
+    def get(self, path='/v1/items/item_1', load=None):
+        return self.cache.get(('key', path), path, load or self.load, self.codec)
+
+    def test_policies(self):
+        self.assertIsNone(self.cache.policy_for('/v1/payments/pay_1'))
+        self.assertEqual(self.cache.policy_for('/v1/items/item_1').ttl, 10)
+        default = ResponseCache()
+        for path in ('/methods', '/v1/payments/downtimes', '/v1/iins/412345',
+                     '/v1/plans/plan_1', '/v1/items/item_1', '/v2/products/payments/tnc'):
+            self.assertIsNotNone(default.policy_for(path), path)
+        self.assertIsNone(default.policy_for('/v1/payments/pay_1'))
+
+    def test_uncached_paths_always_load(self):
+        self.get('/v1/payments/pay_1')
+        self.get('/v1/payments/pay_1')
+        self.assertEqual(self.loads, 2)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_hits_return_copies(self):
+        with mock.patch(NOW, return_value=100):
+            first = self.get()
+            first['version'] = 'changed'
+            self.assertEqual(self.get(), {'id': 'item_1', 'version': 1})
+            self.assertIsNot(self.get(), self.get())
+        self.assertEqual(self.loads, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (3, 1, 1))
+
+    def test_stale_while_revalidate(self):
+        with mock.patch(NOW, return_value=100):
+            self.get()
+        refreshing = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            refreshing.set()
+            release.wait()
+            return self.load()
+
+        with mock.patch(NOW, return_value=115):
+            # Stale responses are served while one request refreshes them
+            self.assertEqual(self.get(load=slow_load)['version'], 1)
+            refreshing.wait()
+            self.assertEqual(self.get(load=slow_load)['version'], 1)
+            release.set()
+            self.cache.close()
+            self.assertEqual(self.get()['version'], 2)
+        self.assertEqual(self.loads, 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats['stale_hits'], stats['refreshes']), (2, 1))
+
+    def test_expired_responses_are_loaded(self):
+        with mock.patch(NOW, return_value=100):
+            self.get()
+        with mock.patch(NOW, return_value=130):
+            self.assertEqual(self.get()['version'], 2)
+
+    def test_failed_refresh(self):
+        with mock.patch(NOW, return_value=100):
+            self.get()
+
+        def failing_load():
+            raise razorpay.errors.ServerError('down')
+
+        with mock.patch(NOW, return_value=115):
+            with self.assertLogs('razorpay.response_cache', 'WARNING'):
+                self.get(load=failing_load)
+                self.cache.close()
+            self.assertEqual(self.cache.stats()['refresh_errors'], 1)
+            # The next stale hit tries again
+            self.get()
+            self.cache.close()
+            self.assertEqual(self.get()['version'], 2)
+
+    def test_lru_eviction_by_count_and_size(self):
+        cache = ResponseCache({'*': CachePolicy(ttl=60)}, max_entries=2)
+        for path in ('/a', '/b', '/a', '/c'):
+            cache.get(path, path, lambda: {'path': path}, self.codec)
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.lookup('/b'), (None, False))
+        self.assertIsNotNone(cache.lookup('/a')[0])
+
+        cache = ResponseCache({'*': CachePolicy(ttl=60)}, max_bytes=100)
+        cache.get('/big', '/big', lambda: {'data': 'x' * 200}, self.codec)
+        cache.get('/1', '/1', lambda: {'data': 'x' * 40}, self.codec)
+        cache.get('/2', '/2', lambda: {'data': 'x' * 40}, self.codec)
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertLessEqual(stats['bytes'], 100)
+
+    def test_invalidate(self):
+        self.get('/v1/items/item_1')
+        self.get('/v1/items/item_2')
+        self.cache.invalidate('/v1/items/item_1')
+        self.assertEqual(self.cache.stats()['entries'], 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+class TestClientResponseCache(ClientTestCase):
+
+    def setUp(self):
+        super(TestClientResponseCache, self).setUp()
+        self.cache = ResponseCache()
+        self.client = razorpay.Client(auth=('key_id', 'key_secret'), response_cache=self.cache)
+        self.item_url = f'{self.base_url}/items/fake_item_id'
+
+    @responses.activate
+    def test_reference_data_is_cached(self):
+        responses.add(responses.GET, self.item_url, status=200, body=mock_file('fake_item'))
+        responses.add(responses.GET, 'https://api.razorpay.com/methods', status=200,
+                      body=json.dumps({'card': True}))
+        for _ in range(3):
+            self.assertEqual(self.client.item.fetch('fake_item_id'),
+                             json.loads(mock_file('fake_item')))
+            self.assertEqual(self.client.payment.fetchPaymentMethods(), {'card': True})
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_other_requests_are_not_cached(self):
+        url = f'{self.base_url}/payments/fake_payment_id'
+        responses.add(responses.GET, url, status=200, body=mock_file('fake_payment'))
+        self.client.payment.fetch('fake_payment_id')
+        self.client.payment.fetch('fake_payment_id')
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_keys_include_params_and_account(self):
+        url = f'{self.base_url}/items/item_1'
+        responses.add(responses.GET, url, status=200, body='{}')
+        self.client.item.fetch('item_1')
+        self.client.item.fetch('item_1', {'expand[]': 'x'})
+        other = razorpay.Client(auth=('other_key', 'secret'), response_cache=self.cache)
+        other.item.fetch('item_1')
+        self.client.item.fetch('item_1')
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_changes_invalidate_cached_responses(self):
+        responses.add(responses.GET, self.item_url, status=200, body=mock_file('fake_item'))
+        responses.add(responses.PATCH, self.item_url, status=200, body=mock_file('fake_item'))
+        self.client.item.fetch('fake_item_id')
+        self.client.item.edit('fake_item_id', {'name': 'Book'})
+        self.client.item.fetch('fake_item_id')
+        self.assertEqual(len(responses.calls), 3)
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClientResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_reference_data_is_cached(self):
+        routes = {('GET', '/v1/items/item_1'): (200, {'id': 'item_1'})}
+        with StubServer(routes) as server:
+            cache = ResponseCache({'/v1/items/*': CachePolicy(ttl=0.2, stale_ttl=60)})
+            async with razorpay.AsyncClient(
+                    auth=('key_id', 'key_secret'), base_url=server.url,
+                    response_cache=cache) as client:
+                for _ in range(3):
+                    self.assertEqual(await client.item.fetch('item_1'), {'id': 'item_1'})
+                self.assertEqual(len(server.requests), 1)
+
+                await asyncio.sleep(0.25)
+                self.assertEqual(await client.item.fetch('item_1'), {'id': 'item_1'})
+                await asyncio.gather(*client._refresh_tasks)
+                self.assertEqual(len(server.requests), 2)
+                self.assertEqual(cache.stats()['stale_hits'], 1)
+                self.assertEqual(cache.stats()['hits'], 2)
+                self.assertEqual(cache.stats()['refreshes'], 1)
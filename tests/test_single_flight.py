@@ -0,0 +1,236 @@
+# Standard library imports
+import asyncio
+import threading
+import time
+import unittest
+
+try:
+    # Other third-party library imports
+    import httpx
+except ImportError:
+    httpx = None
+
+# Razorpay SDK imports
+import razorpay
+from razorpay import SingleFlight
+from razorpay.errors import BadRequestError
+
+from .helpers import StubServer
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.005)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def run_concurrently(self, flight, key, fn):
+        results = []
+        errors = []
+
+        def caller():
+            try:
+                results.append(flight.do(key, fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_calls_are_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait()
+            return {'id': 'order_1'}
+
+        threads, results, _ = self.run_concurrently(flight, 'order_1', fn)
+        wait_for(lambda: flight.stats()['shared'] == CALLERS - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'id': 'order_1'}] * CALLERS)
+        # Every caller gets its own copy
+        self.assertEqual(len({id(result) for result in results}), CALLERS)
+
+        # Nothing is cached once the call is over
+        flight.do('order_1', fn)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.stats(), {'calls': 2, 'shared': CALLERS - 1})
+
+    def test_leader_changes_do_not_reach_waiters(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        leader = []
+        results = []
+
+        def fn():
+            leader.append(threading.get_ident())
+            release.wait()
+            return {'id': 'order_1', 'notes': {}}
+
+        def caller():
+            result = flight.do('order_1', fn)
+            if threading.get_ident() in leader:
+                result['notes']['seen'] = True
+            else:
+                results.append(result)
+
+        threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: flight.stats()['shared'] == CALLERS - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [{'id': 'order_1', 'notes': {}}] * (CALLERS - 1))
+
+    def test_unshared_result_is_not_copied(self):
+        flight = SingleFlight()
+        result = {'id': 'order_1'}
+        self.assertIs(flight.do('order_1', lambda: result), result)
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait()
+            raise BadRequestError('Invalid id')
+
+        threads, results, errors = self.run_concurrently(flight, 'order_1', fn)
+        wait_for(lambda: flight.stats()['shared'] == CALLERS - 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), CALLERS)
+        self.assertTrue(all(isinstance(e, BadRequestError) for e in errors))
+
+    def test_different_keys_are_not_shared(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 1), 1)
+        self.assertEqual(flight.do('b', lambda: 2), 2)
+        self.assertEqual(flight.stats(), {'calls': 2, 'shared': 0})
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_are_shared(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'id': 'order_1'}
+
+        results = await asyncio.gather(*(flight.ado('order_1', fn) for _ in range(CALLERS)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'id': 'order_1'}] * CALLERS)
+        self.assertEqual(len({id(result) for result in results}), CALLERS)
+        await flight.ado('order_1', fn)
+        self.assertEqual(len(calls), 2)
+
+    async def test_leader_changes_do_not_reach_waiters(self):
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return {'id': 'order_1', 'notes': {}}
+
+        async def leader():
+            result = await flight.ado('order_1', fn)
+            result['notes']['seen'] = True
+            return result
+
+        results = await asyncio.gather(
+            leader(), *(flight.ado('order_1', fn) for _ in range(CALLERS - 1)))
+        self.assertEqual(results[1:], [{'id': 'order_1', 'notes': {}}] * (CALLERS - 1))
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        first = asyncio.ensure_future(flight.ado('key', fn))
+        second = asyncio.ensure_future(flight.ado('key', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 'done')
+
+
+class TestClientSingleFlight(unittest.TestCase):
+
+    def test_concurrent_fetches_share_a_request(self):
+        release = threading.Event()
+
+        def order(handler):
+            release.wait()
+            return {'id': 'order_1'}
+
+        routes = {('GET', '/v1/orders/order_1'): (200, order),
+                  ('GET', '/v1/orders/order_2'): (200, {'id': 'order_2'})}
+        with StubServer(routes) as server:
+            flight = SingleFlight()
+            client = razorpay.Client(
+                auth=('key_id', 'key_secret'), base_url=server.url, single_flight=flight)
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(client.order.fetch('order_1')))
+                for _ in range(CALLERS)
+            ]
+            for thread in threads:
+                thread.start()
+            wait_for(lambda: flight.stats()['shared'] == CALLERS - 1)
+            # Other requests are not held up
+            self.assertEqual(client.order.fetch('order_2'), {'id': 'order_2'})
+            release.set()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results, [{'id': 'order_1'}] * CALLERS)
+            self.assertEqual(len(server.requests), 2)
+
+    def test_post_requests_are_not_shared(self):
+        routes = {('POST', '/v1/orders'): (200, {'id': 'order_1'})}
+        with StubServer(routes) as server:
+            flight = SingleFlight()
+            client = razorpay.Client(
+                auth=('key_id', 'key_secret'), base_url=server.url, single_flight=flight)
+            client.order.create({'amount': 100})
+            client.order.create({'amount': 100})
+            self.assertEqual(flight.stats()['calls'], 0)
+            self.assertEqual(len(server.requests), 2)
+
+
+@unittest.skipUnless(httpx, 'httpx is not installed')
+class TestAsyncClientSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_fetches_share_a_request(self):
+        def order(handler):
+            time.sleep(0.05)
+            return {'id': 'order_1'}
+
+        routes = {('GET', '/v1/orders/order_1'): (200, order)}
+        with StubServer(routes) as server:
+            async with razorpay.AsyncClient(
+                    auth=('key_id', 'key_secret'), base_url=server.url,
+                    single_flight=SingleFlight()) as client:
+                results = await asyncio.gather(
+                    *(client.order.fetch('order_1') for _ in range(CALLERS)))
+            self.assertEqual(results, [{'id': 'order_1'}] * CALLERS)
+            self.assertEqual(len(server.requests), 1)
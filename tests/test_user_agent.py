@@ -1,7 +1,10 @@
 import json
+from unittest import mock
 
 import responses
 
+from razorpay import client as client_module
+
 from .helpers import ClientTestCase, mock_file
 
 
@@ -20,3 +23,37 @@ class TestClientUserAgent(ClientTestCase):
         responses.add(responses.GET, url, status=200,
                       body=json.dumps(result), match_querystring=True)
         self.assertEqual(self.client.payment.all(), result)
+
+    @responses.activate
+    def test_user_agent_contains_app_details(self):
+        responses.add(responses.GET, self.base_url, status=200, body='{}')
+        self.client.payment.all()
+        user_agent = responses.calls[0].request.headers['User-Agent']
+        self.assertTrue(user_agent.startswith('Razorpay-Python/'))
+        self.assertIn('Django/1.8.17', user_agent)
+
+    @responses.activate
+    def test_user_agent_invalidated_by_set_app_details(self):
+        responses.add(responses.GET, self.base_url, status=200, body='{}')
+        self.client.payment.all()
+        self.client.set_app_details({'title': 'Flask', 'version': '3.0.0'})
+        self.client.payment.all()
+        user_agent = responses.calls[1].request.headers['User-Agent']
+        self.assertIn('Django/1.8.17', user_agent)
+        self.assertIn('Flask/3.0.0', user_agent)
+
+    @responses.activate
+    def test_version_resolved_once(self):
+        # Pins the per-request header cost: package metadata must not be
+        # scanned again once the User-Agent has been built.
+        responses.add(responses.GET, self.base_url, status=200, body='{}')
+        client_module._package_version.cache_clear()
+        self.client._user_agent = None
+        with mock.patch.object(client_module, 'version',
+                               return_value='9.9.9') as version:
+            for _ in range(50):
+                self.client.payment.all()
+        client_module._package_version.cache_clear()
+        self.assertEqual(version.call_count, 1)
+        self.assertIn('Razorpay-Python/9.9.9',
+                      responses.calls[-1].request.headers['User-Agent'])
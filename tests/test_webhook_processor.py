@@ -0,0 +1,202 @@
+# Standard library imports
+import hashlib
+import hmac
+import json
+import threading
+import unittest
+from unittest import mock
+
+# Razorpay SDK imports
+from razorpay import WebhookKeyring, WebhookProcessor
+from razorpay.webhook_processor import RecentIds, WebhookStatus, ordering_key
+
+SECRET = 'webhook_secret'
+
+
+def webhook(event_type='payment.captured', payment_id='pay_1', event_id='evt_1', secret=SECRET):
+    body = json.dumps({
+        'entity': 'event',
+        'account_id': 'acc_1',
+        'event': event_type,
+        'payload': {'payment': {'entity': {'id': payment_id}}},
+    }).encode()
+    headers = {
+        'X-Razorpay-Signature': hmac.new(secret.encode(), body, hashlib.sha256).hexdigest(),
+        'X-Razorpay-Event-Id': event_id,
+    }
+    return body, headers
+
+
+class TestWebhookProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = WebhookProcessor(SECRET, max_workers=2)
+        self.addCleanup(self.processor.close)
+        self.received = []
+        self.processor.on('payment.captured', self.received.append)
+
+    def test_dispatches_verified_events(self):
+        self.assertEqual(self.processor.submit(*webhook()), WebhookStatus.ACCEPTED)
+        self.processor.join()
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.received[0]['payload']['payment']['entity']['id'], 'pay_1')
+        stats = self.processor.stats()
+        self.assertEqual(stats['received'], 1)
+        self.assertEqual(stats['handled'], 1)
+        self.assertEqual(stats['queued'], 0)
+
+    def test_rejects_bad_signatures_before_parsing(self):
+        body, headers = webhook(secret='other_secret')
+        with mock.patch('razorpay.webhook_processor.json.loads') as loads:
+            self.assertEqual(self.processor.submit(body, headers), WebhookStatus.INVALID)
+            self.assertEqual(self.processor.submit(body, {}), WebhookStatus.INVALID)
+            loads.assert_not_called()
+        self.processor.join()
+        self.assertEqual(self.received, [])
+        self.assertEqual(self.processor.stats()['invalid'], 2)
+
+    def test_rejects_signed_bodies_that_are_not_events(self):
+        for body in (b'not json', b'[1, 2]'):
+            headers = {'x-razorpay-signature': hmac.new(
+                SECRET.encode(), body, hashlib.sha256).hexdigest()}
+            self.assertEqual(self.processor.submit(body, headers), WebhookStatus.INVALID)
+
+    def test_drops_duplicate_event_ids(self):
+        body, headers = webhook()
+        self.assertEqual(self.processor.submit(body, headers), WebhookStatus.ACCEPTED)
+        self.assertEqual(self.processor.submit(memoryview(body), headers), WebhookStatus.DUPLICATE)
+        self.assertEqual(
+            self.processor.submit(*webhook(event_id='evt_2')), WebhookStatus.ACCEPTED)
+        self.processor.join()
+        self.assertEqual(len(self.received), 2)
+
+    def test_ignores_events_without_handlers(self):
+        self.assertEqual(
+            self.processor.submit(*webhook('order.paid')), WebhookStatus.IGNORED)
+        seen = []
+        self.processor.on('*', seen.append)
+        self.assertEqual(
+            self.processor.submit(*webhook('order.paid', event_id='evt_2')),
+            WebhookStatus.ACCEPTED)
+        self.processor.join()
+        self.assertEqual([event['event'] for event in seen], ['order.paid'])
+
+    def test_failed_events_can_be_resent(self):
+        processor = WebhookProcessor(SECRET, max_workers=1)
+        self.addCleanup(processor.close)
+        calls = []
+
+        @processor.on('payment.captured')
+        def handler(event):
+            calls.append(event)
+            if len(calls) == 1:
+                raise ValueError('boom')
+
+        with self.assertLogs('razorpay.webhook_processor', 'ERROR'):
+            processor.submit(*webhook())
+            processor.join()
+        self.assertEqual(processor.submit(*webhook()), WebhookStatus.ACCEPTED)
+        processor.join()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(processor.stats()['failed'], 1)
+        self.assertEqual(processor.stats()['handled'], 1)
+
+    def test_backpressure(self):
+        processor = WebhookProcessor(SECRET, max_workers=1, queue_size=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def handler(event):
+            started.set()
+            release.wait()
+
+        processor.on('payment.captured', handler)
+        self.assertEqual(processor.submit(*webhook(event_id='evt_1')), WebhookStatus.ACCEPTED)
+        started.wait()
+        self.assertEqual(processor.submit(*webhook(event_id='evt_2')), WebhookStatus.ACCEPTED)
+        body, headers = webhook(event_id='evt_3')
+        self.assertEqual(processor.submit(body, headers, timeout=0.01), WebhookStatus.OVERLOADED)
+        # Submitting does not block for good by default
+        self.assertEqual(processor.submit(body, headers), WebhookStatus.OVERLOADED)
+        release.set()
+        processor.join()
+        # Events refused for lack of room are accepted when delivered again
+        self.assertEqual(processor.submit(body, headers), WebhookStatus.ACCEPTED)
+        processor.close()
+        self.assertEqual(processor.stats()['handled'], 3)
+        with self.assertRaises(RuntimeError):
+            processor.submit(body, headers)
+
+    def test_events_of_a_payment_keep_their_order(self):
+        processor = WebhookProcessor(SECRET, max_workers=4)
+        seen = {}
+
+        @processor.on('*')
+        def handler(event):
+            entity = event['payload']['payment']['entity']['id']
+            seen.setdefault(entity, []).append(event['event'])
+
+        types = ['payment.authorized', 'payment.captured', 'refund.created']
+        for index in range(20):
+            for number, event_type in enumerate(types):
+                processor.submit(*webhook(
+                    event_type, f'pay_{index}', event_id=f'evt_{index}_{number}'))
+        processor.close()
+        self.assertEqual(len(seen), 20)
+        for events in seen.values():
+            self.assertEqual(events, types)
+
+    def test_keyring_verifier(self):
+        keyring = WebhookKeyring({'old': 'old_secret', 'new': SECRET})
+        with WebhookProcessor(keyring) as processor:
+            processor.on('payment.captured', self.received.append)
+            body, headers = webhook()
+            headers['X-Razorpay-Account-Id'] = 'acc_1'
+            self.assertEqual(processor.submit(body, headers), WebhookStatus.ACCEPTED)
+        self.assertEqual(len(self.received), 1)
+
+
+class TestRecentIds(unittest.TestCase):
+
+    def test_bounded_size(self):
+        recent = RecentIds(max_size=2)
+        self.assertTrue(recent.add('a'))
+        self.assertFalse(recent.add('a'))
+        recent.add('b')
+        recent.add('c')
+        self.assertEqual(len(recent), 2)
+        self.assertTrue(recent.add('a'))
+
+    def test_ids_expire(self):
+        recent = RecentIds(ttl=10)
+        with mock.patch('razorpay.webhook_processor.time.monotonic', return_value=100):
+            recent.add('a')
+        with mock.patch('razorpay.webhook_processor.time.monotonic', return_value=105):
+            self.assertFalse(recent.add('a'))
+            recent.add('b')
+        with mock.patch('razorpay.webhook_processor.time.monotonic', return_value=111):
+            self.assertTrue(recent.add('a'))
+            self.assertFalse(recent.add('b'))
+
+    def test_discard(self):
+        recent = RecentIds()
+        recent.add('a')
+        recent.discard('a')
+        recent.discard('missing')
+        self.assertTrue(recent.add('a'))
+
+
+class TestOrderingKey(unittest.TestCase):
+
+    def test_prefers_payment(self):
+        event = {'payload': {
+            'refund': {'entity': {'id': 'rfnd_1'}},
+            'payment': {'entity': {'id': 'pay_1'}},
+        }}
+        self.assertEqual(ordering_key(event), 'pay_1')
+
+    def test_other_entities(self):
+        event = {'payload': {'order': {'entity': {'id': 'order_1'}}}}
+        self.assertEqual(ordering_key(event), 'order_1')
+        self.assertEqual(ordering_key({'account_id': 'acc_1', 'payload': {}}), 'acc_1')
+        self.assertEqual(ordering_key({}), '')